@@ -7,6 +7,10 @@
 namespace Iirc.EnergyLimitsScheduling.Shared.Solvers
 {
     using System;
+    using System.Collections.Generic;
+    using System.ComponentModel;
+    using Iirc.EnergyLimitsScheduling.Shared.Algorithms.EnergyLimitsRepair;
+    using Newtonsoft.Json.Linq;
 
     public class CpOverlap : PythonScript<CpOverlap.SpecializedSolverConfig>
     {
@@ -22,9 +26,154 @@ namespace Iirc.EnergyLimitsScheduling.Shared.Solvers
             }
         }
 
+        public enum EnergyFormulationType
+        {
+            Overlap = 0,
+            Segments = 1
+        }
+
         public class SpecializedSolverConfig
         {
+            /// <summary>
+            /// Gets or sets a value indicating whether a greedy schedule is used as the starting point (and to bound
+            /// the number of metering intervals) if no initial start times are given. Default is true.
+            /// </summary>
+            [DefaultValue(true)]
+            public bool GreedyWarmStart { get; set; }
+
+            /// <summary>
+            /// Gets or sets the priority rule of the greedy warm start. Rule EarliestStartTimeOverFixedOrder is not
+            /// supported, the warm start is skipped with a warning.
+            /// </summary>
+            [DefaultValue(GreedyEarliestStartTime.PriorityRule.EarliestStartTime)]
+            public GreedyEarliestStartTime.PriorityRule GreedyWarmStartPriorityRule { get; set; }
+
+            /// <summary>
+            /// Gets or sets a value indicating whether the number of metering intervals is iteratively decreased by
+            /// searching for a schedule completing before the metering interval of the incumbent, the makespan is
+            /// then minimized within the metering intervals of the last incumbent. Used only with the energy limits.
+            /// Default is false.
+            /// </summary>
+            [DefaultValue(false)]
+            public bool IterativeHorizon { get; set; }
+
+            /// <summary>
+            /// Gets or sets a value indicating whether the combinatorial lower bounds (machine load, longest job,
+            /// energy demand) are used to detect the infeasible instances, the optimal warm starts and to cap the
+            /// objective. Default is true.
+            /// </summary>
+            [DefaultValue(true)]
+            public bool LowerBounds { get; set; }
+
+            /// <summary>
+            /// Gets or sets a value indicating whether the instance is solved window by window (rolling horizon)
+            /// instead of by a single model of the whole horizon. Each window spans
+            /// <see cref="RollingHorizonWindow"/> metering intervals, the operations completing before the last
+            /// <see cref="RollingHorizonOverlap"/> metering intervals of the window are fixed and their energy
+            /// consumption is carried to the next windows. The model of a window has only the metering intervals up
+            /// to its end (the whole horizon only if no schedule fits into them). Default is false.
+            /// </summary>
+            [DefaultValue(false)]
+            public bool RollingHorizon { get; set; }
+
+            /// <summary>
+            /// Gets or sets the number of metering intervals of a rolling horizon window. Default is 8.
+            /// </summary>
+            [DefaultValue(8)]
+            public int RollingHorizonWindow { get; set; }
+
+            /// <summary>
+            /// Gets or sets the number of metering intervals shared by the consecutive rolling horizon windows.
+            /// Default is 2.
+            /// </summary>
+            [DefaultValue(2)]
+            public int RollingHorizonOverlap { get; set; }
+
+            /// <summary>
+            /// Gets or sets a value indicating whether the incumbent is improved by the large neighborhood search,
+            /// i.e., by repeatedly solving the model with the operations outside of a neighborhood fixed to the
+            /// incumbent. Default is false.
+            /// </summary>
+            [DefaultValue(false)]
+            public bool Lns { get; set; }
+
+            /// <summary>
+            /// Gets or sets the time limit (in seconds) of a single iteration of the large neighborhood search.
+            /// Default is 2.
+            /// </summary>
+            [DefaultValue(2.0)]
+            public double LnsIterationTimeLimit { get; set; }
+
+            /// <summary>
+            /// Gets or sets the neighborhoods of the large neighborhood search, any of TimeWindow, Machines and
+            /// CriticalPath. Default (null) is all of them.
+            /// </summary>
+            [DefaultValue(null)]
+            public string[] LnsNeighborhoods { get; set; }
+
+            /// <summary>
+            /// Gets or sets the seed of the random neighborhoods of the large neighborhood search. Default is 0.
+            /// </summary>
+            [DefaultValue(0)]
+            public int LnsSeed { get; set; }
+
+            /// <summary>
+            /// Gets or sets the formulation of the energy limits. Overlap (default) bounds the energy consumption
+            /// by the overlap of the operations with the metering intervals, Segments splits each operation into
+            /// optional segments, one for each metering interval it may overlap.
+            /// </summary>
+            [DefaultValue(EnergyFormulationType.Overlap)]
+            public EnergyFormulationType EnergyFormulation { get; set; }
+
+            /// <summary>
+            /// Gets or sets a value indicating whether the final schedule is checked for feasibility by the solver
+            /// script. A schedule violating any constraint is dropped, the result has no solution and the violation
+            /// is printed to the standard error. Default is false.
+            /// </summary>
+            [DefaultValue(false)]
+            public bool CheckFeasibility { get; set; }
+
+            /// <summary>
+            /// Gets or sets the path to the directory of the solve cache. If given, the results are cached by the
+            /// instance contents and the solver config: a proven result (or one found with at least the same time
+            /// limit and workers) is returned immediately, a result found with a smaller budget is used as the
+            /// warm start and its lower bound is kept.
+            /// </summary>
+            [DefaultValue(null)]
+            public string SolveCache { get; set; }
+
+            /// <summary>
+            /// Gets or sets the maximum total size (in MB) of the solve cache, the least recently used results are
+            /// evicted. Default is 1024.
+            /// </summary>
+            [DefaultValue(1024)]
+            public double SolveCacheMaxSize { get; set; }
+
+            /// <summary>
+            /// Gets or sets the path to the directory of the built models. If given, the model is exported there in
+            /// the CPO format, keyed by the instance contents and the formulation options, and the later runs import
+            /// it instead of building it again. The import parses the file by docplex, for large models it may take
+            /// longer than building the model. Not used by the iterative horizon, the rolling horizon and the large
+            /// neighborhood search, which change the model.
+            /// </summary>
+            [DefaultValue(null)]
+            public string ModelCache { get; set; }
+
+            /// <summary>
+            /// Gets or sets the CP Optimizer parameters overriding the defaults of the solver, e.g.,
+            /// {"SearchType": "Restart"}.
+            /// </summary>
+            [DefaultValue(null)]
+            public Dictionary<string, object> Parameters { get; set; }
 
+            /// <summary>
+            /// Gets or sets the variants of the portfolio. If given, the variants are solved in parallel processes
+            /// under the time limit of the solver and the best solution and bound of all of them are reported. Each
+            /// variant is an object overriding the properties of this config (and optionally NumWorkers, by default
+            /// the workers are split evenly among the variants).
+            /// </summary>
+            [DefaultValue(null)]
+            public JObject[] Portfolio { get; set; }
         }
     }
 }
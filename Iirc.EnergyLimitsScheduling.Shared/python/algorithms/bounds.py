@@ -0,0 +1,111 @@
+from typing import List
+import math
+
+from datastructs.instance import Instance, Operation
+
+__all__ = [
+    'machine_load_bound',
+    'longest_job_bound',
+    'min_num_metering_intervals',
+    'energy_bound',
+    'energy_relaxation_bound',
+    'compute_lower_bound',
+    'find_unschedulable_operations'
+]
+
+# Tolerance of the energy comparisons (the power consumptions are floats).
+_EPS = 1e-6
+
+
+def machine_load_bound(instance: Instance) -> int:
+    """Maximum total processing time of the operations of a machine."""
+    loads = [0] * instance.num_machines
+    for operation in instance.get_operations():
+        loads[operation.machine_index] += operation.processing_time
+    return max(loads, default=0)
+
+
+def longest_job_bound(instance: Instance) -> int:
+    """Maximum total processing time of the operations of a job."""
+    return max((sum(operation.processing_time for operation in job.operations) for job in instance.jobs), default=0)
+
+
+def _total_energy(instance: Instance) -> float:
+    return sum(operation.processing_time * operation.power_consumption for operation in instance.get_operations())
+
+
+def min_num_metering_intervals(instance: Instance) -> int:
+    """Minimum number of metering intervals needed to consume the total energy of the operations."""
+    total_energy = _total_energy(instance)
+    if total_energy <= _EPS:
+        return 0
+    return int(math.ceil(total_energy / instance.energy_limit - _EPS))
+
+
+def energy_bound(instance: Instance) -> int:
+    """The makespan must reach into the last of the minimum number of metering intervals."""
+    num_metering_intervals = min_num_metering_intervals(instance)
+    return (num_metering_intervals - 1) * instance.length_metering_interval + 1 if num_metering_intervals > 0 else 0
+
+
+def energy_relaxation_bound(instance: Instance, lower_bound: int = 0) -> int:
+    """Minimum makespan such that the total energy of the operations can be consumed before it.
+
+    In each metering interval, the consumption is bounded by the energy limit and by all machines processing
+    their most consuming operations for the part of the interval before the makespan (the operations are
+    preemptive in this relaxation). The search starts from `lower_bound`.
+    """
+    length_metering_interval = instance.length_metering_interval
+    total_energy = _total_energy(instance)
+    max_powers = [0.0] * instance.num_machines
+    for operation in instance.get_operations():
+        max_powers[operation.machine_index] = max(max_powers[operation.machine_index], operation.power_consumption)
+    total_max_power = sum(max_powers)
+    if total_energy <= _EPS:
+        return lower_bound
+
+    def capacity(makespan: int) -> float:
+        num_full, remainder = divmod(makespan, length_metering_interval)
+        return (num_full * min(instance.energy_limit, length_metering_interval * total_max_power)
+                + min(instance.energy_limit, remainder * total_max_power))
+
+    # The capacity is non-decreasing in the makespan, binary search between a short and a long enough makespan.
+    low = lower_bound
+    if capacity(low) >= total_energy - _EPS:
+        return low
+    high = max(low + 1, length_metering_interval)
+    while capacity(high) < total_energy - _EPS:
+        high *= 2
+    while high - low > 1:
+        middle = (low + high) // 2
+        if capacity(middle) >= total_energy - _EPS:
+            high = middle
+        else:
+            low = middle
+    return high
+
+
+def compute_lower_bound(instance: Instance, with_energy_limits: bool = True) -> int:
+    """Best of the makespan lower bounds, the energy bounds are used only with the energy limits."""
+    lower_bound = max(machine_load_bound(instance), longest_job_bound(instance))
+    if with_energy_limits:
+        lower_bound = energy_relaxation_bound(instance, max(lower_bound, energy_bound(instance)))
+    return lower_bound
+
+
+def find_unschedulable_operations(instance: Instance) -> List[Operation]:
+    """Operations that violate the energy limit on their own, wherever they are scheduled.
+
+    An operation placed across the boundary of two metering intervals consumes at least half of its energy in one
+    of them, an operation longer than two metering intervals fully covers one.
+    """
+    length_metering_interval = instance.length_metering_interval
+    unschedulable_operations = []
+    for operation in instance.get_operations():
+        if operation.processing_time >= 2 * length_metering_interval:
+            min_max_overlap = length_metering_interval
+        else:
+            min_max_overlap = (operation.processing_time + 1) // 2
+        if min_max_overlap * operation.power_consumption > instance.energy_limit + _EPS:
+            unschedulable_operations.append(operation)
+    return unschedulable_operations
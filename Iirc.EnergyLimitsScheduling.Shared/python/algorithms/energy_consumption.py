@@ -0,0 +1,140 @@
+from typing import Dict, Tuple, Optional
+
+import numpy as np
+
+from datastructs.instance import Instance, Operation
+from datastructs.arrays import ArrayInstance
+
+__all__ = [
+    'operation_arrays',
+    'start_times_to_array',
+    'compute_operation_consumptions',
+    'compute_consumption_in_metering_intervals',
+    'compute_peak',
+    'compute_slack',
+    'violated_metering_intervals',
+    'are_energy_limits_satisfied'
+]
+
+
+def operation_arrays(instance: Instance) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns processing times and power consumptions of the operations (in `Instance.get_operations` order)."""
+    if isinstance(instance, ArrayInstance):
+        return instance.processing_times.astype(np.float64), instance.power_consumptions
+
+    operations = list(instance.get_operations())
+    processing_times = np.fromiter(
+        (operation.processing_time for operation in operations), dtype=np.float64, count=len(operations))
+    power_consumptions = np.fromiter(
+        (operation.power_consumption for operation in operations), dtype=np.float64, count=len(operations))
+    return processing_times, power_consumptions
+
+
+def start_times_to_array(instance: Instance, start_times: Dict[Operation, float]) -> np.ndarray:
+    """Converts start times to an array in `Instance.get_operations` order, missing start times are NaN."""
+    return np.array(
+        [start_times.get(operation, np.nan) for operation in instance.get_operations()],
+        dtype=np.float64)
+
+
+def compute_operation_consumptions(
+        start_times: np.ndarray,
+        processing_times: np.ndarray,
+        power_consumptions: np.ndarray,
+        length_metering_interval: int,
+        num_metering_intervals: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Computes the energy consumed by the operations in the metering intervals they overlap.
+
+    `start_times` has shape (num_operations,) or (num_schedules, num_operations), i.e., a batch of schedules.
+    Only the non-zero overlaps are returned as flat arrays (schedule index, operation index, metering interval
+    index, consumed energy). Operations without a start time (NaN) and the consumption outside of
+    `num_metering_intervals` (if given) are skipped.
+    """
+    start_times = np.atleast_2d(np.asarray(start_times, dtype=np.float64))
+    processing_times = np.asarray(processing_times, dtype=np.float64)
+    power_consumptions = np.asarray(power_consumptions, dtype=np.float64)
+    num_schedules, num_operations = start_times.shape
+
+    schedule_indices, operation_indices = np.nonzero(~np.isnan(start_times))
+    starts = start_times[schedule_indices, operation_indices]
+    completions = starts + processing_times[operation_indices]
+
+    first_metering_intervals = np.floor(starts / length_metering_interval).astype(np.int64)
+    # Maximum number of metering intervals overlapped by any operation.
+    max_span = int(np.ceil(processing_times.max() / length_metering_interval)) + 1 if num_operations > 0 else 0
+
+    result_schedules = []
+    result_operations = []
+    result_metering_intervals = []
+    result_energies = []
+    for offset in range(max_span):
+        metering_intervals = first_metering_intervals + offset
+        overlaps = (np.minimum(completions, (metering_intervals + 1) * length_metering_interval)
+                    - np.maximum(starts, metering_intervals * length_metering_interval))
+        mask = overlaps > 0
+        if num_metering_intervals is not None:
+            mask &= (metering_intervals >= 0) & (metering_intervals < num_metering_intervals)
+        if not mask.any():
+            continue
+
+        result_schedules.append(schedule_indices[mask])
+        result_operations.append(operation_indices[mask])
+        result_metering_intervals.append(metering_intervals[mask])
+        result_energies.append(overlaps[mask] * power_consumptions[operation_indices[mask]])
+
+    if not result_energies:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, np.zeros(0, dtype=np.float64)
+
+    return (np.concatenate(result_schedules),
+            np.concatenate(result_operations),
+            np.concatenate(result_metering_intervals),
+            np.concatenate(result_energies))
+
+
+def compute_consumption_in_metering_intervals(
+        start_times: np.ndarray,
+        processing_times: np.ndarray,
+        power_consumptions: np.ndarray,
+        length_metering_interval: int,
+        num_metering_intervals: int) -> np.ndarray:
+    """Computes the energy consumed in each metering interval.
+
+    Returns an array of shape (num_metering_intervals,) for one schedule, or
+    (num_schedules, num_metering_intervals) for a batch of schedules.
+    """
+    is_batch = np.ndim(start_times) == 2
+    start_times = np.atleast_2d(np.asarray(start_times, dtype=np.float64))
+    num_schedules = start_times.shape[0]
+
+    schedule_indices, _, metering_interval_indices, energies = compute_operation_consumptions(
+        start_times, processing_times, power_consumptions, length_metering_interval, num_metering_intervals)
+
+    consumptions = np.bincount(
+        schedule_indices * num_metering_intervals + metering_interval_indices,
+        weights=energies,
+        minlength=num_schedules * num_metering_intervals).reshape(num_schedules, num_metering_intervals)
+
+    return consumptions if is_batch else consumptions[0]
+
+
+def compute_peak(consumptions: np.ndarray) -> np.ndarray:
+    """Returns the maximum consumption over the metering intervals (per schedule for a batch)."""
+    if consumptions.shape[-1] == 0:
+        return np.zeros(consumptions.shape[:-1])
+    return consumptions.max(axis=-1)
+
+
+def compute_slack(consumptions: np.ndarray, energy_limit: float) -> np.ndarray:
+    """Returns the energy that can still be consumed in each metering interval (negative if violated)."""
+    return energy_limit - consumptions
+
+
+def violated_metering_intervals(consumptions: np.ndarray, energy_limit: float) -> np.ndarray:
+    """Returns a boolean mask of the metering intervals in which the energy limit is exceeded."""
+    return (consumptions > energy_limit) & ~np.isclose(consumptions, energy_limit)
+
+
+def are_energy_limits_satisfied(consumptions: np.ndarray, energy_limit: float) -> np.ndarray:
+    """Returns whether the energy limits are satisfied (per schedule for a batch)."""
+    return ~violated_metering_intervals(consumptions, energy_limit).any(axis=-1)
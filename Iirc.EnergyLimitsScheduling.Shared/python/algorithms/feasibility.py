@@ -0,0 +1,138 @@
+from typing import List, Optional, Tuple
+from enum import IntEnum
+
+import numpy as np
+
+from datastructs.instance import Instance
+from datastructs.arrays import ArrayInstance
+from algorithms.energy_consumption import operation_arrays, compute_consumption_in_metering_intervals, \
+    violated_metering_intervals
+
+__all__ = [
+    'FeasibilityStatus',
+    'Violation',
+    'find_violations',
+    'check_feasibility'
+]
+
+
+class FeasibilityStatus(IntEnum):
+    """Same as `FeasibilityChecker.FeasibilityStatus` in C#."""
+    Feasible = 0
+    OperationHasNoStartTime = 1
+    JobPrecedenceViolated = 2
+    OverlappingOperations = 3
+    OperationOutsideHorizon = 4
+    EnergyLimitViolated = 5
+
+
+class Violation:
+    """Violated constraint of a schedule.
+
+    The operations are positions in `Instance.get_operations` order (the operation and the next one for the
+    precedences and the overlaps), the metering interval is given only for the energy limits.
+    """
+
+    __slots__ = [
+        'status',
+        'operation_positions',
+        'metering_interval_index'
+    ]
+
+    def __init__(
+            self,
+            status: FeasibilityStatus,
+            operation_positions: Tuple[int, ...] = (),
+            metering_interval_index: Optional[int] = None):
+        self.status = status
+        self.operation_positions = operation_positions
+        self.metering_interval_index = metering_interval_index
+
+    def to_dict(self) -> dict:
+        d = {
+            'Status': self.status.name,
+            'OperationPositions': list(self.operation_positions)
+        }
+        if self.metering_interval_index is not None:
+            d['MeteringIntervalIndex'] = self.metering_interval_index
+        return d
+
+
+def _is_greater(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (a > b) & ~np.isclose(a, b)
+
+
+def _index_arrays(instance: Instance) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns machine and job indices of the operations (in `Instance.get_operations` order)."""
+    if isinstance(instance, ArrayInstance):
+        return instance.machine_indices, instance.job_indices
+
+    operations = list(instance.get_operations())
+    machine_indices = np.fromiter(
+        (operation.machine_index for operation in operations), dtype=np.int64, count=len(operations))
+    job_indices = np.fromiter(
+        (operation.job_index for operation in operations), dtype=np.int64, count=len(operations))
+    return machine_indices, job_indices
+
+
+def find_violations(
+        instance: Instance,
+        start_times: np.ndarray,
+        with_energy_limits: bool = True,
+        first_only: bool = False) -> List[Violation]:
+    """Finds the violated constraints of the schedule, checked in the order of the C# `FeasibilityChecker`.
+
+    `start_times` is an array in `Instance.get_operations` order (see `start_times_to_array`), missing start times
+    are NaN. The later checks are skipped if a check fails, as they may not be meaningful (e.g., the precedences
+    without all the start times). With `first_only`, at most one violation is returned.
+    """
+    start_times = np.asarray(start_times, dtype=np.float64)
+    processing_times, power_consumptions = operation_arrays(instance)
+    machine_indices, job_indices = _index_arrays(instance)
+    completion_times = start_times + processing_times
+
+    def violations(status: FeasibilityStatus, positions: List[np.ndarray]) -> List[Violation]:
+        found = [Violation(status, tuple(int(position) for position in operation_positions))
+                 for operation_positions in zip(*positions)]
+        return found[:1] if first_only else found
+
+    missing = np.flatnonzero(np.isnan(start_times))
+    if missing.size > 0:
+        return violations(FeasibilityStatus.OperationHasNoStartTime, [missing])
+
+    # The operations of a job are stored consecutively and in their order.
+    same_job = job_indices[:-1] == job_indices[1:]
+    precedences = np.flatnonzero(same_job & _is_greater(completion_times[:-1], start_times[1:]))
+    if precedences.size > 0:
+        return violations(FeasibilityStatus.JobPrecedenceViolated, [precedences, precedences + 1])
+
+    # Succeeding operations (w.r.t. start times) on each machine.
+    order = np.lexsort((start_times, machine_indices))
+    same_machine = machine_indices[order[:-1]] == machine_indices[order[1:]]
+    overlaps = np.flatnonzero(same_machine & _is_greater(completion_times[order[:-1]], start_times[order[1:]]))
+    if overlaps.size > 0:
+        return violations(FeasibilityStatus.OverlappingOperations, [order[overlaps], order[overlaps + 1]])
+
+    if not with_energy_limits:
+        return []
+
+    outside_horizon = np.flatnonzero(_is_greater(completion_times, np.full_like(completion_times, instance.horizon)))
+    if outside_horizon.size > 0:
+        return violations(FeasibilityStatus.OperationOutsideHorizon, [outside_horizon])
+
+    consumptions = compute_consumption_in_metering_intervals(
+        start_times,
+        processing_times,
+        power_consumptions,
+        instance.length_metering_interval,
+        instance.num_metering_intervals)
+    violated = np.flatnonzero(violated_metering_intervals(consumptions, instance.energy_limit))
+    found = [Violation(FeasibilityStatus.EnergyLimitViolated, metering_interval_index=int(metering_interval_index))
+             for metering_interval_index in violated]
+    return found[:1] if first_only else found
+
+
+def check_feasibility(instance: Instance, start_times: np.ndarray, with_energy_limits: bool = True) -> FeasibilityStatus:
+    """Returns the status of the first violated constraint (see `find_violations`) or Feasible."""
+    violations = find_violations(instance, start_times, with_energy_limits, first_only=True)
+    return violations[0].status if violations else FeasibilityStatus.Feasible
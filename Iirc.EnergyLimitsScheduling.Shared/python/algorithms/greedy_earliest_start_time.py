@@ -0,0 +1,192 @@
+from typing import Dict, List, Optional
+from enum import IntEnum
+import math
+
+from datastructs.instance import Instance, Operation
+from algorithms.time_windows import compute_time_windows
+
+__all__ = [
+    'PriorityRule',
+    'CannotScheduleException',
+    'GreedyEarliestStartTime'
+]
+
+
+class PriorityRule(IntEnum):
+    StartTime = 0,
+    MostRemainingWork = 1,
+    # Selects the operation with the earliest start time (w.r.t. the energy limits). Ties are broken by selecting
+    # the operation with the smallest reference start time.
+    EarliestStartTime = 2
+
+    @staticmethod
+    def parse(value) -> 'PriorityRule':
+        return PriorityRule[value] if isinstance(value, str) else PriorityRule(value)
+
+
+class CannotScheduleException(Exception):
+    pass
+
+
+def _is_greater(a: float, b: float) -> bool:
+    return a > b and not math.isclose(a, b, rel_tol=1e-5, abs_tol=1e-8)
+
+
+class GreedyEarliestStartTime:
+    """Constructive heuristic scheduling the operations one by one at their earliest feasible start times.
+
+    Python counterpart of the C# `GreedyEarliestStartTime` repair, the earliest start times respect the energy
+    limits (consumption of the already scheduled operations is kept per metering interval). The operations are
+    appended to the end of their machines. With the energy limits, all the operations must complete within the
+    horizon of the instance, otherwise `CannotScheduleException` is raised.
+    """
+
+    def __init__(self, instance: Instance, with_energy_limits: bool = True):
+        self.instance = instance
+        self.with_energy_limits = with_energy_limits
+        self.horizon = instance.num_metering_intervals * instance.length_metering_interval
+        self.previous_operations: Dict[Operation, Optional[Operation]] = dict()
+        self.next_operations: Dict[Operation, Optional[Operation]] = dict()
+        for job in instance.jobs:
+            for operation, next_operation in zip(job.operations, job.operations[1:] + [None]):
+                self.next_operations[operation] = next_operation
+                if next_operation is not None:
+                    self.previous_operations[next_operation] = operation
+            if job.operations:
+                self.previous_operations[job.operations[0]] = None
+
+        self.start_times: Dict[Operation, int] = dict()
+        self.energy_consumptions: List[float] = []
+        self.schedule_lengths: List[int] = []
+
+    def schedule(
+            self,
+            priority_rule: PriorityRule,
+            reference_start_times: Optional[Dict[Operation, float]] = None) -> Dict[Operation, int]:
+        """Returns the start times of the operations.
+
+        The reference start times (e.g., of a schedule to repair) define the order for `PriorityRule.StartTime`
+        and break ties for `PriorityRule.EarliestStartTime`. If not given, the earliest start times w.r.t. the
+        job precedences are used.
+        """
+        if reference_start_times is None:
+            reference_start_times = {
+                operation: time_window.earliest_start
+                for operation, time_window in compute_time_windows(self.instance, None).items()
+            }
+
+        self.start_times = dict()
+        self.energy_consumptions = [0.0] * self.instance.num_metering_intervals
+        self.schedule_lengths = [0] * self.instance.num_machines
+
+        if priority_rule == PriorityRule.StartTime:
+            self._schedule_in_order(self._start_time_order(reference_start_times))
+        elif priority_rule == PriorityRule.MostRemainingWork:
+            self._schedule_in_order(self._most_remaining_work_order())
+        elif priority_rule == PriorityRule.EarliestStartTime:
+            self._schedule_earliest_start_time_first(reference_start_times)
+        else:
+            raise ValueError(f'Unknown priority rule {priority_rule}')
+
+        return self.start_times
+
+    def _start_time_order(self, reference_start_times: Dict[Operation, float]) -> List[Operation]:
+        return sorted(self.instance.get_operations(), key=lambda operation: reference_start_times[operation])
+
+    def _most_remaining_work_order(self) -> List[Operation]:
+        remaining_works = dict()
+        for job in self.instance.jobs:
+            remaining_work = 0
+            for operation in reversed(job.operations):
+                remaining_work += operation.processing_time
+                remaining_works[operation] = remaining_work
+
+        return sorted(self.instance.get_operations(), key=lambda operation: -remaining_works[operation])
+
+    def _schedule_in_order(self, operations: List[Operation]):
+        for operation in operations:
+            self._schedule_operation(operation, self._find_earliest_feasible_start_time(operation))
+
+    def _schedule_earliest_start_time_first(self, reference_start_times: Dict[Operation, float]):
+        earliest_start_times = {
+            job.operations[0]: self._find_earliest_feasible_start_time(job.operations[0])
+            for job in self.instance.jobs if job.operations
+        }
+
+        while earliest_start_times:
+            operation = min(
+                earliest_start_times,
+                key=lambda operation: (earliest_start_times[operation], reference_start_times[operation]))
+            start_time = earliest_start_times.pop(operation)
+            self._schedule_operation(operation, start_time)
+
+            # Energy consumption only grows, so an earliest start time stays valid unless the operation is on the
+            # same machine or its processing overlaps the metering intervals the operation consumes in.
+            first, last = self._overlapped_metering_intervals(start_time, operation.processing_time)
+            for frontal_operation, frontal_start_time in earliest_start_times.items():
+                frontal_first, frontal_last = self._overlapped_metering_intervals(
+                    frontal_start_time, frontal_operation.processing_time)
+                if frontal_operation.machine_index == operation.machine_index \
+                        or (frontal_first <= last and first <= frontal_last):
+                    earliest_start_times[frontal_operation] = \
+                        self._find_earliest_feasible_start_time(frontal_operation)
+
+            next_operation = self.next_operations[operation]
+            if next_operation is not None:
+                earliest_start_times[next_operation] = self._find_earliest_feasible_start_time(next_operation)
+
+    def _overlapped_metering_intervals(self, start_time: int, processing_time: int):
+        length_metering_interval = self.instance.length_metering_interval
+        return start_time // length_metering_interval, (start_time + processing_time - 1) // length_metering_interval
+
+    def _schedule_operation(self, operation: Operation, start_time: int):
+        self.start_times[operation] = start_time
+        self.schedule_lengths[operation.machine_index] = start_time + operation.processing_time
+
+        if self.with_energy_limits:
+            length_metering_interval = self.instance.length_metering_interval
+            completion_time = start_time + operation.processing_time
+            first, last = self._overlapped_metering_intervals(start_time, operation.processing_time)
+            for metering_interval_index in range(first, min(last, self.instance.num_metering_intervals - 1) + 1):
+                overlap = (min(completion_time, (metering_interval_index + 1) * length_metering_interval)
+                           - max(start_time, metering_interval_index * length_metering_interval))
+                self.energy_consumptions[metering_interval_index] += overlap * operation.power_consumption
+
+    def _find_earliest_feasible_start_time(self, operation: Operation) -> int:
+        """Has no side-effects."""
+        earliest_start_time = self.schedule_lengths[operation.machine_index]
+
+        previous_operation = self.previous_operations[operation]
+        if previous_operation is not None:
+            earliest_start_time = max(
+                earliest_start_time,
+                self.start_times[previous_operation] + previous_operation.processing_time)
+
+        if self.with_energy_limits and operation.power_consumption > 0 and operation.processing_time > 0:
+            length_metering_interval = self.instance.length_metering_interval
+            energy_limit = self.instance.energy_limit
+            metering_interval_index = earliest_start_time // length_metering_interval
+            while metering_interval_index < self.instance.num_metering_intervals:
+                metering_interval_start = metering_interval_index * length_metering_interval
+                metering_interval_end = metering_interval_start + length_metering_interval
+                overlap = (min(earliest_start_time + operation.processing_time, metering_interval_end)
+                           - max(earliest_start_time, metering_interval_start))
+                if overlap <= 0:
+                    break
+
+                if _is_greater(
+                        overlap * operation.power_consumption + self.energy_consumptions[metering_interval_index],
+                        energy_limit):
+                    # Current start time violates the energy limit, shift the operation so that only the allowed
+                    # part of it is processed in the metering interval.
+                    max_overlap = max(0, int(math.floor(
+                        (energy_limit - self.energy_consumptions[metering_interval_index])
+                        / operation.power_consumption + 1e-9)))
+                    earliest_start_time = metering_interval_end - max_overlap
+
+                metering_interval_index += 1
+
+        if self.with_energy_limits and earliest_start_time + operation.processing_time > self.horizon:
+            raise CannotScheduleException(f'Operation {operation.id} cannot be completed within the horizon.')
+
+        return earliest_start_time
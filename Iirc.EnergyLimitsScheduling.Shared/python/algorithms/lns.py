@@ -0,0 +1,121 @@
+from typing import Dict, List, Optional, Sequence, Set
+from enum import IntEnum
+import random
+
+from datastructs.instance import Instance, Operation
+
+__all__ = [
+    'NeighborhoodType',
+    'critical_path',
+    'AdaptiveNeighborhoods'
+]
+
+
+class NeighborhoodType(IntEnum):
+    # Operations overlapping a random window of consecutive metering intervals.
+    TimeWindow = 0,
+    # Operations of a random subset of the machines.
+    Machines = 1,
+    # Operations of (a subset of) the jobs on the critical path.
+    CriticalPath = 2
+
+    @staticmethod
+    def parse(value) -> 'NeighborhoodType':
+        return NeighborhoodType[value] if isinstance(value, str) else NeighborhoodType(value)
+
+
+def critical_path(instance: Instance, start_times: Dict[Operation, float]) -> List[Operation]:
+    """Returns a chain of operations, each starting at the completion of the previous one on the same job or
+    machine, ending by an operation completing at the makespan (the first in the chain starts at the earliest)."""
+    completions = {operation: start_time + operation.processing_time for operation, start_time in start_times.items()}
+    machine_operations: Dict[int, List[Operation]] = dict()
+    for operation in start_times:
+        machine_operations.setdefault(operation.machine_index, []).append(operation)
+
+    operation = max(completions, key=completions.get)
+    path = [operation]
+    while True:
+        start_time = start_times[operation]
+        previous_operation = None
+        if operation.index > 0:
+            job_previous_operation = instance.jobs[operation.job_index].operations[operation.index - 1]
+            if completions[job_previous_operation] >= start_time:
+                previous_operation = job_previous_operation
+        if previous_operation is None:
+            for machine_operation in machine_operations[operation.machine_index]:
+                if machine_operation != operation and abs(completions[machine_operation] - start_time) < 1e-6:
+                    previous_operation = machine_operation
+                    break
+        if previous_operation is None:
+            break
+        operation = previous_operation
+        path.append(operation)
+
+    path.reverse()
+    return path
+
+
+class AdaptiveNeighborhoods:
+    """Selection of the neighborhoods of the large neighborhood search.
+
+    A neighborhood type is selected with the probability proportional to its (smoothed) success rate. The size of
+    each neighborhood type (a fraction of the metering intervals, machines or jobs in (0, 1]) grows when its
+    subproblem is solved to optimality without an improvement (the neighborhood is too small to improve) and shrinks
+    when the subproblem is not solved within its time limit.
+    """
+
+    def __init__(
+            self,
+            instance: Instance,
+            neighborhood_types: Sequence[NeighborhoodType],
+            initial_size: float = 0.2,
+            growth: float = 1.2,
+            seed: Optional[int] = None):
+        self.instance = instance
+        self.neighborhood_types = list(neighborhood_types)
+        self.sizes = {neighborhood_type: initial_size for neighborhood_type in self.neighborhood_types}
+        self.num_successes = {neighborhood_type: 0 for neighborhood_type in self.neighborhood_types}
+        self.num_attempts = {neighborhood_type: 0 for neighborhood_type in self.neighborhood_types}
+        self.growth = growth
+        self.random = random.Random(seed)
+
+    def select(self) -> NeighborhoodType:
+        weights = [(self.num_successes[neighborhood_type] + 1) / (self.num_attempts[neighborhood_type] + 2)
+                   for neighborhood_type in self.neighborhood_types]
+        return self.random.choices(self.neighborhood_types, weights)[0]
+
+    def free_operations(self, neighborhood_type: NeighborhoodType, start_times: Dict[Operation, float]) -> Set[Operation]:
+        """Returns the operations of the neighborhood around the schedule."""
+        instance = self.instance
+        size = self.sizes[neighborhood_type]
+
+        if neighborhood_type == NeighborhoodType.TimeWindow:
+            length_metering_interval = instance.length_metering_interval
+            makespan = max(start_time + operation.processing_time for operation, start_time in start_times.items())
+            num_metering_intervals = max(1, int(-(-makespan // length_metering_interval)))
+            window = max(1, int(round(size * num_metering_intervals)))
+            window_start = self.random.randrange(max(1, num_metering_intervals - window + 1)) * length_metering_interval
+            window_end = window_start + window * length_metering_interval
+            return {operation for operation, start_time in start_times.items()
+                    if start_time < window_end and start_time + operation.processing_time > window_start}
+
+        if neighborhood_type == NeighborhoodType.Machines:
+            num_machines = max(1, int(round(size * instance.num_machines)))
+            machine_indices = set(self.random.sample(range(instance.num_machines), num_machines))
+            return {operation for operation in start_times if operation.machine_index in machine_indices}
+
+        job_indices = sorted({operation.job_index for operation in critical_path(instance, start_times)})
+        num_jobs = max(1, int(round(size * len(instance.jobs))))
+        if len(job_indices) > num_jobs:
+            job_indices = self.random.sample(job_indices, num_jobs)
+        return {operation for job_index in job_indices for operation in instance.jobs[job_index].operations}
+
+    def update(self, neighborhood_type: NeighborhoodType, improved: bool, exhausted: bool):
+        """Updates the statistics, `exhausted` means that the subproblem was solved to optimality."""
+        self.num_attempts[neighborhood_type] += 1
+        if improved:
+            self.num_successes[neighborhood_type] += 1
+        elif exhausted:
+            self.sizes[neighborhood_type] = min(1.0, self.sizes[neighborhood_type] * self.growth)
+        else:
+            self.sizes[neighborhood_type] = max(0.01, self.sizes[neighborhood_type] / self.growth)
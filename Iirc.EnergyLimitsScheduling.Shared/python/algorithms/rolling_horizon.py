@@ -0,0 +1,142 @@
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+from datastructs.instance import Instance, Job, Operation
+from algorithms.energy_consumption import compute_consumption_in_metering_intervals
+
+__all__ = [
+    'Subproblem',
+    'build_subproblem'
+]
+
+
+class Subproblem:
+    """Window of the rolling horizon decomposition, an instance of the operations that are not fixed yet.
+
+    The operations of the subproblem instance are re-indexed (the ids are kept), `operations` maps them to the
+    operations of the original instance. The valid start times (in the format of `ValidStartTimes` of the solver
+    config, w.r.t. the subproblem instance) keep the operations after the fixed ones of their jobs and machines,
+    `consumed_energies` is the energy consumed by the fixed operations in each metering interval.
+    """
+
+    __slots__ = [
+        'instance',
+        'operations',
+        'valid_start_times',
+        'consumed_energies'
+    ]
+
+    def __init__(
+            self,
+            instance: Instance,
+            operations: Dict[Operation, Operation],
+            valid_start_times: List[Dict[str, object]],
+            consumed_energies: np.ndarray):
+        self.instance = instance
+        self.operations = operations
+        self.valid_start_times = valid_start_times
+        self.consumed_energies = consumed_energies
+
+    def to_original_start_times(self, start_times: Dict[Operation, float]) -> Dict[Operation, float]:
+        return {self.operations[operation]: start_time for operation, start_time in start_times.items()}
+
+    def from_original_start_times(self, start_times: Dict[Operation, float]) -> Dict[Operation, float]:
+        return {operation: start_times[original_operation]
+                for operation, original_operation in self.operations.items()
+                if original_operation in start_times}
+
+
+def build_subproblem(
+        instance: Instance,
+        fixed_start_times: Dict[Operation, float],
+        included_operations: Set[Operation],
+        valid_start_times: Optional[List[Dict[str, object]]] = None,
+        with_energy_limits: bool = True,
+        horizon: Optional[int] = None) -> Subproblem:
+    """Builds the subproblem of the included operations given the start times of the fixed ones.
+
+    The fixed operations of each job must be its prefix and the included operations must follow it (e.g., the
+    operations scheduled before some time). The free operations start after the fixed operations on their machines,
+    i.e., the idle gaps between the fixed operations are not used, and complete by `horizon` (by default the horizon
+    of the instance), which is also the horizon of the subproblem instance. The original `valid_start_times` (if
+    given) are intersected with these bounds.
+    """
+    if horizon is None:
+        horizon = instance.horizon
+    machine_available = [0] * instance.num_machines
+    for operation, start_time in fixed_start_times.items():
+        machine_available[operation.machine_index] = max(
+            machine_available[operation.machine_index], int(round(start_time)) + operation.processing_time)
+
+    # Start times of the free operations are not constrained from above by the fixed ones. The energy limits may
+    # force idle time, so only the horizon bounds them. Without the energy limits, some optimal schedule is
+    # left-shifted and all its operations start before this time.
+    left_shifted_latest_start_time = max(machine_available) + sum(
+        operation.processing_time for operation in included_operations)
+
+    start_time_bounds = dict()
+    if valid_start_times is not None:
+        for valid_start_time in valid_start_times:
+            operation = instance.jobs[valid_start_time['JobIndex']].operations[valid_start_time['OperationIndex']]
+            start_time_bounds[operation] = (
+                int(valid_start_time['StartTimeFrom']), int(valid_start_time['StartTimeTo']))
+
+    jobs = []
+    operations = dict()
+    subproblem_valid_start_times = []
+    for job in instance.jobs:
+        job_operations = []
+        job_available = 0
+        for operation in job.operations:
+            if operation in fixed_start_times:
+                job_available = int(round(fixed_start_times[operation])) + operation.processing_time
+                continue
+            if operation not in included_operations:
+                break
+
+            subproblem_operation = Operation(
+                operation.id,
+                len(job_operations),
+                len(jobs),
+                operation.machine_index,
+                operation.processing_time,
+                operation.power_consumption)
+            operations[subproblem_operation] = operation
+            job_operations.append(subproblem_operation)
+
+            start_time_from = max(job_available, machine_available[operation.machine_index])
+            start_time_to = horizon - operation.processing_time
+            if not with_energy_limits:
+                start_time_to = min(start_time_to, left_shifted_latest_start_time)
+            if operation in start_time_bounds:
+                start_time_from = max(start_time_from, start_time_bounds[operation][0])
+                start_time_to = min(start_time_to, start_time_bounds[operation][1])
+            subproblem_valid_start_times.append({
+                'JobIndex': len(jobs),
+                'OperationIndex': subproblem_operation.index,
+                'StartTimeFrom': start_time_from,
+                'StartTimeTo': start_time_to
+            })
+
+        if job_operations:
+            jobs.append(Job(job.id, len(jobs), job_operations))
+
+    subproblem_instance = Instance(
+        instance.num_machines,
+        jobs,
+        instance.energy_limit,
+        horizon,
+        instance.length_metering_interval,
+        instance.metadata,
+        instance.instance_filename)
+
+    fixed_operations = list(fixed_start_times.keys())
+    consumed_energies = compute_consumption_in_metering_intervals(
+        np.array([fixed_start_times[operation] for operation in fixed_operations], dtype=np.float64),
+        np.array([operation.processing_time for operation in fixed_operations], dtype=np.float64),
+        np.array([operation.power_consumption for operation in fixed_operations], dtype=np.float64),
+        instance.length_metering_interval,
+        subproblem_instance.num_metering_intervals)
+
+    return Subproblem(subproblem_instance, operations, subproblem_valid_start_times, consumed_energies)
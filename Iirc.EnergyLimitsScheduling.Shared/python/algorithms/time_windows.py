@@ -0,0 +1,98 @@
+from typing import Dict, List, Optional
+import math
+
+from datastructs.instance import Instance, Operation
+
+__all__ = [
+    'TimeWindow',
+    'compute_time_windows',
+    'overlapped_metering_intervals'
+]
+
+
+class TimeWindow:
+
+    __slots__ = [
+        'earliest_start',
+        'latest_start',
+        'earliest_completion',
+        'latest_completion'
+    ]
+
+    def __init__(
+            self,
+            earliest_start: int,
+            latest_start: Optional[int],
+            earliest_completion: int,
+            latest_completion: Optional[int]):
+        self.earliest_start = earliest_start
+        self.latest_start = latest_start
+        self.earliest_completion = earliest_completion
+        self.latest_completion = latest_completion
+
+    def is_empty(self) -> bool:
+        return self.latest_start is not None and self.earliest_start > self.latest_start
+
+
+def compute_time_windows(
+        instance: Instance,
+        horizon: Optional[int],
+        valid_start_times: Optional[List[Dict[str, object]]] = None) -> Dict[Operation, TimeWindow]:
+    """Computes the earliest start and the latest completion of every operation.
+
+    The windows are derived from the job precedences (heads and tails of the operations), from the restricted
+    start times `valid_start_times` (in the format of `ValidStartTimes` of the solver config) and from `horizon`,
+    which is the time by which all the operations must be completed (None means no such time).
+    """
+    earliest_starts = {operation: 0 for operation in instance.get_operations()}
+    latest_starts = {operation: math.inf for operation in instance.get_operations()}
+
+    if valid_start_times is not None:
+        for valid_start_time in valid_start_times:
+            operation = instance.jobs[valid_start_time['JobIndex']].operations[valid_start_time['OperationIndex']]
+            earliest_starts[operation] = max(earliest_starts[operation], int(valid_start_time['StartTimeFrom']))
+            latest_starts[operation] = min(latest_starts[operation], int(valid_start_time['StartTimeTo']))
+
+    if horizon is not None:
+        for operation in instance.get_operations():
+            latest_starts[operation] = min(latest_starts[operation], horizon - operation.processing_time)
+
+    for job in instance.jobs:
+        for operation, next_operation in zip(job.operations[:-1], job.operations[1:]):
+            earliest_starts[next_operation] = max(
+                earliest_starts[next_operation],
+                earliest_starts[operation] + operation.processing_time)
+
+        for operation, next_operation in zip(reversed(job.operations[:-1]), reversed(job.operations[1:])):
+            latest_starts[operation] = min(
+                latest_starts[operation],
+                latest_starts[next_operation] - operation.processing_time)
+
+    time_windows = dict()
+    for operation in instance.get_operations():
+        earliest_start = earliest_starts[operation]
+        latest_start = None if math.isinf(latest_starts[operation]) else int(latest_starts[operation])
+        time_windows[operation] = TimeWindow(
+            earliest_start,
+            latest_start,
+            earliest_start + operation.processing_time,
+            None if latest_start is None else latest_start + operation.processing_time)
+
+    return time_windows
+
+
+def overlapped_metering_intervals(
+        operation: Operation,
+        time_window: TimeWindow,
+        length_metering_interval: int,
+        num_metering_intervals: int) -> range:
+    """Returns indices of the metering intervals that the operation can overlap with a non-zero length."""
+    if operation.processing_time == 0 or time_window.is_empty():
+        return range(0)
+
+    first = time_window.earliest_start // length_metering_interval
+    last = num_metering_intervals - 1
+    if time_window.latest_completion is not None:
+        last = min(last, (time_window.latest_completion - 1) // length_metering_interval)
+
+    return range(first, last + 1)
@@ -0,0 +1,96 @@
+from typing import Dict, Iterable, List
+import random
+
+__all__ = [
+    'generate_instance',
+    'generate_instances'
+]
+
+
+def generate_instance(
+        rng: random.Random,
+        num_jobs: int,
+        num_operations_per_job: int,
+        num_machines: int,
+        power_consumption_lb_multiplier: float,
+        spannable_ratio: float,
+        repetition: int,
+        length_metering_interval: int = 15,
+        min_processing_time: int = 1,
+        max_processing_time: int = 45,
+        energy_limit: float = 10000.0) -> Dict[str, object]:
+    """Generates an instance in the JSON format of the C# instance writer (the raw, unscaled power consumptions).
+
+    Follows the C# `SingleOperationJobsSpannableRatio` dataset generator, generalized to jobs with multiple
+    operations: the first `spannable_ratio` of the jobs have operations that may span more metering intervals.
+    """
+    num_spannable_jobs = int(num_jobs * spannable_ratio)
+    power_consumption_lb = power_consumption_lb_multiplier * energy_limit / (num_machines * length_metering_interval)
+    power_consumption_ub = 2 * energy_limit / (num_machines * length_metering_interval)
+
+    jobs = []
+    operation_id = 0
+    for job_index in range(num_jobs):
+        operations = []
+        for _ in range(num_operations_per_job):
+            if job_index < num_spannable_jobs:
+                processing_time = rng.randrange(16, max_processing_time)
+            else:
+                processing_time = rng.randrange(min_processing_time, length_metering_interval)
+
+            power_consumption = rng.uniform(power_consumption_lb, power_consumption_ub)
+            if min(processing_time, length_metering_interval) * power_consumption > energy_limit:
+                power_consumption = energy_limit / min(processing_time, length_metering_interval)
+
+            operations.append({
+                'Id': operation_id,
+                'MachineIndex': rng.randrange(num_machines),
+                'ProcessingTime': processing_time,
+                'PowerConsumption': power_consumption
+            })
+            operation_id += 1
+
+        jobs.append({'Id': job_index, 'Operations': operations})
+
+    total_processing_time = sum(operation['ProcessingTime'] for job in jobs for operation in job['Operations'])
+    horizon = (total_processing_time // length_metering_interval + 1) * length_metering_interval
+
+    return {
+        'NumMachines': num_machines,
+        'Jobs': jobs,
+        'EnergyLimit': energy_limit,
+        'Horizon': horizon,
+        'LengthMeteringInterval': length_metering_interval,
+        'Metadata': {
+            'powerConsumptionLbMultiplier': power_consumption_lb_multiplier,
+            'spannableRatio': spannable_ratio,
+            'repetition': repetition,
+            'numMachines': num_machines,
+            'numJobs': num_jobs,
+            'numOperationsPerJob': num_operations_per_job
+        }
+    }
+
+
+def generate_instances(
+        seed: int,
+        num_jobs: Iterable[int],
+        num_operations_per_job: int,
+        num_machines: int,
+        num_repetitions: int,
+        power_consumption_lb_multiplier: float = 0.5,
+        spannable_ratio: float = 0.5) -> List[Dict[str, object]]:
+    """Generates the instances for all the numbers of jobs, the same seed gives the same instances."""
+    rng = random.Random(seed)
+    return [
+        generate_instance(
+            rng,
+            n,
+            num_operations_per_job,
+            num_machines,
+            power_consumption_lb_multiplier,
+            spannable_ratio,
+            repetition)
+        for n in num_jobs
+        for repetition in range(num_repetitions)
+    ]
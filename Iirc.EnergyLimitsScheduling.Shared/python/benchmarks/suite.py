@@ -0,0 +1,210 @@
+from typing import Callable, Dict, List, Optional
+from datetime import timedelta
+import io
+import json
+import statistics
+import time
+
+import numpy as np
+
+from datastructs.instance import Instance
+from datastructs.arrays import ArrayInstance
+from datastructs.result import Result, Status
+from algorithms.energy_consumption import operation_arrays, start_times_to_array, \
+    compute_consumption_in_metering_intervals
+from algorithms.greedy_earliest_start_time import GreedyEarliestStartTime, PriorityRule
+
+__all__ = [
+    'BENCHMARK_NAMES',
+    'MODEL_BENCHMARK_NAMES',
+    'BenchmarkRecord',
+    'run_benchmarks'
+]
+
+BENCHMARK_NAMES = [
+    'instance_from_json',
+    'array_instance_from_json',
+    'result_from_json',
+    'energy_profile',
+    'energy_profile_batch',
+    'model_build',
+    'first_solution',
+    'gantt'
+]
+
+# Benchmarks of the CP model, run for each energy formulation (see `solvers.cp_overlap_model.EnergyFormulation`).
+MODEL_BENCHMARK_NAMES = {'model_build', 'first_solution'}
+
+# Number of schedules evaluated at once by the batch energy profile benchmark.
+_BATCH_SIZE = 100
+
+
+class BenchmarkRecord:
+
+    __slots__ = [
+        'name',
+        'instance_filename',
+        'num_operations',
+        'times',
+        'error'
+    ]
+
+    def __init__(
+            self,
+            name: str,
+            instance_filename: str,
+            num_operations: int,
+            times: List[float],
+            error: Optional[str] = None):
+        self.name = name
+        self.instance_filename = instance_filename
+        self.num_operations = num_operations
+        self.times = times
+        self.error = error
+
+    def median(self) -> Optional[float]:
+        return statistics.median(self.times) if self.times else None
+
+    def to_dict(self) -> Dict[str, object]:
+        median = self.median()
+        return {
+            'Name': self.name,
+            'InstanceFilename': self.instance_filename,
+            'NumOperations': self.num_operations,
+            'Times': self.times,
+            'Min': min(self.times) if self.times else None,
+            'Median': median,
+            'Mean': statistics.mean(self.times) if self.times else None,
+            'OperationsPerSecond': self.num_operations / median if median else None,
+            'Error': self.error
+        }
+
+
+def _measure(fn: Callable[[], object], repetitions: int) -> List[float]:
+    times = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _solver_config(time_limit: float, energy_formulation: str) -> dict:
+    return {
+        'TimeLimit': time_limit,
+        'NumWorkers': 1,
+        'WithEnergyLimits': True,
+        'InitStartTimes': None,
+        'ValidStartTimes': None,
+        'FixedOrder': False,
+        'ContinuousStartTimes': False,
+        'SpecializedSolverConfig': {'EnergyFormulation': energy_formulation}
+    }
+
+
+def _benchmark_model_build(instance: Instance, time_limit: float, energy_formulation: str) -> Callable[[], object]:
+    # Imported lazily, docplex is needed only by the solver benchmarks.
+    from solvers.cp_overlap_model import CpOverlapModel
+    solver_config = _solver_config(time_limit, energy_formulation)
+    return lambda: CpOverlapModel(solver_config, instance, instance.num_metering_intervals)
+
+
+def _benchmark_first_solution(
+        instance: Instance,
+        time_limit: float,
+        energy_formulation: str) -> Callable[[], object]:
+    from solvers.cp_overlap_model import CpOverlapModel
+    solver_config = _solver_config(time_limit, energy_formulation)
+    return lambda: CpOverlapModel(solver_config, instance, instance.num_metering_intervals)\
+        .solve(time_limit, SolutionLimit=1)
+
+
+def _benchmark_gantt(instance: Instance, start_times) -> Callable[[], object]:
+    import vizualization.gantt
+    vizualization.gantt.configure(usetex=False, headless=True)
+    import matplotlib.pyplot as plt
+
+    def render():
+        vizualization.gantt.draw(instance, start_times)
+        plt.savefig(io.BytesIO(), format='png')
+        plt.close('all')
+
+    return render
+
+
+def _run_benchmark(
+        name: str,
+        instance_raw: str,
+        instance_filename: str,
+        repetitions: int,
+        time_limit: float,
+        energy_formulation: Optional[str] = None) -> BenchmarkRecord:
+    instance = Instance.from_json(instance_raw, instance_filename)
+    num_operations = sum(len(job.operations) for job in instance.jobs)
+    record_name = name if energy_formulation is None else f'{name}/{energy_formulation}'
+
+    try:
+        # Schedule without the energy limits always exists, it is used as the result to parse and draw.
+        start_times = GreedyEarliestStartTime(instance, False).schedule(PriorityRule.StartTime)
+        if name == 'instance_from_json':
+            fn = lambda: Instance.from_json(instance_raw, instance_filename)
+        elif name == 'array_instance_from_json':
+            fn = lambda: ArrayInstance.from_json(instance_raw, instance_filename)
+        elif name == 'result_from_json':
+            result_raw = Result(Status.Heuristic, False, timedelta(), start_times, None).to_json()
+            fn = lambda: Result.from_json(result_raw, instance)
+        elif name == 'energy_profile':
+            processing_times, power_consumptions = operation_arrays(instance)
+            fn = lambda: compute_consumption_in_metering_intervals(
+                start_times_to_array(instance, start_times),
+                processing_times,
+                power_consumptions,
+                instance.length_metering_interval,
+                instance.num_metering_intervals)
+        elif name == 'energy_profile_batch':
+            processing_times, power_consumptions = operation_arrays(instance)
+            rng = np.random.default_rng(0)
+            batch = start_times_to_array(instance, start_times) \
+                + rng.integers(0, instance.length_metering_interval, size=(_BATCH_SIZE, num_operations))
+            fn = lambda: compute_consumption_in_metering_intervals(
+                batch,
+                processing_times,
+                power_consumptions,
+                instance.length_metering_interval,
+                instance.num_metering_intervals)
+        elif name == 'model_build':
+            fn = _benchmark_model_build(instance, time_limit, energy_formulation)
+        elif name == 'first_solution':
+            fn = _benchmark_first_solution(instance, time_limit, energy_formulation)
+        elif name == 'gantt':
+            fn = _benchmark_gantt(instance, start_times)
+        else:
+            raise ValueError(f'Unknown benchmark {name}')
+
+        return BenchmarkRecord(record_name, instance_filename, num_operations, _measure(fn, repetitions))
+    except Exception as e:
+        return BenchmarkRecord(record_name, instance_filename, num_operations, [], f'{type(e).__name__}: {e}')
+
+
+def run_benchmarks(
+        instances_raw: Dict[str, Dict[str, object]],
+        benchmark_names: List[str],
+        repetitions: int,
+        time_limit: float,
+        energy_formulations: List[str] = ('Overlap',)) -> List[BenchmarkRecord]:
+    """Runs the benchmarks on the instances (keyed by their filenames).
+
+    The benchmarks of the CP model are named `<benchmark>/<energy formulation>`. A benchmark that cannot run (e.g.,
+    CP Optimizer is not available) is recorded with its error.
+    """
+    records = []
+    for instance_filename, instance_raw in instances_raw.items():
+        s = json.dumps(instance_raw)
+        for name in benchmark_names:
+            if name in MODEL_BENCHMARK_NAMES:
+                for energy_formulation in energy_formulations:
+                    records.append(_run_benchmark(
+                        name, s, instance_filename, repetitions, time_limit, energy_formulation))
+            else:
+                records.append(_run_benchmark(name, s, instance_filename, repetitions, time_limit))
+    return records
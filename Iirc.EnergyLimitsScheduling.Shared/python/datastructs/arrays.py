@@ -0,0 +1,363 @@
+from typing import List, Generator, Dict, Optional
+from datetime import timedelta
+import json
+
+import numpy as np
+
+import utils
+from datastructs.instance import Instance
+from datastructs.result import Result, Status
+
+__all__ = [
+    'OperationView',
+    'JobView',
+    'ArrayInstance',
+    'ArrayResult'
+]
+
+
+class OperationView:
+    """Operation backed by the arrays of `ArrayInstance`, interchangeable with `Operation` (e.g., as a dict key)."""
+
+    __slots__ = [
+        '_instance',
+        '_position'
+    ]
+
+    def __init__(self, instance: 'ArrayInstance', position: int):
+        self._instance = instance
+        self._position = position
+
+    @property
+    def position(self) -> int:
+        """Position of the operation in the arrays of the instance."""
+        return self._position
+
+    @property
+    def id(self) -> int:
+        return int(self._instance.operation_ids[self._position])
+
+    @property
+    def index(self) -> int:
+        return self._position - int(self._instance.job_offsets[self.job_index])
+
+    @property
+    def job_index(self) -> int:
+        return int(self._instance.job_indices[self._position])
+
+    @property
+    def machine_index(self) -> int:
+        return int(self._instance.machine_indices[self._position])
+
+    @property
+    def processing_time(self) -> int:
+        return int(self._instance.processing_times[self._position])
+
+    @property
+    def power_consumption(self) -> float:
+        return float(self._instance.power_consumptions[self._position])
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __eq__(self, other):
+        return self.id == other.id
+
+
+class JobView:
+    """Job backed by the arrays of `ArrayInstance`, interchangeable with `Job`."""
+
+    __slots__ = [
+        '_instance',
+        '_index',
+        '_operations'
+    ]
+
+    def __init__(self, instance: 'ArrayInstance', index: int):
+        self._instance = instance
+        self._index = index
+        self._operations = None
+
+    @property
+    def id(self) -> int:
+        return int(self._instance.job_ids[self._index])
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def operations(self) -> List[OperationView]:
+        if self._operations is None:
+            self._operations = [
+                OperationView(self._instance, position)
+                for position in range(
+                    int(self._instance.job_offsets[self._index]),
+                    int(self._instance.job_offsets[self._index + 1]))
+            ]
+        return self._operations
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __eq__(self, other):
+        return self.id == other.id
+
+
+class ArrayInstance:
+    """Instance stored as contiguous arrays (one entry per operation, in job order).
+
+    The operations of job `j` are at positions `job_offsets[j]` to `job_offsets[j + 1] - 1`. The `jobs` and
+    `get_operations` provide the same API as `Instance` through views into the arrays.
+    """
+
+    __slots__ = [
+        'num_machines',
+        'energy_limit',
+        'horizon',
+        'length_metering_interval',
+        'num_metering_intervals',
+        'metadata',
+        'instance_filename',
+        'job_ids',
+        'job_offsets',
+        'job_indices',
+        'operation_ids',
+        'machine_indices',
+        'processing_times',
+        'power_consumptions',
+        '_jobs'
+    ]
+
+    def __init__(
+            self,
+            num_machines: int,
+            job_ids: np.ndarray,
+            job_offsets: np.ndarray,
+            operation_ids: np.ndarray,
+            machine_indices: np.ndarray,
+            processing_times: np.ndarray,
+            power_consumptions: np.ndarray,
+            energy_limit: float,
+            horizon: int,
+            length_metering_interval: int,
+            metadata: Optional[Dict[str, object]] = None,
+            instance_filename: str = None):
+        self.num_machines = num_machines
+        self.job_ids = job_ids
+        self.job_offsets = job_offsets
+        self.job_indices = np.repeat(np.arange(len(job_ids), dtype=np.int32), np.diff(job_offsets))
+        self.operation_ids = operation_ids
+        self.machine_indices = machine_indices
+        self.processing_times = processing_times
+        self.power_consumptions = power_consumptions
+        self.energy_limit = energy_limit
+        self.horizon = horizon
+        self.length_metering_interval = length_metering_interval
+        self.num_metering_intervals = int(self.horizon / self.length_metering_interval)
+        self.metadata = metadata if metadata is not None else dict()
+        self.instance_filename = instance_filename
+        self._jobs = None
+
+    @property
+    def num_operations(self) -> int:
+        return len(self.operation_ids)
+
+    @property
+    def jobs(self) -> List[JobView]:
+        if self._jobs is None:
+            self._jobs = [JobView(self, job_index) for job_index in range(len(self.job_ids))]
+        return self._jobs
+
+    def get_operations(self) -> Generator[OperationView, None, None]:
+        for job in self.jobs:
+            for operation in job.operations:
+                yield operation
+
+    def operation_position(self, job_index: int, operation_index: int) -> int:
+        return int(self.job_offsets[job_index]) + operation_index
+
+    def get_operation(self, job_index: int, operation_index: int) -> OperationView:
+        return OperationView(self, self.operation_position(job_index, operation_index))
+
+    @staticmethod
+    def from_instance(instance: Instance):
+        operations = list(instance.get_operations())
+        return ArrayInstance(
+            instance.num_machines,
+            np.array([job.id for job in instance.jobs], dtype=np.int64),
+            np.cumsum([0] + [len(job.operations) for job in instance.jobs], dtype=np.int64),
+            np.array([operation.id for operation in operations], dtype=np.int64),
+            np.array([operation.machine_index for operation in operations], dtype=np.int32),
+            np.array([operation.processing_time for operation in operations], dtype=np.int64),
+            np.array([operation.power_consumption for operation in operations], dtype=np.float64),
+            instance.energy_limit,
+            instance.horizon,
+            instance.length_metering_interval,
+            instance.metadata,
+            instance.instance_filename
+        )
+
+    @staticmethod
+    def from_json(s: str, instance_filename: str = None):
+        return ArrayInstance.from_dict(json.loads(s), instance_filename)
+
+    @staticmethod
+    def from_dict(ins_raw: Dict[str, object], instance_filename: str = None):
+        operations_raw = [operation_raw for job_raw in ins_raw['Jobs'] for operation_raw in job_raw['Operations']]
+        num_operations = len(operations_raw)
+
+        return ArrayInstance(
+            ins_raw['NumMachines'],
+            np.array([job_raw['Id'] for job_raw in ins_raw['Jobs']], dtype=np.int64),
+            np.cumsum([0] + [len(job_raw['Operations']) for job_raw in ins_raw['Jobs']], dtype=np.int64),
+            np.fromiter((d['Id'] for d in operations_raw), dtype=np.int64, count=num_operations),
+            np.fromiter((d['MachineIndex'] for d in operations_raw), dtype=np.int32, count=num_operations),
+            np.fromiter((d['ProcessingTime'] for d in operations_raw), dtype=np.int64, count=num_operations),
+            np.fromiter((d['PowerConsumption'] for d in operations_raw), dtype=np.float64, count=num_operations)
+            / 100.0,
+            ins_raw['EnergyLimit'] / 100.0,
+            ins_raw['Horizon'],
+            ins_raw['LengthMeteringInterval'],
+            ins_raw['Metadata'],
+            instance_filename
+        )
+
+
+class ArrayResult:
+    """Result with the start times stored as an array in the operation order of `ArrayInstance`.
+
+    The operations without a start time have NaN, `start_times_array` is None if the result has no start times.
+    """
+
+    __slots__ = [
+        'status',
+        'time_limit_reached',
+        'running_time',
+        'start_times_array',
+        'lower_bound',
+        'instance',
+        'timings',
+        'model_statistics'
+    ]
+
+    def __init__(
+            self,
+            status: Status,
+            time_limit_reached: bool,
+            running_time: timedelta,
+            start_times_array: Optional[np.ndarray],
+            lower_bound: Optional[float],
+            instance: ArrayInstance,
+            timings: Optional[Dict[str, float]] = None,
+            model_statistics: Optional[Dict[str, int]] = None):
+        self.status = status
+        self.time_limit_reached = time_limit_reached
+        self.running_time = running_time
+        self.start_times_array = start_times_array
+        self.lower_bound = lower_bound
+        self.instance = instance
+        self.timings = timings
+        self.model_statistics = model_statistics
+
+    @property
+    def start_times(self) -> Optional[Dict[OperationView, float]]:
+        if self.start_times_array is None:
+            return None
+
+        operations = list(self.instance.get_operations())
+        return {
+            operations[position]: float(self.start_times_array[position])
+            for position in np.flatnonzero(~np.isnan(self.start_times_array))
+        }
+
+    def makespan(self) -> Optional[float]:
+        if self.start_times_array is None:
+            return None
+
+        completion_times = self.start_times_array + self.instance.processing_times
+        if np.isnan(completion_times).all():
+            return None
+        return float(np.nanmax(completion_times))
+
+    def to_result(self) -> Result:
+        return Result(
+            self.status,
+            self.time_limit_reached,
+            self.running_time,
+            self.start_times,
+            self.lower_bound,
+            self.timings,
+            self.model_statistics)
+
+    def to_dict(self) -> Dict[str, object]:
+        return self.to_result().to_dict()
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @staticmethod
+    def from_result(result: Result, instance: ArrayInstance):
+        start_times_array = None
+        if result.start_times is not None:
+            start_times_array = np.full(instance.num_operations, np.nan)
+            for operation, start_time in result.start_times.items():
+                start_times_array[instance.operation_position(operation.job_index, operation.index)] = start_time
+
+        return ArrayResult(
+            result.status,
+            result.time_limit_reached,
+            result.running_time,
+            start_times_array,
+            result.lower_bound,
+            instance,
+            result.timings,
+            result.model_statistics
+        )
+
+    @staticmethod
+    def from_store(store, dataset: str, solver_id: str, instance: ArrayInstance) -> Optional['ArrayResult']:
+        """Reads the result of the solver on the instance from `ResultsStore`, None if it is not stored.
+
+        The packed start times are used as the array directly.
+        """
+        stored = store.result(dataset, solver_id, instance.instance_filename)
+        if stored is None:
+            return None
+
+        return ArrayResult(
+            stored.status,
+            stored.time_limit_reached,
+            None if stored.running_time is None else timedelta(seconds=stored.running_time),
+            stored.start_times,
+            stored.lower_bound,
+            instance,
+            stored.timings,
+            stored.model_statistics
+        )
+
+    @staticmethod
+    def from_json(s: str, instance: ArrayInstance):
+        return ArrayResult.from_dict(json.loads(s), instance)
+
+    @staticmethod
+    def from_dict(result_raw: Dict[str, object], instance: ArrayInstance):
+        start_times_array = None
+        if result_raw['StartTimes'] is not None:
+            start_times_array = np.full(instance.num_operations, np.nan)
+            if result_raw['StartTimes']:
+                job_indices = np.array([d['JobIndex'] for d in result_raw['StartTimes']], dtype=np.int64)
+                operation_indices = np.array([d['OperationIndex'] for d in result_raw['StartTimes']], dtype=np.int64)
+                start_times_array[instance.job_offsets[job_indices] + operation_indices] = \
+                    [d['StartTime'] for d in result_raw['StartTimes']]
+
+        return ArrayResult(
+            Status(result_raw['Status']),
+            result_raw['TimeLimitReached'],
+            utils.parse_timedelta(result_raw['RunningTime']),
+            start_times_array,
+            result_raw['LowerBound'],
+            instance,
+            result_raw.get('Timings'),
+            result_raw.get('ModelStatistics')
+        )
@@ -0,0 +1,156 @@
+from typing import Iterable, List, Dict, Optional, Union
+from pathlib import Path
+import mmap
+import struct
+import json
+
+import numpy as np
+
+from datastructs.arrays import ArrayInstance
+from datastructs.instance import Instance
+
+__all__ = [
+    'write_dataset_pack',
+    'DatasetPack',
+    'load_instance'
+]
+
+# Layout of the pack (little endian):
+#   header (_HEADER_SIZE bytes): magic, version, number of instances, jobs and operations, offset and length of the
+#   metadata index,
+#   job arrays: ids (int64), numbers of operations (int64),
+#   operation arrays: ids (int64), machine indices (int64), processing times (int64), power consumptions (float64),
+#   metadata index: JSON list with the header fields of each instance and positions of its jobs and operations.
+_MAGIC = b'ELSPACK\0'
+_VERSION = 1
+_HEADER_FORMAT = '<8sIIQQQQ'
+_HEADER_SIZE = 64
+_JOB_ARRAYS = [('job_ids', np.int64), ('job_num_operations', np.int64)]
+_OPERATION_ARRAYS = [
+    ('operation_ids', np.int64),
+    ('machine_indices', np.int64),
+    ('processing_times', np.int64),
+    ('power_consumptions', np.float64)
+]
+
+
+def write_dataset_pack(instances: Iterable[ArrayInstance], pack_path: Path):
+    index = []
+    job_arrays = {name: [] for name, _ in _JOB_ARRAYS}
+    operation_arrays = {name: [] for name, _ in _OPERATION_ARRAYS}
+    num_jobs = 0
+    num_operations = 0
+    for instance in instances:
+        index.append({
+            'InstanceFilename': instance.instance_filename,
+            'NumMachines': instance.num_machines,
+            'EnergyLimit': instance.energy_limit,
+            'Horizon': instance.horizon,
+            'LengthMeteringInterval': instance.length_metering_interval,
+            'Metadata': instance.metadata,
+            'JobStart': num_jobs,
+            'NumJobs': len(instance.job_ids),
+            'OperationStart': num_operations,
+            'NumOperations': instance.num_operations
+        })
+        job_arrays['job_ids'].append(instance.job_ids)
+        job_arrays['job_num_operations'].append(np.diff(instance.job_offsets))
+        operation_arrays['operation_ids'].append(instance.operation_ids)
+        operation_arrays['machine_indices'].append(instance.machine_indices)
+        operation_arrays['processing_times'].append(instance.processing_times)
+        operation_arrays['power_consumptions'].append(instance.power_consumptions)
+        num_jobs += len(instance.job_ids)
+        num_operations += instance.num_operations
+
+    index_raw = json.dumps(index).encode('utf-8')
+    index_offset = _HEADER_SIZE + 8 * (len(_JOB_ARRAYS) * num_jobs + len(_OPERATION_ARRAYS) * num_operations)
+
+    tmp_pack_path = pack_path.with_name(pack_path.name + '.tmp')
+    with tmp_pack_path.open('wb') as f:
+        header = struct.pack(
+            _HEADER_FORMAT, _MAGIC, _VERSION, len(index), num_jobs, num_operations, index_offset, len(index_raw))
+        f.write(header.ljust(_HEADER_SIZE, b'\0'))
+        for arrays, arrays_format in [(job_arrays, _JOB_ARRAYS), (operation_arrays, _OPERATION_ARRAYS)]:
+            for name, dtype in arrays_format:
+                if arrays[name]:
+                    f.write(np.concatenate(arrays[name]).astype(dtype).tobytes())
+        f.write(index_raw)
+    tmp_pack_path.replace(pack_path)
+
+
+class DatasetPack:
+    """Memory-mapped dataset pack, the instances are materialized by their filenames on access.
+
+    The arrays of the returned instances are read-only views into the mapped file.
+    """
+
+    def __init__(self, pack_path: Path):
+        self.pack_path = pack_path
+        with pack_path.open('rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, num_instances, num_jobs, num_operations, index_offset, index_length = struct.unpack_from(
+            _HEADER_FORMAT, self._mmap, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f'{pack_path} is not a dataset pack of version {_VERSION}')
+
+        self._arrays: Dict[str, np.ndarray] = dict()
+        offset = _HEADER_SIZE
+        for arrays_format, count in [(_JOB_ARRAYS, num_jobs), (_OPERATION_ARRAYS, num_operations)]:
+            for name, dtype in arrays_format:
+                self._arrays[name] = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=offset)
+                offset += 8 * count
+
+        index = json.loads(self._mmap[index_offset:index_offset + index_length].decode('utf-8'))
+        self._index = {d['InstanceFilename']: d for d in index}
+
+    @property
+    def instance_filenames(self) -> List[str]:
+        return list(self._index.keys())
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, instance_filename: str) -> bool:
+        return instance_filename in self._index
+
+    def __getitem__(self, instance_filename: str) -> ArrayInstance:
+        d = self._index[instance_filename]
+        jobs = slice(d['JobStart'], d['JobStart'] + d['NumJobs'])
+        operations = slice(d['OperationStart'], d['OperationStart'] + d['NumOperations'])
+
+        return ArrayInstance(
+            d['NumMachines'],
+            self._arrays['job_ids'][jobs],
+            np.concatenate(([0], np.cumsum(self._arrays['job_num_operations'][jobs]))),
+            self._arrays['operation_ids'][operations],
+            self._arrays['machine_indices'][operations],
+            self._arrays['processing_times'][operations],
+            self._arrays['power_consumptions'][operations],
+            d['EnergyLimit'],
+            d['Horizon'],
+            d['LengthMeteringInterval'],
+            d['Metadata'],
+            d['InstanceFilename']
+        )
+
+    def instances(self) -> Iterable[ArrayInstance]:
+        for instance_filename in self._index:
+            yield self[instance_filename]
+
+
+# Dataset packs opened by the current (worker) process.
+_dataset_packs: Dict[Path, DatasetPack] = dict()
+
+
+def load_instance(
+        dataset_path: Path,
+        dataset_pack_path: Optional[Path],
+        instance_filename: str) -> Union[Instance, ArrayInstance]:
+    """Loads the instance from the dataset directory (lazily) or from the dataset pack (if given)."""
+    if dataset_pack_path is None:
+        return Instance.from_file(dataset_path / instance_filename, instance_filename, lazy=True)
+
+    if dataset_pack_path not in _dataset_packs:
+        _dataset_packs[dataset_pack_path] = DatasetPack(dataset_pack_path)
+    return _dataset_packs[dataset_pack_path][instance_filename]
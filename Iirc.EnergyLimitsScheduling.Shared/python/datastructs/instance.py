@@ -1,4 +1,6 @@
 from typing import List, Generator, Dict, Optional
+from array import array
+from pathlib import Path
 import json
 
 __all__ = [
@@ -59,11 +61,93 @@ class Job:
     def __eq__(self, other):
         return self.id == other.id
 
+
+def _jobs_from_raw(jobs_raw: List[Dict[str, object]]) -> List[Job]:
+    jobs = []
+    for job_index, job_raw in enumerate(jobs_raw):
+        operations = []
+        for operation_index, operation_raw in enumerate(job_raw['Operations']):
+            operations.append(Operation(
+                operation_raw['Id'],
+                operation_index,
+                job_index,
+                operation_raw['MachineIndex'],
+                operation_raw['ProcessingTime'],
+                operation_raw['PowerConsumption'] / 100.0
+            ))
+        jobs.append(Job(
+            job_raw['Id'],
+            job_index,
+            operations
+        ))
+    return jobs
+
+
+class _PackedJobs:
+    """Jobs of a lazily loaded instance packed into arrays, one entry per job or operation (in job order)."""
+
+    __slots__ = [
+        'job_ids',
+        'job_offsets',
+        'operation_ids',
+        'machine_indices',
+        'processing_times',
+        'power_consumptions'
+    ]
+
+    def __init__(self, jobs_raw: List[Dict[str, object]]):
+        self.job_ids = array('q')
+        self.job_offsets = array('q', [0])
+        self.operation_ids = array('q')
+        self.machine_indices = array('q')
+        self.processing_times = array('q')
+        self.power_consumptions = array('d')
+        for job_raw in jobs_raw:
+            self.job_ids.append(job_raw['Id'])
+            for operation_raw in job_raw['Operations']:
+                self.operation_ids.append(operation_raw['Id'])
+                self.machine_indices.append(operation_raw['MachineIndex'])
+                self.processing_times.append(operation_raw['ProcessingTime'])
+                self.power_consumptions.append(operation_raw['PowerConsumption'] / 100.0)
+            self.job_offsets.append(len(self.operation_ids))
+
+    def operation(self, job_index: int, operation_index: int) -> Operation:
+        position = self.job_offsets[job_index] + operation_index
+        if operation_index < 0 or position >= self.job_offsets[job_index + 1]:
+            raise IndexError('Operation index out of range')
+        return Operation(
+            self.operation_ids[position],
+            operation_index,
+            job_index,
+            self.machine_indices[position],
+            self.processing_times[position],
+            self.power_consumptions[position])
+
+    def operations(self) -> Generator[Operation, None, None]:
+        for job_index in range(len(self.job_ids)):
+            for operation_index in range(self.job_offsets[job_index + 1] - self.job_offsets[job_index]):
+                yield self.operation(job_index, operation_index)
+
+    def jobs(self) -> List[Job]:
+        return [
+            Job(job_id, job_index, [
+                self.operation(job_index, operation_index)
+                for operation_index in range(self.job_offsets[job_index + 1] - self.job_offsets[job_index])
+            ])
+            for job_index, job_id in enumerate(self.job_ids)
+        ]
+
+
 class Instance:
+    """Instance of the problem.
+
+    A lazily loaded instance (see `from_json`) keeps its jobs packed until `jobs` is first accessed.
+    """
 
     __slots__ = [
         'num_machines',
-        'jobs',
+        '_jobs',
+        '_packed_jobs',
         'energy_limit',
         'horizon',
         'length_metering_interval',
@@ -82,7 +166,8 @@ class Instance:
         metadata: Optional[Dict[str, object]] = None,
         instance_filename: str = None):
         self.num_machines = num_machines
-        self.jobs = jobs
+        self._jobs = jobs
+        self._packed_jobs: Optional[_PackedJobs] = None
         self.energy_limit = energy_limit
         self.horizon = horizon
         self.length_metering_interval = length_metering_interval
@@ -90,36 +175,63 @@ class Instance:
         self.metadata = metadata if metadata is not None else dict()
         self.instance_filename = instance_filename
 
+    @property
+    def jobs(self) -> List[Job]:
+        if self._packed_jobs is not None:
+            self._jobs = self._packed_jobs.jobs()
+            self._packed_jobs = None
+        return self._jobs
+
+    @jobs.setter
+    def jobs(self, jobs: List[Job]):
+        self._jobs = jobs
+        self._packed_jobs = None
+
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the jobs are materialized."""
+        return self._packed_jobs is None
+
+    def get_operation(self, job_index: int, operation_index: int) -> Operation:
+        """Returns the operation by its indices, the jobs of a lazy instance are not materialized."""
+        if self._packed_jobs is not None:
+            return self._packed_jobs.operation(job_index, operation_index)
+        return self.jobs[job_index].operations[operation_index]
+
     def get_operations(self) -> Generator[Operation, None, None]:
+        if self._packed_jobs is not None:
+            yield from self._packed_jobs.operations()
+            return
+
         for job in self.jobs:
             for operation in job.operations:
                 yield operation
 
     @staticmethod
-    def from_json(s: str, instance_filename: str = None):
+    def from_json(s: str, instance_filename: str = None, lazy: bool = False):
+        """Parses the instance, with `lazy` the jobs are packed into arrays instead of the `Job` and `Operation`
+        objects until `jobs` is accessed (`get_operation` and `get_operations` do not materialize them)."""
         ins_raw = json.loads(s)
+        if not lazy:
+            return Instance.from_dict(ins_raw, instance_filename)
+        if not isinstance(ins_raw, dict):
+            raise ValueError('Instance must be a JSON object')
 
-        jobs = []
-        for job_index, job_raw in enumerate(ins_raw['Jobs']):
-            operations = []
-            for operation_index, operation_raw in enumerate(job_raw['Operations']):
-                operations.append(Operation(
-                    operation_raw['Id'],
-                    operation_index,
-                    job_index,
-                    operation_raw['MachineIndex'],
-                    operation_raw['ProcessingTime'],
-                    operation_raw['PowerConsumption'] / 100.0
-                ))
-            jobs.append(Job(
-                job_raw['Id'],
-                job_index,
-                operations
-            ))
+        instance = Instance.from_dict(dict(ins_raw, Jobs=[]), instance_filename)
+        instance._jobs = None
+        instance._packed_jobs = _PackedJobs(ins_raw['Jobs'])
+        return instance
+
+    @staticmethod
+    def from_file(path: Path, instance_filename: str = None, lazy: bool = False):
+        """Reads the instance from the file, see `from_json`."""
+        return Instance.from_json(path.read_text(), instance_filename, lazy)
 
+    @staticmethod
+    def from_dict(ins_raw: Dict[str, object], instance_filename: str = None):
         return Instance(
             ins_raw['NumMachines'],
-            jobs,
+            _jobs_from_raw(ins_raw['Jobs']),
             ins_raw['EnergyLimit'] / 100.0,
             ins_raw['Horizon'],
             ins_raw['LengthMeteringInterval'],
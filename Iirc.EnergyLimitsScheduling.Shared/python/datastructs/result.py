@@ -2,6 +2,7 @@ from typing import Dict, Optional
 from enum import IntEnum
 from datetime import timedelta
 import json
+import math
 import utils
 
 from datastructs.instance import Instance, Operation
@@ -20,7 +21,9 @@ class Result:
         'time_limit_reached',
         'running_time',
         'start_times',
-        'lower_bound'
+        'lower_bound',
+        'timings',
+        'model_statistics'
     ]
 
     def __init__(
@@ -29,14 +32,23 @@ class Result:
         time_limit_reached: bool,
         running_time: timedelta,
         start_times: Optional[Dict[Operation, float]],
-        lower_bound: Optional[float]):
+        lower_bound: Optional[float],
+        timings: Optional[Dict[str, float]] = None,
+        model_statistics: Optional[Dict[str, int]] = None):
         self.status = status
         self.time_limit_reached = time_limit_reached
         self.running_time = running_time
         self.start_times = start_times
         self.lower_bound = lower_bound
+        # Durations (in seconds) of the solver phases, keyed by the phase names.
+        self.timings = timings
+        # Sizes of the solved model, e.g., numbers of variables and constraints.
+        self.model_statistics = model_statistics
 
     def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    def to_dict(self) -> Dict[str, object]:
         d = dict()
         d['Status'] = self.status
         d['TimeLimitReached'] = self.time_limit_reached
@@ -51,16 +63,24 @@ class Result:
                 for operation, start_time in self.start_times.items()
             ]
 
-        return json.dumps(d)
+        # Optional sections, not known to the C# reader.
+        if self.timings is not None:
+            d['Timings'] = self.timings
+        if self.model_statistics is not None:
+            d['ModelStatistics'] = self.model_statistics
+
+        return d
 
     @staticmethod
     def from_json(s: str, ins: Instance):
-        result_raw = json.loads(s)
+        return Result.from_dict(json.loads(s), ins)
 
+    @staticmethod
+    def from_dict(result_raw: Dict[str, object], ins: Instance):
         start_times = None
         if result_raw['StartTimes'] is not None:
             start_times = {
-                ins.jobs[d['JobIndex']].operations[d['OperationIndex']]: d['StartTime']
+                ins.get_operation(d['JobIndex'], d['OperationIndex']): d['StartTime']
                 for d in result_raw['StartTimes']
             }
 
@@ -69,7 +89,34 @@ class Result:
             result_raw['TimeLimitReached'],
             utils.parse_timedelta(result_raw['RunningTime']),
             start_times,
-            result_raw['LowerBound']
+            result_raw['LowerBound'],
+            result_raw.get('Timings'),
+            result_raw.get('ModelStatistics')
+        )
+
+    @staticmethod
+    def from_store(store, dataset: str, solver_id: str, ins: Instance) -> Optional['Result']:
+        """Reads the result of the solver on the instance from `ResultsStore`, None if it is not stored."""
+        stored = store.result(dataset, solver_id, ins.instance_filename)
+        if stored is None:
+            return None
+
+        start_times = None
+        if stored.start_times is not None:
+            start_times = {
+                operation: float(start_time)
+                for operation, start_time in zip(ins.get_operations(), stored.start_times)
+                if not math.isnan(start_time)
+            }
+
+        return Result(
+            stored.status,
+            stored.time_limit_reached,
+            None if stored.running_time is None else timedelta(seconds=stored.running_time),
+            start_times,
+            stored.lower_bound,
+            stored.timings,
+            stored.model_statistics
         )
 
     def makespan(self) -> Optional[float]:
@@ -0,0 +1,335 @@
+from typing import Callable, Iterator, List, Dict, Tuple, Optional
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import sqlite3
+import json
+import os
+
+from datastructs.instance import Instance
+from datastructs.result import Result, Status
+from algorithms.energy_consumption import operation_arrays, start_times_to_array, \
+    compute_consumption_in_metering_intervals, are_energy_limits_satisfied
+
+__all__ = [
+    'RESULTS_INDEX_FILENAME',
+    'RESULT_COLUMNS',
+    'IndexedInstance',
+    'IndexedResult',
+    'ResultsIndex',
+    'connect',
+    'stat_files',
+    'find_changed',
+    'reduce_in_parallel',
+    'read_results',
+    'instance_values',
+    'result_values'
+]
+
+RESULTS_INDEX_FILENAME = 'results_index.sqlite'
+
+# Index with a different version is rebuilt.
+_SCHEMA_VERSION = 2
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS instances (
+    instance_filename TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    horizon INTEGER NOT NULL,
+    length_metering_interval INTEGER NOT NULL,
+    metadata TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    solver_id TEXT NOT NULL,
+    instance_filename TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    time_limit_reached INTEGER NOT NULL,
+    running_time REAL,
+    lower_bound REAL,
+    makespan REAL,
+    energy_limits_satisfied INTEGER,
+    timings TEXT,
+    model_statistics TEXT,
+    PRIMARY KEY (solver_id, instance_filename)
+);
+"""
+# Reduced result (see `result_values`), the columns of the results table after the stats of the result file.
+RESULT_COLUMNS = 'status, time_limit_reached, running_time, lower_bound, makespan, energy_limits_satisfied, ' \
+                 'timings, model_statistics'
+
+
+class IndexedInstance:
+
+    __slots__ = [
+        'instance_filename',
+        'horizon',
+        'length_metering_interval',
+        'metadata'
+    ]
+
+    def __init__(
+            self,
+            instance_filename: str,
+            horizon: int,
+            length_metering_interval: int,
+            metadata: Dict[str, object]):
+        self.instance_filename = instance_filename
+        self.horizon = horizon
+        self.length_metering_interval = length_metering_interval
+        self.metadata = metadata
+
+
+class IndexedResult:
+
+    __slots__ = [
+        'status',
+        'time_limit_reached',
+        'running_time',
+        'lower_bound',
+        'makespan',
+        'energy_limits_satisfied',
+        'timings',
+        'model_statistics'
+    ]
+
+    def __init__(
+            self,
+            status: Status,
+            time_limit_reached: bool,
+            running_time: Optional[float],
+            lower_bound: Optional[float],
+            makespan: Optional[float],
+            energy_limits_satisfied: Optional[bool],
+            timings: Optional[Dict[str, float]] = None,
+            model_statistics: Optional[Dict[str, int]] = None):
+        self.status = status
+        self.time_limit_reached = time_limit_reached
+        self.running_time = running_time
+        self.lower_bound = lower_bound
+        self.makespan = makespan
+        self.energy_limits_satisfied = energy_limits_satisfied
+        self.timings = timings
+        self.model_statistics = model_statistics
+
+    @classmethod
+    def from_row(cls, row: tuple, *args):
+        """Creates the result from the values of `RESULT_COLUMNS` (see `result_values`), `args` are passed to the
+        constructor of a subclass."""
+        return cls(
+            Status(row[0]),
+            bool(row[1]),
+            row[2],
+            row[3],
+            row[4],
+            None if row[5] is None else bool(row[5]),
+            None if row[6] is None else json.loads(row[6]),
+            None if row[7] is None else json.loads(row[7]),
+            *args)
+
+
+def connect(database_path: Path, schema_version: int, schema: str) -> sqlite3.Connection:
+    """Opens the SQLite database, its tables are dropped and recreated if it has a different schema version."""
+    connection = sqlite3.connect(str(database_path))
+    if connection.execute('PRAGMA user_version').fetchone()[0] != schema_version:
+        with connection:
+            for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall():
+                connection.execute(f'DROP TABLE {row[0]}')
+            connection.execute(f'PRAGMA user_version = {schema_version}')
+    connection.executescript(schema)
+    return connection
+
+
+def stat_files(dir_path: Path) -> Dict[str, Tuple[int, int]]:
+    """Returns the size and modification time of each file in the directory, keyed by the filenames."""
+    if not dir_path.is_dir():
+        return dict()
+
+    stats = dict()
+    with os.scandir(str(dir_path)) as entries:
+        for entry in entries:
+            if entry.is_file():
+                stat = entry.stat()
+                stats[entry.name] = (stat.st_size, stat.st_mtime_ns)
+    return stats
+
+
+def find_changed(
+        instance_stats: Dict[str, Tuple[int, int]],
+        result_stats: Dict[str, Dict[str, Tuple[int, int]]],
+        indexed_instance_stats: Dict[str, Tuple[int, int]],
+        indexed_result_stats: Dict[Tuple[str, str], Tuple[int, int]]) -> Dict[str, List[str]]:
+    """Returns the solvers whose result files need to be parsed, keyed by the instance filenames.
+
+    These are the new or changed result files and all the result files of a new or changed instance, the instance
+    is also listed (possibly with no solvers) if it is new or changed.
+    """
+    tasks: Dict[str, List[str]] = dict()
+    for instance_filename, stat in instance_stats.items():
+        instance_changed = indexed_instance_stats.get(instance_filename) != stat
+        changed_solver_ids = [
+            solver_id
+            for solver_id, solver_result_stats in result_stats.items()
+            if instance_filename in solver_result_stats
+            and (instance_changed
+                 or indexed_result_stats.get((solver_id, instance_filename))
+                 != solver_result_stats[instance_filename])
+        ]
+        if instance_changed or changed_solver_ids:
+            tasks[instance_filename] = changed_solver_ids
+    return tasks
+
+
+def reduce_in_parallel(
+        reduce_instance: Callable[[str, List[str]], Tuple[tuple, List[tuple]]],
+        tasks: Dict[str, List[str]],
+        num_processes: Optional[int] = None) -> Iterator[Tuple[str, tuple, List[tuple]]]:
+    """Reduces the instances of the tasks (see `find_changed`) in parallel, yields the instance filenames with the
+    rows returned by `reduce_instance`."""
+    num_processes = num_processes if num_processes is not None else os.cpu_count()
+    instance_filenames = list(tasks.keys())
+    with ProcessPoolExecutor(max_workers=num_processes) as executor:
+        chunksize = max(1, len(instance_filenames) // (4 * num_processes))
+        reduced = executor.map(
+            reduce_instance, instance_filenames, [tasks[f] for f in instance_filenames], chunksize=chunksize)
+        for instance_filename, (instance_row, result_rows) in zip(instance_filenames, reduced):
+            yield instance_filename, instance_row, result_rows
+
+
+def read_results(
+        dataset_results_path: Path,
+        instance: Instance,
+        solver_ids: List[str]) -> Iterator[Tuple[str, Result]]:
+    """Yields the results of the solvers on the instance, skipping those that are still being written."""
+    for solver_id in solver_ids:
+        try:
+            yield solver_id, Result.from_json(
+                (dataset_results_path / solver_id / instance.instance_filename).read_text(), instance)
+        except ValueError:
+            # It will be parsed by the next refresh.
+            continue
+
+
+def instance_values(instance: Instance) -> tuple:
+    return instance.horizon, instance.length_metering_interval, json.dumps(instance.metadata)
+
+
+def result_values(instance: Instance, result: Result) -> tuple:
+    """Reduces the result to the values of `RESULT_COLUMNS`, the schedule is checked against the energy limits."""
+    makespan = None
+    energy_limits_satisfied = None
+    if result.status == Status.Optimal or result.status == Status.Heuristic:
+        makespan = result.makespan()
+        processing_times, power_consumptions = operation_arrays(instance)
+        consumptions = compute_consumption_in_metering_intervals(
+            start_times_to_array(instance, result.start_times),
+            processing_times,
+            power_consumptions,
+            instance.length_metering_interval,
+            instance.num_metering_intervals)
+        energy_limits_satisfied = bool(are_energy_limits_satisfied(consumptions, instance.energy_limit))
+
+    return (
+        int(result.status),
+        result.time_limit_reached,
+        None if result.running_time is None else result.running_time.total_seconds(),
+        result.lower_bound,
+        makespan,
+        energy_limits_satisfied,
+        None if result.timings is None else json.dumps(result.timings),
+        None if result.model_statistics is None else json.dumps(result.model_statistics))
+
+
+def _reduce_instance(
+        dataset_path: Path,
+        dataset_results_path: Path,
+        instance_filename: str,
+        solver_ids: List[str]) -> Tuple[tuple, List[tuple]]:
+    """Parses the instance and the results of the given solvers on it, returns the rows of the index."""
+    instance = Instance.from_file(dataset_path / instance_filename, instance_filename, lazy=True)
+    return instance_values(instance), [
+        (solver_id, *result_values(instance, result))
+        for solver_id, result in read_results(dataset_results_path, instance, solver_ids)
+    ]
+
+
+class ResultsIndex:
+    """Persistent index of the reduced results of a dataset, kept in a SQLite database.
+
+    The files are identified by their size and modification time, refreshing the index parses only the new or
+    changed result files (and all results of a changed instance).
+    """
+
+    def __init__(self, index_path: Path):
+        self.index_path = index_path
+        self.connection = connect(index_path, _SCHEMA_VERSION, _SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def refresh(
+            self,
+            dataset_path: Path,
+            dataset_results_path: Path,
+            solver_ids: List[str],
+            num_processes: Optional[int] = None) -> int:
+        """Brings the index up to date with the files, returns the number of parsed result files."""
+        instance_stats = stat_files(dataset_path)
+        result_stats = {solver_id: stat_files(dataset_results_path / solver_id) for solver_id in solver_ids}
+
+        indexed_instance_stats = {
+            row[0]: (row[1], row[2])
+            for row in self.connection.execute('SELECT instance_filename, size, mtime_ns FROM instances')
+        }
+        indexed_result_stats = {
+            (row[0], row[1]): (row[2], row[3])
+            for row in self.connection.execute('SELECT solver_id, instance_filename, size, mtime_ns FROM results')
+        }
+
+        # Which (instance, solvers) need to be parsed.
+        tasks = find_changed(instance_stats, result_stats, indexed_instance_stats, indexed_result_stats)
+
+        with self.connection:
+            for instance_filename in set(indexed_instance_stats) - set(instance_stats):
+                self.connection.execute('DELETE FROM instances WHERE instance_filename = ?', (instance_filename,))
+            for solver_id, instance_filename in indexed_result_stats:
+                if solver_id in result_stats and (instance_filename not in result_stats[solver_id]
+                                                  or instance_filename not in instance_stats):
+                    self.connection.execute(
+                        'DELETE FROM results WHERE solver_id = ? AND instance_filename = ?',
+                        (solver_id, instance_filename))
+
+        if not tasks:
+            return 0
+
+        reduce_instance = functools.partial(_reduce_instance, dataset_path, dataset_results_path)
+        with self.connection:
+            for instance_filename, instance_row, result_rows in reduce_in_parallel(
+                    reduce_instance, tasks, num_processes):
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO instances VALUES (?, ?, ?, ?, ?, ?)',
+                    (instance_filename, *instance_stats[instance_filename], *instance_row))
+                for solver_id, *result_row in result_rows:
+                    self.connection.execute(
+                        'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        (solver_id, instance_filename, *result_stats[solver_id][instance_filename], *result_row))
+
+        return sum(len(solver_ids) for solver_ids in tasks.values())
+
+    def instances(self) -> List[IndexedInstance]:
+        return [
+            IndexedInstance(row[0], row[1], row[2], json.loads(row[3]))
+            for row in self.connection.execute(
+                'SELECT instance_filename, horizon, length_metering_interval, metadata FROM instances')
+        ]
+
+    def results(self, solver_ids: List[str]) -> Dict[Tuple[str, str], IndexedResult]:
+        """Returns the results of the solvers keyed by (solver id, instance filename)."""
+        results = dict()
+        for row in self.connection.execute(
+                'SELECT solver_id, instance_filename, {} FROM results WHERE solver_id IN ({})'.format(
+                    RESULT_COLUMNS, ', '.join('?' * len(solver_ids))),
+                solver_ids):
+            results[(row[0], row[1])] = IndexedResult.from_row(row[2:])
+        return results
@@ -0,0 +1,259 @@
+from typing import List, Dict, Tuple, Optional
+from pathlib import Path
+import functools
+import json
+
+import numpy as np
+
+from datastructs.instance import Instance
+from datastructs.result import Result, Status
+from datastructs.dataset_pack import DatasetPack, load_instance
+from datastructs.results_index import RESULT_COLUMNS, IndexedInstance, IndexedResult, connect, stat_files, \
+    find_changed, reduce_in_parallel, read_results, instance_values, result_values
+from algorithms.energy_consumption import start_times_to_array
+
+__all__ = [
+    'RESULTS_STORE_FILENAME',
+    'StoredResult',
+    'ResultsStore',
+    'pack_start_times',
+    'unpack_start_times'
+]
+
+RESULTS_STORE_FILENAME = 'results_store.sqlite'
+
+# Store with a different version is rebuilt.
+_SCHEMA_VERSION = 1
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS instances (
+    dataset TEXT NOT NULL,
+    instance_filename TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    horizon INTEGER NOT NULL,
+    length_metering_interval INTEGER NOT NULL,
+    metadata TEXT NOT NULL,
+    PRIMARY KEY (dataset, instance_filename)
+);
+CREATE TABLE IF NOT EXISTS results (
+    dataset TEXT NOT NULL,
+    solver_id TEXT NOT NULL,
+    instance_filename TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    time_limit_reached INTEGER NOT NULL,
+    running_time REAL,
+    lower_bound REAL,
+    makespan REAL,
+    energy_limits_satisfied INTEGER,
+    timings TEXT,
+    model_statistics TEXT,
+    start_times BLOB,
+    PRIMARY KEY (dataset, solver_id, instance_filename)
+);
+"""
+
+
+def pack_start_times(instance: Instance, start_times: Optional[Dict]) -> Optional[bytes]:
+    """Packs the start times as float64 array in `Instance.get_operations` order, missing start times are NaN."""
+    if start_times is None:
+        return None
+    return start_times_to_array(instance, start_times).astype('<f8').tobytes()
+
+
+def unpack_start_times(packed: Optional[bytes]) -> Optional[np.ndarray]:
+    if packed is None:
+        return None
+    return np.frombuffer(packed, dtype='<f8')
+
+
+class StoredResult(IndexedResult):
+    """Result of a solver run as kept in the store, the start times are an array (see `pack_start_times`).
+
+    The start times are loaded only if requested, otherwise they are None even if the run has a schedule.
+    """
+
+    __slots__ = [
+        'start_times'
+    ]
+
+    def __init__(
+            self,
+            status: Status,
+            time_limit_reached: bool,
+            running_time: Optional[float],
+            lower_bound: Optional[float],
+            makespan: Optional[float],
+            energy_limits_satisfied: Optional[bool],
+            timings: Optional[Dict[str, float]] = None,
+            model_statistics: Optional[Dict[str, int]] = None,
+            start_times: Optional[np.ndarray] = None):
+        super().__init__(
+            status, time_limit_reached, running_time, lower_bound, makespan, energy_limits_satisfied, timings,
+            model_statistics)
+        self.start_times = start_times
+
+
+def _reduce_instance(
+        dataset_path: Path,
+        dataset_pack_path: Optional[Path],
+        dataset_results_path: Path,
+        instance_filename: str,
+        solver_ids: List[str]) -> Tuple[tuple, List[tuple]]:
+    """Parses the instance and the results of the given solvers on it, returns the rows of the store."""
+    instance = load_instance(dataset_path, dataset_pack_path, instance_filename)
+    return instance_values(instance), [
+        (solver_id, *result_values(instance, result), pack_start_times(instance, result.start_times))
+        for solver_id, result in read_results(dataset_results_path, instance, solver_ids)
+    ]
+
+
+def _stat(path: Optional[Path]) -> Tuple[int, int]:
+    if path is None:
+        return 0, 0
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _stored_result(row: tuple, with_start_times: bool) -> StoredResult:
+    return StoredResult.from_row(row[:8], unpack_start_times(row[8]) if with_start_times else None)
+
+
+class ResultsStore:
+    """Results of the solver runs of an experiment consolidated in a SQLite database, one row per run.
+
+    The summary fields are columns, the start times are a packed array (see `pack_start_times`). Appending the
+    result files of a dataset parses only the new or changed files (identified by their size and modification
+    time, an instance in a dataset pack by the pack). The results can also be added directly.
+    """
+
+    def __init__(self, store_path: Path):
+        self.store_path = store_path
+        self.connection = connect(store_path, _SCHEMA_VERSION, _SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def append(
+            self,
+            dataset: str,
+            dataset_path: Path,
+            dataset_results_path: Path,
+            solver_ids: List[str],
+            dataset_pack_path: Optional[Path] = None,
+            num_processes: Optional[int] = None) -> int:
+        """Brings the runs of the dataset up to date with the result files, returns the number of parsed files.
+
+        The runs whose result files were removed are kept.
+        """
+        if dataset_pack_path is None:
+            instance_stats = stat_files(dataset_path)
+        else:
+            stat = dataset_pack_path.stat()
+            instance_stats = {
+                instance_filename: (stat.st_size, stat.st_mtime_ns)
+                for instance_filename in DatasetPack(dataset_pack_path).instance_filenames
+            }
+        result_stats = {solver_id: stat_files(dataset_results_path / solver_id) for solver_id in solver_ids}
+
+        stored_instance_stats = {
+            row[0]: (row[1], row[2])
+            for row in self.connection.execute(
+                'SELECT instance_filename, size, mtime_ns FROM instances WHERE dataset = ?', (dataset,))
+        }
+        stored_result_stats = {
+            (row[0], row[1]): (row[2], row[3])
+            for row in self.connection.execute(
+                'SELECT solver_id, instance_filename, size, mtime_ns FROM results WHERE dataset = ?', (dataset,))
+        }
+
+        # Which (instance, solvers) need to be parsed.
+        tasks = find_changed(instance_stats, result_stats, stored_instance_stats, stored_result_stats)
+        if not tasks:
+            return 0
+
+        reduce_instance = functools.partial(_reduce_instance, dataset_path, dataset_pack_path, dataset_results_path)
+        with self.connection:
+            for instance_filename, instance_row, result_rows in reduce_in_parallel(
+                    reduce_instance, tasks, num_processes):
+                self.connection.execute(
+                    'INSERT OR REPLACE INTO instances VALUES (?, ?, ?, ?, ?, ?, ?)',
+                    (dataset, instance_filename, *instance_stats[instance_filename], *instance_row))
+                for solver_id, *result_row in result_rows:
+                    self.connection.execute(
+                        'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                        (dataset,
+                         solver_id,
+                         instance_filename,
+                         *result_stats[solver_id][instance_filename],
+                         *result_row))
+
+        return sum(len(solver_ids) for solver_ids in tasks.values())
+
+    def add(
+            self,
+            dataset: str,
+            solver_id: str,
+            instance: Instance,
+            result: Result,
+            result_path: Optional[Path] = None,
+            instance_path: Optional[Path] = None):
+        """Adds (or replaces) the run of the solver on the instance, e.g., right after solving it.
+
+        The size and modification time of the given files (the instance file or its dataset pack) are stored, so that
+        `append` does not parse them again, a run without them has zero size and modification time.
+        """
+        with self.connection:
+            self.connection.execute(
+                'INSERT OR IGNORE INTO instances VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (dataset, instance.instance_filename, *_stat(instance_path), *instance_values(instance)))
+            self.connection.execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (dataset,
+                 solver_id,
+                 instance.instance_filename,
+                 *_stat(result_path),
+                 *result_values(instance, result),
+                 pack_start_times(instance, result.start_times)))
+
+    def datasets(self) -> List[str]:
+        return [row[0] for row in self.connection.execute('SELECT DISTINCT dataset FROM instances ORDER BY dataset')]
+
+    def solver_ids(self, dataset: str) -> List[str]:
+        return [row[0] for row in self.connection.execute(
+            'SELECT DISTINCT solver_id FROM results WHERE dataset = ? ORDER BY solver_id', (dataset,))]
+
+    def instances(self, dataset: str) -> List[IndexedInstance]:
+        return [
+            IndexedInstance(row[0], row[1], row[2], json.loads(row[3]))
+            for row in self.connection.execute(
+                'SELECT instance_filename, horizon, length_metering_interval, metadata FROM instances '
+                'WHERE dataset = ?',
+                (dataset,))
+        ]
+
+    def results(
+            self,
+            dataset: str,
+            solver_ids: List[str],
+            with_start_times: bool = False) -> Dict[Tuple[str, str], StoredResult]:
+        """Returns the runs of the solvers on the dataset keyed by (solver id, instance filename)."""
+        results = dict()
+        for row in self.connection.execute(
+                'SELECT solver_id, instance_filename, {}, {} FROM results '
+                'WHERE dataset = ? AND solver_id IN ({})'.format(
+                    RESULT_COLUMNS,
+                    'start_times' if with_start_times else 'NULL',
+                    ', '.join('?' * len(solver_ids))),
+                (dataset, *solver_ids)):
+            results[(row[0], row[1])] = _stored_result(row[2:], with_start_times)
+        return results
+
+    def result(self, dataset: str, solver_id: str, instance_filename: str) -> Optional[StoredResult]:
+        """Returns the run (with the start times) of the solver on the instance, None if not stored."""
+        row = self.connection.execute(
+            f'SELECT solver_id, instance_filename, {RESULT_COLUMNS}, start_times FROM results '
+            'WHERE dataset = ? AND solver_id = ? AND instance_filename = ?',
+            (dataset, solver_id, instance_filename)).fetchone()
+        return None if row is None else _stored_result(row[2:], True)
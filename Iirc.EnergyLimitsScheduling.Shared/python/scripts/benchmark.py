@@ -0,0 +1,191 @@
+import argparse
+from pathlib import Path
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime
+
+import numpy as np
+
+from benchmarks.instance_generator import generate_instances
+from benchmarks.suite import BENCHMARK_NAMES, MODEL_BENCHMARK_NAMES, run_benchmarks
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the Python solver and tooling on synthetic instances.')
+    parser.add_argument(
+        'output_path',
+        metavar='OUTPUT_PATH',
+        type=str,
+        help='Path where to write the benchmark results (JSON).')
+    parser.add_argument(
+        '--seed',
+        dest='seed',
+        type=int,
+        default=0,
+        help='Seed of the instance generator.')
+    parser.add_argument(
+        '--num-jobs',
+        dest='num_jobs',
+        metavar='NUM_JOBS',
+        type=int,
+        nargs='+',
+        default=[10, 50, 200, 1000],
+        help='Numbers of jobs of the generated instances.')
+    parser.add_argument(
+        '--num-operations-per-job',
+        dest='num_operations_per_job',
+        type=int,
+        default=3,
+        help='Number of operations of each job.')
+    parser.add_argument(
+        '--num-machines',
+        dest='num_machines',
+        type=int,
+        default=5,
+        help='Number of machines.')
+    parser.add_argument(
+        '--num-instances',
+        dest='num_instances',
+        type=int,
+        default=1,
+        help='Number of generated instances for each number of jobs.')
+    parser.add_argument(
+        '--repetitions',
+        dest='repetitions',
+        type=int,
+        default=5,
+        help='Number of measurements of each benchmark.')
+    parser.add_argument(
+        '--benchmarks',
+        dest='benchmarks',
+        metavar='BENCHMARK',
+        type=str,
+        nargs='+',
+        choices=BENCHMARK_NAMES,
+        default=BENCHMARK_NAMES,
+        help='Benchmarks to run. Default is all.')
+    parser.add_argument(
+        '--time-limit',
+        dest='time_limit',
+        type=float,
+        default=10.0,
+        help='Time limit (in seconds) of the first solution benchmark.')
+    parser.add_argument(
+        '--energy-formulations',
+        dest='energy_formulations',
+        metavar='ENERGY_FORMULATION',
+        type=str,
+        nargs='+',
+        choices=['Overlap', 'Segments'],
+        default=['Overlap'],
+        help='Energy formulations of the CP model to benchmark, the fastest one for each instance is reported.')
+    parser.add_argument(
+        '--baseline',
+        dest='baseline_path',
+        metavar='BASELINE_PATH',
+        type=str,
+        default=None,
+        help='Benchmark results of a previous run to compare the medians with.')
+
+    return parser.parse_args()
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=str(Path(__file__).resolve().parent),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True).stdout.strip()
+    except OSError:
+        return ''
+
+def _environment():
+    return {
+        'Timestamp': datetime.now().isoformat(),
+        'GitRevision': _git_revision(),
+        'Python': sys.version,
+        'Numpy': np.__version__,
+        'Platform': platform.platform(),
+        'Processor': platform.processor(),
+        'NumCpus': os.cpu_count()
+    }
+
+def _print_records(records, baseline_medians):
+    print('{:<26} {:<16} {:>8} {:>12} {:>14} {:>8}'.format(
+        'benchmark', 'instance', 'ops', 'median [s]', 'ops/s', 'ratio'))
+    for record in records:
+        if record['Error'] is not None:
+            print('{:<26} {:<16} {:>8} {}'.format(
+                record['Name'], record['InstanceFilename'], record['NumOperations'], record['Error']))
+            continue
+
+        baseline_median = baseline_medians.get((record['Name'], record['InstanceFilename']))
+        ratio = '' if not baseline_median else '{:.2f}'.format(record['Median'] / baseline_median)
+        print('{:<26} {:<16} {:>8} {:>12.6f} {:>14.0f} {:>8}'.format(
+            record['Name'],
+            record['InstanceFilename'],
+            record['NumOperations'],
+            record['Median'],
+            record['OperationsPerSecond'],
+            ratio))
+
+def _print_fastest_energy_formulations(records):
+    fastest = dict()
+    for record in records:
+        name, _, energy_formulation = record['Name'].partition('/')
+        if name not in MODEL_BENCHMARK_NAMES or record['Median'] is None:
+            continue
+        key = (name, record['InstanceFilename'])
+        if key not in fastest or record['Median'] < fastest[key][1]:
+            fastest[key] = (energy_formulation, record['Median'])
+
+    for (name, instance_filename), (energy_formulation, median) in fastest.items():
+        print(f'Fastest energy formulation for {name} on {instance_filename}: {energy_formulation} ({median:.6f} s)')
+
+def main():
+    args = _parse_args()
+
+    instances_raw = generate_instances(
+        args.seed, args.num_jobs, args.num_operations_per_job, args.num_machines, args.num_instances)
+    instances_raw = {
+        '{}-{}.json'.format(instance_raw['Metadata']['numJobs'], instance_raw['Metadata']['repetition']): instance_raw
+        for instance_raw in instances_raw
+    }
+
+    records = [
+        record.to_dict()
+        for record in run_benchmarks(
+            instances_raw, args.benchmarks, args.repetitions, args.time_limit, args.energy_formulations)
+    ]
+
+    output = {
+        'Environment': _environment(),
+        'Parameters': {
+            'Seed': args.seed,
+            'NumJobs': args.num_jobs,
+            'NumOperationsPerJob': args.num_operations_per_job,
+            'NumMachines': args.num_machines,
+            'NumInstances': args.num_instances,
+            'Repetitions': args.repetitions,
+            'TimeLimit': args.time_limit,
+            'EnergyFormulations': args.energy_formulations
+        },
+        'Records': records
+    }
+    Path(args.output_path).resolve().write_text(json.dumps(output, indent=2))
+
+    baseline_medians = dict()
+    if args.baseline_path is not None:
+        baseline = json.loads(Path(args.baseline_path).resolve().read_text())
+        baseline_medians = {(record['Name'], record['InstanceFilename']): record['Median']
+                            for record in baseline['Records']}
+
+    _print_records(records, baseline_medians)
+    if len(args.energy_formulations) > 1:
+        _print_fastest_energy_formulations(records)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+import argparse
+import functools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from datastructs.result import Result, Status
+from datastructs.dataset_pack import DatasetPack, load_instance
+from algorithms.energy_consumption import start_times_to_array
+from algorithms.feasibility import find_violations
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description='Check the feasibility of all the results of an experiment on a dataset and report the violations.')
+    parser.add_argument(
+        'datasets_path',
+        metavar='DATASETS_PATH',
+        type=str,
+        help='Path to the datasets directory.')
+    parser.add_argument(
+        'results_path',
+        metavar='RESULTS_PATH',
+        type=str,
+        help='Path to the results directory.')
+    parser.add_argument(
+        'experiment',
+        metavar='EXPERIMENT',
+        type=str,
+        help='The name of the experiment.')
+    parser.add_argument(
+        'dataset',
+        metavar='DATASET',
+        type=str,
+        help='The name of the dataset.')
+    parser.add_argument(
+        'report_path',
+        metavar='REPORT_PATH',
+        type=str,
+        help='Path where to write the violations report (JSON).')
+    parser.add_argument(
+        '--solvers',
+        dest='solvers',
+        metavar='SOLVERS',
+        nargs='+',
+        type=str,
+        help='The ids of solvers whose results to check. Default is all.')
+    parser.add_argument(
+        '--dataset-pack',
+        dest='dataset_pack',
+        metavar='DATASET_PACK',
+        type=str,
+        default=None,
+        help='Path to the dataset pack (see pack_dataset.py) to load the instances from instead of the dataset directory.')
+    parser.add_argument(
+        '--without-energy-limits',
+        dest='without_energy_limits',
+        action='store_true',
+        default=False,
+        help='Do not check the horizon and the energy limits (the results were solved without them).')
+    parser.add_argument(
+        '--all-violations',
+        dest='all_violations',
+        action='store_true',
+        default=False,
+        help='Report all the violations of the first failed check instead of only the first one.')
+    parser.add_argument(
+        '--num-processes',
+        dest='num_processes',
+        metavar='NUM_PROCESSES',
+        type=int,
+        default=None,
+        help='The number of processes checking the results in parallel. Default is the number of CPUs.')
+
+    return parser.parse_args()
+
+def _get_instance_filenames(dataset_path: Path, dataset_pack_path: Optional[Path]) -> List[str]:
+    if dataset_pack_path is None:
+        return sorted(child_path.name for child_path in dataset_path.iterdir() if child_path.is_file())
+    else:
+        return sorted(DatasetPack(dataset_pack_path).instance_filenames)
+
+def _get_solver_ids(dataset_results_path: Path) -> List[str]:
+    return sorted(child_path.name for child_path in dataset_results_path.iterdir() if child_path.is_dir())
+
+def _check_instance_results(
+        dataset_path: Path,
+        dataset_pack_path: Optional[Path],
+        dataset_results_path: Path,
+        solver_ids: List[str],
+        with_energy_limits: bool,
+        all_violations: bool,
+        instance_filename: str) -> Tuple[int, List[dict]]:
+    """Checks the results (with a schedule) of all the solvers on the instance, the instance is read at most once.
+
+    Returns the number of checked results and the report entries of the infeasible ones.
+    """
+    instance = None
+    operations = None
+    num_checked = 0
+    entries = []
+    for solver_id in solver_ids:
+        result_path = dataset_results_path / solver_id / instance_filename
+        if not result_path.exists():
+            continue
+
+        if instance is None:
+            instance = load_instance(dataset_path, dataset_pack_path, instance_filename)
+            operations = list(instance.get_operations())
+        result = Result.from_json(result_path.read_text(), instance)
+        if result.status not in {Status.Optimal, Status.Heuristic}:
+            continue
+
+        num_checked += 1
+        violations = find_violations(
+            instance,
+            start_times_to_array(instance, result.start_times),
+            with_energy_limits,
+            first_only=not all_violations)
+        if not violations:
+            continue
+
+        entries.append({
+            'SolverId': solver_id,
+            'InstanceFilename': instance_filename,
+            'Status': result.status.name,
+            'Violations': [
+                dict(violation.to_dict(), Operations=[
+                    {'JobIndex': operations[position].job_index, 'OperationIndex': operations[position].index}
+                    for position in violation.operation_positions
+                ])
+                for violation in violations
+            ]
+        })
+
+    return num_checked, entries
+
+def main():
+    args = _parse_args()
+
+    args.datasets_path = Path(args.datasets_path).resolve()
+    args.results_path = Path(args.results_path).resolve()
+
+    dataset_path: Path = args.datasets_path / args.dataset
+    dataset_pack_path = None if args.dataset_pack is None else Path(args.dataset_pack).resolve()
+
+    dataset_results_path = args.results_path / args.experiment / args.dataset
+
+    if args.solvers is None or not args.solvers:
+        solver_ids = _get_solver_ids(dataset_results_path)
+    else:
+        solver_ids = args.solvers
+
+    instance_filenames = _get_instance_filenames(dataset_path, dataset_pack_path)
+    check_instance_results = functools.partial(
+        _check_instance_results,
+        dataset_path,
+        dataset_pack_path,
+        dataset_results_path,
+        solver_ids,
+        not args.without_energy_limits,
+        args.all_violations)
+
+    num_processes = args.num_processes if args.num_processes is not None else os.cpu_count()
+    with ProcessPoolExecutor(max_workers=num_processes) as executor:
+        chunksize = max(1, len(instance_filenames) // (4 * num_processes))
+        checked = list(executor.map(check_instance_results, instance_filenames, chunksize=chunksize))
+
+    num_checked = sum(instance_num_checked for instance_num_checked, _ in checked)
+    entries = [entry for _, instance_entries in checked for entry in instance_entries]
+
+    violations_per_solver = {solver_id: 0 for solver_id in solver_ids}
+    for entry in entries:
+        violations_per_solver[entry['SolverId']] += 1
+
+    Path(args.report_path).resolve().write_text(json.dumps({
+        'Experiment': args.experiment,
+        'Dataset': args.dataset,
+        'WithEnergyLimits': not args.without_energy_limits,
+        'NumChecked': num_checked,
+        'NumInfeasible': len(entries),
+        'NumInfeasiblePerSolver': violations_per_solver,
+        'Results': entries
+    }, indent=2))
+
+    for solver_id, num_infeasible in violations_per_solver.items():
+        print(f'{solver_id}: {num_infeasible} infeasible results')
+    print(f'{len(entries)} of {num_checked} checked results are infeasible')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import os
+from pathlib import Path
+
+from datastructs.results_store import ResultsStore, RESULTS_STORE_FILENAME
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description='Consolidate the result files of an experiment into a results store (appending only new or '
+                    'changed files).')
+    parser.add_argument(
+        'datasets_path',
+        metavar='DATASETS_PATH',
+        type=str,
+        help='Path to the datasets directory.')
+    parser.add_argument(
+        'results_path',
+        metavar='RESULTS_PATH',
+        type=str,
+        help='Path to the results directory.')
+    parser.add_argument(
+        'experiment',
+        metavar='EXPERIMENT',
+        type=str,
+        help='The name of the experiment.')
+    parser.add_argument(
+        '--datasets',
+        dest='datasets',
+        metavar='DATASETS',
+        nargs='+',
+        type=str,
+        help='The names of the datasets to export. Default is all datasets of the experiment.')
+    parser.add_argument(
+        '--solvers',
+        dest='solvers',
+        metavar='SOLVERS',
+        nargs='+',
+        type=str,
+        help='The ids of solvers whose results to export. Default is all.')
+    parser.add_argument(
+        '--store',
+        dest='store_path',
+        metavar='STORE_PATH',
+        type=str,
+        default=None,
+        help=f'Path to the results store. Default is {RESULTS_STORE_FILENAME} in the experiment results directory.')
+    parser.add_argument(
+        '--dataset-packs',
+        dest='dataset_packs',
+        action='store_true',
+        help='Load the instances from the dataset packs {dataset}.elpack in the datasets directory (the default '
+             'output of pack_dataset.py) instead of the dataset directories.')
+    parser.add_argument(
+        '--num-processes',
+        dest='num_processes',
+        metavar='NUM_PROCESSES',
+        type=int,
+        default=None,
+        help='The number of processes reading the results in parallel. Default is the number of CPUs.')
+
+    return parser.parse_args()
+
+def main():
+    args = _parse_args()
+
+    args.datasets_path = Path(args.datasets_path).resolve()
+    args.results_path = Path(args.results_path).resolve()
+
+    experiment_results_path = args.results_path / args.experiment
+    store_path = experiment_results_path / RESULTS_STORE_FILENAME if args.store_path is None \
+        else Path(args.store_path).resolve()
+
+    if args.datasets is None or not args.datasets:
+        datasets = sorted(child_path.name for child_path in experiment_results_path.iterdir() if child_path.is_dir())
+    else:
+        datasets = args.datasets
+
+    num_processes = args.num_processes if args.num_processes is not None else os.cpu_count()
+    store = ResultsStore(store_path)
+    try:
+        for dataset in datasets:
+            dataset_results_path = experiment_results_path / dataset
+            if args.solvers is None or not args.solvers:
+                solver_ids = sorted(
+                    child_path.name for child_path in dataset_results_path.iterdir() if child_path.is_dir())
+            else:
+                solver_ids = args.solvers
+
+            dataset_pack_path = args.datasets_path / f'{dataset}.elpack' if args.dataset_packs else None
+
+            num_parsed = store.append(
+                dataset,
+                args.datasets_path / dataset,
+                dataset_results_path,
+                solver_ids,
+                dataset_pack_path,
+                num_processes)
+            print(f'{dataset}: {num_parsed} result files parsed')
+    finally:
+        store.close()
+
+    print(f'Results store at {store_path}')
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,9 @@
 import argparse
 from pathlib import Path
 
-import matplotlib.pyplot as plt
-
 from datastructs.instance import Instance
 from datastructs.result import Result
+from datastructs.dataset_pack import DatasetPack
 
 import vizualization.gantt
 
@@ -14,31 +13,66 @@ def _parse_args():
         'instance_path',
         metavar='INSTANCE_PATH',
         type=str,
-        help='Path to the instance file.')
+        help='Path to the instance file (or the instance filename if --dataset-pack is used).')
     parser.add_argument(
         'result_path',
         metavar='RESULT_PATH',
         type=str,
         help='Path to the result file.')
+    parser.add_argument(
+        '--dataset-pack',
+        dest='dataset_pack',
+        metavar='DATASET_PACK',
+        type=str,
+        default=None,
+        help='Path to the dataset pack (see pack_dataset.py) containing the instance.')
+    parser.add_argument(
+        '--output',
+        dest='output_path',
+        metavar='OUTPUT_PATH',
+        type=str,
+        default=None,
+        help='Save the chart to the file (e.g., chart.png or chart.pdf) instead of showing it, no display is needed.')
+    parser.add_argument(
+        '--no-latex',
+        dest='no_latex',
+        action='store_true',
+        default=False,
+        help='Do not typeset the texts by LaTeX.')
+    parser.add_argument(
+        '--max-energy-bars',
+        dest='max_energy_bars',
+        type=int,
+        default=None,
+        help='Downsample the energy consumption to at most this number of bars (for long horizons).')
 
     return parser.parse_args()
 
 def main():
     args = _parse_args()
 
-    args.instance_path = Path(args.instance_path).resolve()
     args.result_path = Path(args.result_path).resolve()
-    
-    instance = Instance.from_json(args.instance_path.read_text())
+
+    vizualization.gantt.configure(usetex=not args.no_latex, headless=args.output_path is not None)
+    import matplotlib.pyplot as plt
+
+    if args.dataset_pack is None:
+        instance = Instance.from_json(Path(args.instance_path).resolve().read_text())
+    else:
+        instance = DatasetPack(Path(args.dataset_pack).resolve())[args.instance_path]
     result = Result.from_json(args.result_path.read_text(), instance)
 
     vizualization.gantt.draw(
         instance,
         result.start_times,
         time_units='min',
-        power_consumption_units='MWh')
+        power_consumption_units='MWh',
+        max_energy_bars=args.max_energy_bars)
 
-    plt.show()
+    if args.output_path is None:
+        plt.show()
+    else:
+        plt.savefig(str(Path(args.output_path).resolve()))
 
 
 
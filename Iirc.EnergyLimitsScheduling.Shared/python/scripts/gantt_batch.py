@@ -0,0 +1,233 @@
+import argparse
+import functools
+import html
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from datastructs.result import Result, Status
+from datastructs.dataset_pack import DatasetPack, load_instance
+
+import vizualization.gantt
+
+INDEX_FILENAME = 'index.html'
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description='Export gantt charts of all the results of an experiment on a dataset, with an index page.')
+    parser.add_argument(
+        'datasets_path',
+        metavar='DATASETS_PATH',
+        type=str,
+        help='Path to the datasets directory.')
+    parser.add_argument(
+        'results_path',
+        metavar='RESULTS_PATH',
+        type=str,
+        help='Path to the results directory.')
+    parser.add_argument(
+        'experiment',
+        metavar='EXPERIMENT',
+        type=str,
+        help='The name of the experiment.')
+    parser.add_argument(
+        'dataset',
+        metavar='DATASET',
+        type=str,
+        help='The name of the dataset.')
+    parser.add_argument(
+        'output_path',
+        metavar='OUTPUT_PATH',
+        type=str,
+        help='Directory where to store the charts ({solverId}/{instance}.{format}) and the index page.')
+    parser.add_argument(
+        '--solvers',
+        dest='solvers',
+        metavar='SOLVERS',
+        nargs='+',
+        type=str,
+        help='The ids of solvers for which to export the charts. Default is all.')
+    parser.add_argument(
+        '--dataset-pack',
+        dest='dataset_pack',
+        metavar='DATASET_PACK',
+        type=str,
+        default=None,
+        help='Path to the dataset pack (see pack_dataset.py) to load the instances from instead of the dataset directory.')
+    parser.add_argument(
+        '--format',
+        dest='format',
+        type=str,
+        choices=['png', 'svg', 'pdf'],
+        default='png',
+        help='Format of the charts.')
+    parser.add_argument(
+        '--max-energy-bars',
+        dest='max_energy_bars',
+        type=int,
+        default=200,
+        help='Downsample the energy consumption to at most this number of bars.')
+    parser.add_argument(
+        '--latex',
+        dest='latex',
+        action='store_true',
+        default=False,
+        help='Typeset the texts by LaTeX.')
+    parser.add_argument(
+        '--force',
+        dest='force',
+        action='store_true',
+        default=False,
+        help='Render also the charts that are newer than their results and instances.')
+    parser.add_argument(
+        '--num-processes',
+        dest='num_processes',
+        metavar='NUM_PROCESSES',
+        type=int,
+        default=None,
+        help='The number of processes rendering the charts in parallel. Default is the number of CPUs.')
+
+    return parser.parse_args()
+
+def _get_instance_filenames(dataset_path: Path, dataset_pack_path: Optional[Path]) -> List[str]:
+    if dataset_pack_path is None:
+        return sorted(child_path.name for child_path in dataset_path.iterdir() if child_path.is_file())
+    else:
+        return sorted(DatasetPack(dataset_pack_path).instance_filenames)
+
+def _get_solver_ids(dataset_results_path: Path) -> List[str]:
+    return sorted(child_path.name for child_path in dataset_results_path.iterdir() if child_path.is_dir())
+
+def _get_chart_path(output_path: Path, solver_id: str, instance_filename: str, chart_format: str) -> Path:
+    return output_path / solver_id / f'{Path(instance_filename).stem}.{chart_format}'
+
+def _is_up_to_date(chart_path: Path, source_mtime: float) -> bool:
+    return chart_path.exists() and chart_path.stat().st_mtime >= source_mtime
+
+def _export_instance_charts(
+        dataset_path: Path,
+        dataset_pack_path: Optional[Path],
+        dataset_results_path: Path,
+        output_path: Path,
+        solver_ids: List[str],
+        chart_format: str,
+        max_energy_bars: Optional[int],
+        latex: bool,
+        force: bool,
+        instance_filename: str) -> Dict[str, Tuple[str, Optional[float]]]:
+    """Renders the charts of all the solver results on the instance (the instance is read at most once).
+
+    Returns the status and makespan (None if there is no schedule, hence no chart) of each result, keyed by the solver
+    id.
+    """
+    vizualization.gantt.configure(usetex=latex, headless=True)
+    import matplotlib.pyplot as plt
+
+    instance_mtime = (dataset_path / instance_filename if dataset_pack_path is None else dataset_pack_path)\
+        .stat().st_mtime
+    instance = None
+    charts = dict()
+    for solver_id in solver_ids:
+        result_path = dataset_results_path / solver_id / instance_filename
+        if not result_path.exists():
+            continue
+
+        chart_path = _get_chart_path(output_path, solver_id, instance_filename, chart_format)
+        is_up_to_date = not force and _is_up_to_date(chart_path, max(instance_mtime, result_path.stat().st_mtime))
+        if instance is None:
+            instance = load_instance(dataset_path, dataset_pack_path, instance_filename)
+        result = Result.from_json(result_path.read_text(), instance)
+        if result.status not in {Status.Optimal, Status.Heuristic} or not result.start_times:
+            charts[solver_id] = (result.status.name, None)
+            continue
+
+        charts[solver_id] = (result.status.name, result.makespan())
+        if is_up_to_date:
+            continue
+
+        chart_path.parent.mkdir(parents=True, exist_ok=True)
+        fig = vizualization.gantt.draw(
+            instance,
+            result.start_times,
+            title=f'{solver_id}: {instance_filename}',
+            max_energy_bars=max_energy_bars)
+        fig.savefig(str(chart_path))
+        plt.close(fig)
+
+    return charts
+
+def _write_index(
+        output_path: Path,
+        solver_ids: List[str],
+        instance_filenames: List[str],
+        charts: List[Dict[str, Tuple[str, Optional[float]]]],
+        chart_format: str,
+        title: str):
+    rows = []
+    for instance_filename, instance_charts in zip(instance_filenames, charts):
+        cells = [f'<td>{html.escape(instance_filename)}</td>']
+        for solver_id in solver_ids:
+            if solver_id not in instance_charts:
+                cells.append('<td></td>')
+                continue
+
+            status, makespan = instance_charts[solver_id]
+            if makespan is None:
+                cells.append(f'<td>{status}</td>')
+                continue
+
+            chart_path = _get_chart_path(output_path, solver_id, instance_filename, chart_format)
+            href = html.escape(chart_path.relative_to(output_path).as_posix())
+            cells.append(f'<td><a href="{href}">{status} {makespan:g}</a></td>')
+        rows.append('<tr>' + ''.join(cells) + '</tr>')
+
+    header = '<tr><th>instance</th>' + ''.join(f'<th>{html.escape(solver_id)}</th>' for solver_id in solver_ids) \
+        + '</tr>'
+    (output_path / INDEX_FILENAME).write_text(
+        '<!DOCTYPE html>\n'
+        f'<html><head><meta charset="utf-8"><title>{html.escape(title)}</title></head><body>\n'
+        f'<h1>{html.escape(title)}</h1>\n'
+        f'<table border="1">\n{header}\n' + '\n'.join(rows) + '\n</table>\n</body></html>\n')
+
+def main():
+    args = _parse_args()
+
+    args.datasets_path = Path(args.datasets_path).resolve()
+    args.results_path = Path(args.results_path).resolve()
+    output_path = Path(args.output_path).resolve()
+
+    dataset_path: Path = args.datasets_path / args.dataset
+    dataset_pack_path = None if args.dataset_pack is None else Path(args.dataset_pack).resolve()
+
+    dataset_results_path = args.results_path / args.experiment / args.dataset
+
+    if args.solvers is None or not args.solvers:
+        solver_ids = _get_solver_ids(dataset_results_path)
+    else:
+        solver_ids = args.solvers
+
+    instance_filenames = _get_instance_filenames(dataset_path, dataset_pack_path)
+    export_instance_charts = functools.partial(
+        _export_instance_charts,
+        dataset_path,
+        dataset_pack_path,
+        dataset_results_path,
+        output_path,
+        solver_ids,
+        args.format,
+        args.max_energy_bars,
+        args.latex,
+        args.force)
+
+    output_path.mkdir(parents=True, exist_ok=True)
+    num_processes = args.num_processes if args.num_processes is not None else os.cpu_count()
+    with ProcessPoolExecutor(max_workers=num_processes) as executor:
+        charts = list(executor.map(export_instance_charts, instance_filenames))
+
+    _write_index(output_path, solver_ids, instance_filenames, charts, args.format, f'{args.experiment}: {args.dataset}')
+    num_charts = sum(makespan is not None for instance_charts in charts for _, makespan in instance_charts.values())
+    print(f'{num_charts} charts, index at {output_path / INDEX_FILENAME}')
+
+if __name__ == '__main__':
+    main()
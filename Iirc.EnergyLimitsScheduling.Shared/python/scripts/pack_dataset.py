@@ -0,0 +1,40 @@
+import argparse
+from pathlib import Path
+
+from datastructs.arrays import ArrayInstance
+from datastructs.dataset_pack import write_dataset_pack
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Compile a dataset directory into a binary dataset pack.')
+    parser.add_argument(
+        'dataset_path',
+        metavar='DATASET_PATH',
+        type=str,
+        help='Path to the dataset directory.')
+    parser.add_argument(
+        'pack_path',
+        metavar='PACK_PATH',
+        type=str,
+        nargs='?',
+        default=None,
+        help='Path where to store the pack. Default is the dataset directory path with suffix ".elpack".')
+
+    return parser.parse_args()
+
+def main():
+    args = _parse_args()
+
+    args.dataset_path = Path(args.dataset_path).resolve()
+    if args.pack_path is None:
+        args.pack_path = args.dataset_path.with_name(args.dataset_path.name + '.elpack')
+    else:
+        args.pack_path = Path(args.pack_path).resolve()
+
+    instances = (ArrayInstance.from_json(child_path.read_text(), child_path.name)
+                 for child_path in sorted(args.dataset_path.iterdir()) if child_path.is_file())
+    write_dataset_pack(instances, args.pack_path)
+
+    print(f'Dataset {args.dataset_path} packed into {args.pack_path}')
+
+if __name__ == '__main__':
+    main()
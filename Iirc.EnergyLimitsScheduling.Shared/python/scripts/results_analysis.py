@@ -1,10 +1,16 @@
 import math
 import argparse
 import numpy as np
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional
 from pathlib import Path
-from datastructs.instance import Instance
+from concurrent.futures import ProcessPoolExecutor
+import functools
 from datastructs.result import Result, Status
+from datastructs.dataset_pack import DatasetPack, load_instance
+from datastructs.results_index import ResultsIndex, RESULTS_INDEX_FILENAME
+from datastructs.results_store import ResultsStore
+from algorithms.energy_consumption import operation_arrays, start_times_to_array, \
+    compute_consumption_in_metering_intervals, are_energy_limits_satisfied
 from matplotlib import rc
 rc('text', usetex=True)
 import matplotlib.pyplot as plt
@@ -12,6 +18,50 @@ import pandas as pd
 import webbrowser
 import os
 
+class ResultRecord:
+    """Result of a solver on an instance reduced to the values needed by the analysis."""
+
+    __slots__ = [
+        'status',
+        'makespan',
+        'metering_interval_iterations',
+        'energy_limits_satisfied',
+        'timings',
+        'model_statistics'
+    ]
+
+    def __init__(
+            self,
+            status: Status,
+            makespan: Optional[int] = None,
+            metering_interval_iterations: Optional[float] = None,
+            energy_limits_satisfied: Optional[bool] = None,
+            timings: Optional[Dict[str, float]] = None,
+            model_statistics: Optional[Dict[str, int]] = None):
+        self.status = status
+        self.makespan = makespan
+        self.metering_interval_iterations = metering_interval_iterations
+        self.energy_limits_satisfied = energy_limits_satisfied
+        self.timings = timings
+        self.model_statistics = model_statistics
+
+class InstanceResults:
+
+    __slots__ = [
+        'instance_filename',
+        'metadata',
+        'results'
+    ]
+
+    def __init__(
+            self,
+            instance_filename: str,
+            metadata: Dict[str, object],
+            results: Dict[str, Optional[ResultRecord]]):
+        self.instance_filename = instance_filename
+        self.metadata = metadata
+        self.results = results
+
 class GroupedInstances:
 
     __slots__ = [
@@ -19,16 +69,18 @@ class GroupedInstances:
         'instances',
     ]
 
-    def __init__(self, params: Dict[str, object], instances: List[Instance]):
+    def __init__(self, params: Dict[str, object], instances: List[InstanceResults]):
         self.params = params
         self.instances = instances
 
-def _load_instances(dataset_path: Path) -> List[Instance]:
-    return [Instance.from_json(child_path.read_text(), child_path.name)
-            for child_path in dataset_path.iterdir() if child_path.is_file()]
+def _get_instance_filenames(dataset_path: Path, dataset_pack_path: Optional[Path]) -> List[str]:
+    if dataset_pack_path is None:
+        return [child_path.name for child_path in dataset_path.iterdir() if child_path.is_file()]
+    else:
+        return DatasetPack(dataset_pack_path).instance_filenames
 
-def _group_instances(group_params: List[str], instances: List[Instance]) -> List[GroupedInstances]:
-    d: Dict[frozenset, List[Instance]] = dict()
+def _group_instances(group_params: List[str], instances: List[InstanceResults]) -> List[GroupedInstances]:
+    d: Dict[frozenset, List[InstanceResults]] = dict()
     for instance in instances:
         params = {param: value for param, value in instance.metadata.items() if param in group_params}
         key = frozenset(params.items())
@@ -44,6 +96,190 @@ def _get_result_path(dataset_results_path: Path, solver_id: str, instance_filena
 def _get_solver_ids(dataset_results_path: Path) -> List[str]:
     return [child_path.name for child_path in dataset_results_path.iterdir() if child_path.is_dir()]
 
+def _compute_metering_interval_iterations(horizon: int, length_metering_interval: int, makespan: int) -> float:
+    horizon = int(horizon)
+    if horizon % length_metering_interval == 0:
+        right_boundary = horizon
+    else:
+        right_boundary = horizon + length_metering_interval - (horizon % length_metering_interval)
+    if makespan % length_metering_interval == 0:
+        left_boundary = makespan - length_metering_interval
+    else:
+        left_boundary = makespan - (makespan % length_metering_interval)
+    return (right_boundary - left_boundary) / length_metering_interval
+
+def _reduce_instance_results(
+        dataset_path: Path,
+        dataset_pack_path: Optional[Path],
+        dataset_results_path: Path,
+        solver_ids: List[str],
+        check_energy_limits: bool,
+        instance_filename: str) -> InstanceResults:
+    """Reads the instance and the results of all the solvers on it (each exactly once) and reduces them."""
+    instance = load_instance(dataset_path, dataset_pack_path, instance_filename)
+
+    results: Dict[str, Optional[ResultRecord]] = dict()
+    checked_solver_ids = []
+    checked_start_times = []
+    for solver_id in solver_ids:
+        result_path = _get_result_path(dataset_results_path, solver_id, instance_filename)
+        if not result_path.exists():
+            results[solver_id] = None
+            continue
+
+        result = Result.from_json(result_path.read_text(), instance)
+        record = ResultRecord(result.status, timings=result.timings, model_statistics=result.model_statistics)
+        if result.status == Status.Optimal or result.status == Status.Heuristic:
+            record.makespan = int(result.makespan())
+            if check_energy_limits:
+                checked_solver_ids.append(solver_id)
+                checked_start_times.append(start_times_to_array(instance, result.start_times))
+
+        if result.status == Status.Optimal:
+            record.metering_interval_iterations = _compute_metering_interval_iterations(
+                instance.horizon, instance.length_metering_interval, record.makespan)
+
+        results[solver_id] = record
+
+    # Results of all the solvers for the instance are checked as one batch.
+    if checked_solver_ids:
+        processing_times, power_consumptions = operation_arrays(instance)
+        consumptions = compute_consumption_in_metering_intervals(
+            np.stack(checked_start_times),
+            processing_times,
+            power_consumptions,
+            instance.length_metering_interval,
+            instance.num_metering_intervals)
+        satisfied = are_energy_limits_satisfied(consumptions, instance.energy_limit)
+        for solver_id, is_satisfied in zip(checked_solver_ids, satisfied):
+            results[solver_id].energy_limits_satisfied = bool(is_satisfied)
+
+    return InstanceResults(instance_filename, instance.metadata, results)
+
+def _load_instances_results(
+        dataset_path: Path,
+        dataset_pack_path: Optional[Path],
+        dataset_results_path: Path,
+        solver_ids: List[str],
+        check_energy_limits: bool,
+        num_processes: int) -> List[InstanceResults]:
+    instance_filenames = _get_instance_filenames(dataset_path, dataset_pack_path)
+    reduce_instance_results = functools.partial(
+        _reduce_instance_results,
+        dataset_path,
+        dataset_pack_path,
+        dataset_results_path,
+        solver_ids,
+        check_energy_limits)
+
+    with ProcessPoolExecutor(max_workers=num_processes) as executor:
+        chunksize = max(1, len(instance_filenames) // (4 * num_processes))
+        return list(executor.map(reduce_instance_results, instance_filenames, chunksize=chunksize))
+
+def _load_instances_results_from_index(
+        dataset_path: Path,
+        dataset_results_path: Path,
+        solver_ids: List[str],
+        num_processes: int) -> List[InstanceResults]:
+    index = ResultsIndex(dataset_results_path / RESULTS_INDEX_FILENAME)
+    try:
+        num_parsed = index.refresh(dataset_path, dataset_results_path, solver_ids, num_processes)
+        print(f'Results index refreshed, {num_parsed} result files parsed')
+
+        indexed_results = index.results(solver_ids)
+        instances_results = []
+        for indexed_instance in index.instances():
+            results: Dict[str, Optional[ResultRecord]] = dict()
+            for solver_id in solver_ids:
+                indexed_result = indexed_results.get((solver_id, indexed_instance.instance_filename))
+                if indexed_result is None:
+                    results[solver_id] = None
+                    continue
+
+                record = ResultRecord(
+                    indexed_result.status,
+                    energy_limits_satisfied=indexed_result.energy_limits_satisfied,
+                    timings=indexed_result.timings,
+                    model_statistics=indexed_result.model_statistics)
+                if indexed_result.makespan is not None:
+                    record.makespan = int(indexed_result.makespan)
+                if indexed_result.status == Status.Optimal:
+                    record.metering_interval_iterations = _compute_metering_interval_iterations(
+                        indexed_instance.horizon, indexed_instance.length_metering_interval, record.makespan)
+                results[solver_id] = record
+
+            instances_results.append(
+                InstanceResults(indexed_instance.instance_filename, indexed_instance.metadata, results))
+        return instances_results
+    finally:
+        index.close()
+
+def _load_instances_results_from_store(
+        store_path: Path,
+        dataset: str,
+        solver_ids: List[str]) -> List[InstanceResults]:
+    store = ResultsStore(store_path)
+    try:
+        stored_results = store.results(dataset, solver_ids)
+        instances_results = []
+        for stored_instance in store.instances(dataset):
+            results: Dict[str, Optional[ResultRecord]] = dict()
+            for solver_id in solver_ids:
+                stored_result = stored_results.get((solver_id, stored_instance.instance_filename))
+                if stored_result is None:
+                    results[solver_id] = None
+                    continue
+
+                record = ResultRecord(
+                    stored_result.status,
+                    energy_limits_satisfied=stored_result.energy_limits_satisfied,
+                    timings=stored_result.timings,
+                    model_statistics=stored_result.model_statistics)
+                if stored_result.makespan is not None:
+                    record.makespan = int(stored_result.makespan)
+                if stored_result.status == Status.Optimal:
+                    record.metering_interval_iterations = _compute_metering_interval_iterations(
+                        stored_instance.horizon, stored_instance.length_metering_interval, record.makespan)
+                results[solver_id] = record
+
+            instances_results.append(
+                InstanceResults(stored_instance.instance_filename, stored_instance.metadata, results))
+        return instances_results
+    finally:
+        store.close()
+
+def _timings_table(
+        groups: List[GroupedInstances],
+        solver_ids: List[str],
+        group_params: List[str]) -> pd.DataFrame:
+    """Mean durations of the solver phases and mean model statistics per group and solver.
+
+    Only the results reporting the timings are included, the number of such results is in column `count`. A phase
+    (or a statistic) missing from a result counts as zero, so each mean is over all `count` results.
+    """
+    rows = []
+    for group in groups:
+        for solver_id in solver_ids:
+            records = [instance_results.results[solver_id] for instance_results in group.instances
+                       if instance_results.results[solver_id] is not None
+                       and instance_results.results[solver_id].timings is not None]
+            if not records:
+                continue
+
+            values = [{**record.timings, **(record.model_statistics or dict())} for record in records]
+            names = sorted({name for record_values in values for name in record_values})
+
+            row = dict(group.params)
+            row['solver'] = solver_id
+            row['count'] = len(records)
+            for name in names:
+                row[name] = sum(record_values.get(name, 0.0) for record_values in values) / len(records)
+            rows.append(row)
+
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame(rows).sort_values(by=group_params + ['solver'])
+
 def _results_table_to_latex(
         df: pd.DataFrame,
         solver_ids: List[str],
@@ -156,21 +392,67 @@ def main():
         nargs='+',
         type=str,
         help='The display names for the group params.')
+    parser.add_argument(
+        '--dataset-pack',
+        dest='dataset_pack',
+        metavar='DATASET_PACK',
+        type=str,
+        default=None,
+        help='Path to the dataset pack (see pack_dataset.py) to load the instances from instead of the dataset directory.')
+    parser.add_argument(
+        '--num-processes',
+        dest='num_processes',
+        metavar='NUM_PROCESSES',
+        type=int,
+        default=None,
+        help='The number of processes reading the results in parallel. Default is the number of CPUs.')
+    parser.add_argument(
+        '--results-index',
+        dest='results_index',
+        action='store_true',
+        help='Keep the reduced results in an index in the dataset results directory and parse only new or changed '
+             'result files.')
+    parser.add_argument(
+        '--results-store',
+        dest='results_store',
+        metavar='RESULTS_STORE',
+        type=str,
+        default=None,
+        help='Path to the results store of the experiment (see export_results.py) to read the results from instead '
+             'of the result files.')
+    parser.add_argument(
+        '--check-energy-limits',
+        dest='check_energy_limits',
+        action='store_true',
+        help='Check that the feasible results satisfy the energy limits and report those that do not.')
+    parser.add_argument(
+        '--timings',
+        dest='timings',
+        action='store_true',
+        help='Report the mean durations of the solver phases and model statistics (if recorded in the results).')
 
     args = parser.parse_args()
+    if args.results_index and args.dataset_pack is not None:
+        parser.error('--results-index cannot be combined with --dataset-pack')
+    if args.results_store is not None and (args.results_index or args.dataset_pack is not None):
+        parser.error('--results-store cannot be combined with --results-index or --dataset-pack')
 
     args.datasets_path = Path(args.datasets_path).resolve()
     args.results_path = Path(args.results_path).resolve()
 
     dataset_path: Path = args.datasets_path / args.dataset
-    instances = _load_instances(dataset_path)
+    dataset_pack_path = None if args.dataset_pack is None else Path(args.dataset_pack).resolve()
 
     dataset_results_path = args.results_path / args.experiment / args.dataset
 
-    groups = _group_instances(args.group_params, instances)
-
+    results_store_path = None if args.results_store is None else Path(args.results_store).resolve()
     if args.solvers is None or not args.solvers:
-        solver_ids = _get_solver_ids(dataset_results_path)
+        if results_store_path is not None:
+            store = ResultsStore(results_store_path)
+            solver_ids = store.solver_ids(args.dataset)
+            store.close()
+        else:
+            solver_ids = _get_solver_ids(dataset_results_path)
     else:
         solver_ids = args.solvers
 
@@ -196,6 +478,25 @@ def main():
             for group_param, group_param_display in zip(args.group_params, args.group_params_display)
         }
 
+    num_processes = args.num_processes if args.num_processes is not None else os.cpu_count()
+    if results_store_path is not None:
+        instances_results = _load_instances_results_from_store(results_store_path, args.dataset, solver_ids)
+    elif args.results_index:
+        instances_results = _load_instances_results_from_index(
+            dataset_path, dataset_results_path, solver_ids, num_processes)
+    else:
+        instances_results = _load_instances_results(
+            dataset_path, dataset_pack_path, dataset_results_path, solver_ids, args.check_energy_limits, num_processes)
+
+    groups = _group_instances(args.group_params, instances_results)
+
+    if args.check_energy_limits:
+        for solver_id in solver_ids:
+            for instance_results in instances_results:
+                result = instance_results.results[solver_id]
+                if result is not None and result.energy_limits_satisfied is False:
+                    print(f'Energy limits violated: {solver_id}, {instance_results.instance_filename}')
+
     # Construct pandas dataframe containing the results data.
     series = []
     total_makespans = []
@@ -207,53 +508,34 @@ def main():
 
     # Which instances to ignore in total makespan computation (some solver does not have feasible solution)
     ignore_instances_for_total_makespan = set()
-    for solver_id in solver_ids:
-        for group in groups:
-            for instance in group.instances:
-                result_path = _get_result_path(dataset_results_path, solver_id, instance.instance_filename)
-                if result_path.exists():
-                    result = Result.from_json(result_path.read_text(), instance)
-                    if result.status != Status.Optimal and result.status != Status.Heuristic:
-                        ignore_instances_for_total_makespan.add(instance.instance_filename)
-                else:
-                    ignore_instances_for_total_makespan.add(instance.instance_filename)
+    for instance_results in instances_results:
+        for result in instance_results.results.values():
+            if result is None or (result.status != Status.Optimal and result.status != Status.Heuristic):
+                ignore_instances_for_total_makespan.add(instance_results.instance_filename)
 
     # Per solver series.
     for solver_id in solver_ids:
         solver_series = []
         solver_total_makespans = []
-        solver_metering_interval_iterations = []
         for group in groups:
             num_optimals = 0
             total_makespan = 0
-            for instance in group.instances:
-                result_path = _get_result_path(dataset_results_path, solver_id, instance.instance_filename)
-                if result_path.exists():
-                    result = Result.from_json(result_path.read_text(), instance)
-                    if result.status == Status.Optimal or result.status == Status.Heuristic:
-                        if instance.instance_filename not in ignore_instances_for_total_makespan:
-                            total_makespan += int(result.makespan())
-
-                    if result.status == Status.Optimal:
-                        num_optimals += 1
-
-                    if result.status == Status.Optimal:
-                        makespan = int(result.makespan())
-                        horizon = int(instance.horizon)
-                        if horizon % instance.length_metering_interval == 0:
-                            right_boundary = horizon
-                        else:
-                            right_boundary = horizon + instance.length_metering_interval - (horizon % instance.length_metering_interval)
-                        if makespan % instance.length_metering_interval == 0:
-                            left_boundary = makespan - instance.length_metering_interval
-                        else:
-                            left_boundary = makespan - (makespan % instance.length_metering_interval)
-                        solver_metering_interval_iterations.append((right_boundary - left_boundary) / instance.length_metering_interval)
+            for instance_results in group.instances:
+                result = instance_results.results[solver_id]
+                if result is None:
+                    continue
+
+                if result.status == Status.Optimal or result.status == Status.Heuristic:
+                    if instance_results.instance_filename not in ignore_instances_for_total_makespan:
+                        total_makespan += result.makespan
+
+                if result.status == Status.Optimal:
+                    num_optimals += 1
             solver_series.append(num_optimals)
             solver_total_makespans.append(total_makespan)
-        series.append(pd.Series(solver_series, name=solver_id, dtype=np.object))
-        total_makespans.append(pd.Series(solver_total_makespans, name=solver_id, dtype=np.object))
-        
+        series.append(pd.Series(solver_series, name=solver_id, dtype=object))
+        total_makespans.append(pd.Series(solver_total_makespans, name=solver_id, dtype=object))
+
     df_num_optimals = pd.concat(series, axis=1)
     df_num_optimals = df_num_optimals.sort_values(by=args.group_params)
 
@@ -270,8 +552,15 @@ def main():
         _results_table_to_graph(
             df_num_optimals, solver_ids, solvers_display, args.group_params, group_params_display, Path(args.results_graph_path).resolve())
 
+    html = df_num_optimals.to_html() + df_total_makespans.to_html()
+
+    if args.timings:
+        df_timings = _timings_table(groups, solver_ids, args.group_params)
+        print(df_timings.to_string(index=False))
+        html += df_timings.to_html(index=False)
+
     html_file = Path('index.html').resolve()
-    html_file.write_text(df_num_optimals.to_html() + df_total_makespans.to_html())
+    html_file.write_text(html)
 
     webbrowser.open(str(html_file), new=2)
 
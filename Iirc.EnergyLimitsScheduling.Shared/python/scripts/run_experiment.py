@@ -0,0 +1,369 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from datastructs.instance import Instance
+from datastructs.result import Result, Status
+from algorithms.energy_consumption import start_times_to_array
+from algorithms.feasibility import find_violations
+import utils
+
+# The solvers implemented as Python scripts in the solvers directory (same as the C# `PythonScript` solvers).
+PYTHON_SOLVERS = {
+    'CpOverlap': 'cp_overlap'
+}
+
+# Interval (in seconds) of checking whether the running solvers finished.
+POLL_INTERVAL = 0.1
+
+_PYTHON_PATH = Path(__file__).resolve().parent.parent
+
+class _Run:
+    """Solving of an instance by a solver of the prescription."""
+
+    __slots__ = [
+        'dataset',
+        'solver_id',
+        'solver_name',
+        'instance_filename',
+        'instance_path',
+        'result_path',
+        'solver_config',
+        'init_start_times_from',
+        'num_cpus',
+        'priority'
+    ]
+
+    def __init__(
+            self,
+            dataset: str,
+            solver_id: str,
+            solver_name: str,
+            instance_path: Path,
+            result_path: Path,
+            solver_config: dict,
+            init_start_times_from: Optional[str],
+            num_cpus: int):
+        self.dataset = dataset
+        self.solver_id = solver_id
+        self.solver_name = solver_name
+        self.instance_filename = instance_path.name
+        self.instance_path = instance_path
+        self.result_path = result_path
+        self.solver_config = solver_config
+        self.init_start_times_from = init_start_times_from
+        self.num_cpus = num_cpus
+        # The longest expected runs first: the time limit, then the instance size (the solvers finishing before the
+        # time limit are typically those solving the small instances).
+        self.priority = (utils.parse_timedelta(solver_config['TimeLimit']), instance_path.stat().st_size)
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return self.dataset, self.solver_id, self.instance_filename
+
+    @property
+    def init_start_times_key(self) -> Optional[Tuple[str, str, str]]:
+        if self.init_start_times_from is None:
+            return None
+        return self.dataset, self.init_start_times_from, self.instance_filename
+
+    def __str__(self):
+        return f'{self.instance_path} using {self.solver_id}'
+
+def _parse_args():
+    parser = argparse.ArgumentParser(
+        description='Run the experiment given by a prescription (the same as for the C# Experiments project) using '
+                    'the Python solvers, the runs are packed on the CPUs w.r.t. their number of workers.')
+    parser.add_argument(
+        'datasets_path',
+        metavar='DATASETS_PATH',
+        type=str,
+        help='Path to the datasets directory.')
+    parser.add_argument(
+        'prescription_path',
+        metavar='PRESCRIPTION_PATH',
+        type=str,
+        help='Path to the prescription file, its name (without the extension) is the name of the experiment.')
+    parser.add_argument(
+        'results_path',
+        metavar='RESULTS_PATH',
+        type=str,
+        help='Path to the results directory.')
+    parser.add_argument(
+        '--num-cpus',
+        dest='num_cpus',
+        metavar='NUM_CPUS',
+        type=int,
+        default=None,
+        help='The number of CPUs shared by the runs, a run occupies NumWorkers of its solver config CPUs (all of '
+             'them if NumWorkers is 0). Default is the number of CPUs.')
+    parser.add_argument(
+        '--from-scratch',
+        dest='from_scratch',
+        action='store_true',
+        default=False,
+        help='Delete the existing results of the prescription solvers instead of resuming the experiment.')
+    parser.add_argument(
+        '--no-feasibility-check',
+        dest='feasibility_check',
+        action='store_false',
+        default=True,
+        help='Do not check the feasibility of the found schedules before storing the results.')
+    parser.add_argument(
+        '--dry-run',
+        dest='dry_run',
+        action='store_true',
+        default=False,
+        help='Only print the runs in the order of their priority.')
+
+    return parser.parse_args()
+
+def _merge_configs(general: Optional[dict], specific: Optional[dict]) -> dict:
+    """Same as `PrescriptionSolverConfig.Merge` in C#."""
+    merged = dict()
+    for name in ['TimeLimit', 'ContinuousStartTimes', 'NumWorkers']:
+        if specific is not None and specific.get(name) is not None:
+            merged[name] = specific[name]
+        elif general is not None and general.get(name) is not None:
+            merged[name] = general[name]
+    return merged
+
+def _to_solver_config(prescription_solver_config: dict, specialized_solver_config: Optional[dict]) -> dict:
+    """Same as `PrescriptionSolverConfig.ToSolverConfig` in C# (including the `SolverConfig` defaults)."""
+    return {
+        'TimeLimit': prescription_solver_config.get('TimeLimit'),
+        'SpecializedSolverConfig': dict() if specialized_solver_config is None else specialized_solver_config,
+        'WithEnergyLimits': True,
+        'InitStartTimes': None,
+        'FixedOrder': None,
+        'ValidStartTimes': None,
+        'ContinuousStartTimes': prescription_solver_config.get('ContinuousStartTimes', False),
+        'NumWorkers': prescription_solver_config.get('NumWorkers', 0)
+    }
+
+def _check_prescription(prescription: dict):
+    solver_ids = set()
+    for solver_prescription in prescription['Solvers']:
+        solver_id = solver_prescription['Id']
+        if solver_id in solver_ids:
+            raise ValueError(f'Solver id {solver_id} is not unique.')
+
+        if solver_prescription['SolverName'] not in PYTHON_SOLVERS:
+            raise ValueError(
+                f'Solver {solver_prescription["SolverName"]} of {solver_id} is not a Python solver, use the C# '
+                f'Experiments project instead.')
+
+        init_start_times_from = solver_prescription.get('InitStartTimesFrom')
+        if init_start_times_from is not None and init_start_times_from not in solver_ids:
+            raise ValueError(f'InitStartTimesFrom of {solver_id} must be the id of a preceding solver.')
+
+        solver_ids.add(solver_id)
+
+def _plan_runs(
+        datasets_path: Path,
+        experiment_results_path: Path,
+        prescription: dict,
+        num_cpus: int,
+        skip_solved: bool = True) -> List[_Run]:
+    """Returns the runs (without an existing result if `skip_solved`), the longest expected running time first."""
+    runs = []
+    for dataset in prescription['DatasetNames']:
+        instance_paths = sorted(
+            child_path for child_path in (datasets_path / dataset).iterdir() if child_path.is_file())
+        for solver_prescription in prescription['Solvers']:
+            solver_config = _to_solver_config(
+                _merge_configs(prescription.get('GlobalConfig'), solver_prescription.get('Config')),
+                solver_prescription.get('SpecializedSolverConfig'))
+            if solver_config['TimeLimit'] is None:
+                raise ValueError(f'TimeLimit of {solver_prescription["Id"]} is not given.')
+            if solver_prescription['SolverName'] == 'CpOverlap' and solver_config['ContinuousStartTimes']:
+                raise ValueError(f'Solver {solver_prescription["Id"]} cannot handle continuous start times.')
+
+            num_workers = solver_config['NumWorkers']
+            run_num_cpus = min(num_workers, num_cpus) if num_workers > 0 else num_cpus
+
+            solver_results_path = experiment_results_path / dataset / solver_prescription['Id']
+            for instance_path in instance_paths:
+                result_path = solver_results_path / instance_path.name
+                if skip_solved and result_path.exists():
+                    continue
+
+                runs.append(_Run(
+                    dataset,
+                    solver_prescription['Id'],
+                    solver_prescription['SolverName'],
+                    instance_path,
+                    result_path,
+                    solver_config,
+                    solver_prescription.get('InitStartTimesFrom'),
+                    run_num_cpus))
+
+    runs.sort(key=lambda run: run.priority, reverse=True)
+    return runs
+
+def _init_start_times(run: _Run, experiment_results_path: Path) -> Optional[List[dict]]:
+    """Returns the start times of the `InitStartTimesFrom` solver result (if it found a schedule)."""
+    dataset, solver_id, instance_filename = run.init_start_times_key
+    result_raw = json.loads((experiment_results_path / dataset / solver_id / instance_filename).read_text())
+    if Status(result_raw['Status']) in {Status.Optimal, Status.Heuristic}:
+        return result_raw['StartTimes']
+    return None
+
+def _temp_result_path(run: _Run) -> Path:
+    # In the solver results directory, so that the finished result is moved atomically.
+    return run.result_path.with_name(f'.{run.result_path.name}.tmp')
+
+def _start(run: _Run, experiment_results_path: Path) -> Tuple[subprocess.Popen, Path]:
+    solver_config = dict(run.solver_config)
+    if run.init_start_times_from is not None:
+        solver_config['InitStartTimes'] = _init_start_times(run, experiment_results_path)
+    fd, solver_config_path = tempfile.mkstemp(suffix='.json')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(solver_config, f)
+
+    run.result_path.parent.mkdir(parents=True, exist_ok=True)
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            str(_PYTHON_PATH / 'solvers' / f'{PYTHON_SOLVERS[run.solver_name]}.py'),
+            str(solver_config_path),
+            str(run.instance_path),
+            str(_temp_result_path(run))
+        ],
+        cwd=str(_PYTHON_PATH))
+    return process, Path(solver_config_path)
+
+def _finish(run: _Run, return_code: int, feasibility_check: bool) -> Optional[str]:
+    """Stores the result of the finished run, returns the error (if any)."""
+    temp_result_path = _temp_result_path(run)
+    try:
+        if return_code != 0:
+            return f'solver exited with code {return_code}'
+
+        if feasibility_check:
+            instance = Instance.from_file(run.instance_path, run.instance_filename)
+            result = Result.from_json(temp_result_path.read_text(), instance)
+            if result.status in {Status.Optimal, Status.Heuristic}:
+                violations = find_violations(
+                    instance,
+                    start_times_to_array(instance, result.start_times),
+                    run.solver_config['WithEnergyLimits'],
+                    first_only=True)
+                if violations:
+                    return f'feasibility check failed: {violations[0].status.name}'
+
+        os.replace(temp_result_path, run.result_path)
+        return None
+    finally:
+        if temp_result_path.exists():
+            temp_result_path.unlink()
+
+def _run_experiment(
+        experiment_results_path: Path,
+        runs: List[_Run],
+        num_cpus: int,
+        feasibility_check: bool = True) -> Dict[Tuple[str, str, str], str]:
+    """Runs the solvers as subprocesses, packed on `num_cpus` CPUs.
+
+    The runs are started in the order of their priority, a run that does not fit to the free CPUs is overtaken by the
+    following runs that fit (its CPUs are not held idle). A run with `InitStartTimesFrom` waits for the run of that
+    solver on the same instance. Returns the errors of the failed runs.
+    """
+    pending = list(runs)
+    unfinished: Set[Tuple[str, str, str]] = {run.key for run in runs}
+    running: List[Tuple[_Run, subprocess.Popen, Path]] = []
+    errors: Dict[Tuple[str, str, str], str] = dict()
+    free_cpus = num_cpus
+
+    try:
+        while pending or running:
+            still_running = []
+            for run, process, solver_config_path in running:
+                return_code = process.poll()
+                if return_code is None:
+                    still_running.append((run, process, solver_config_path))
+                    continue
+
+                solver_config_path.unlink()
+                error = _finish(run, return_code, feasibility_check)
+                if error is not None:
+                    errors[run.key] = error
+                    print(f'Error while solving {run}: {error}')
+                else:
+                    print(f'Solved {run}')
+                unfinished.remove(run.key)
+                free_cpus += run.num_cpus
+            running = still_running
+
+            still_pending = []
+            for run in pending:
+                if run.init_start_times_key in errors:
+                    errors[run.key] = f'{run.init_start_times_from} failed'
+                    print(f'Error while solving {run}: {errors[run.key]}')
+                    unfinished.remove(run.key)
+                elif run.num_cpus > free_cpus or run.init_start_times_key in unfinished:
+                    still_pending.append(run)
+                else:
+                    print(f'Solving {run}')
+                    process, solver_config_path = _start(run, experiment_results_path)
+                    running.append((run, process, solver_config_path))
+                    free_cpus -= run.num_cpus
+            pending = still_pending
+
+            if running:
+                time.sleep(POLL_INTERVAL)
+    finally:
+        for run, process, solver_config_path in running:
+            if process.poll() is None:
+                process.terminate()
+                process.wait()
+            solver_config_path.unlink()
+            if _temp_result_path(run).exists():
+                _temp_result_path(run).unlink()
+
+    return errors
+
+def main():
+    args = _parse_args()
+
+    datasets_path = Path(args.datasets_path).resolve()
+    prescription_path = Path(args.prescription_path).resolve()
+    results_path = Path(args.results_path).resolve()
+    num_cpus = args.num_cpus if args.num_cpus is not None else os.cpu_count()
+
+    prescription = json.loads(prescription_path.read_text())
+    _check_prescription(prescription)
+
+    for dataset in prescription['DatasetNames']:
+        if not (datasets_path / dataset).is_dir():
+            print(f'Dataset directory {datasets_path / dataset} does not exist.')
+            sys.exit(1)
+
+    experiment_results_path = results_path / prescription_path.stem
+    if args.from_scratch and not args.dry_run:
+        for dataset in prescription['DatasetNames']:
+            for solver_prescription in prescription['Solvers']:
+                solver_results_path = experiment_results_path / dataset / solver_prescription['Id']
+                if solver_results_path.exists():
+                    shutil.rmtree(solver_results_path)
+
+    runs = _plan_runs(datasets_path, experiment_results_path, prescription, num_cpus, not args.from_scratch)
+    if args.dry_run:
+        for run in runs:
+            print(f'{run} ({run.num_cpus} CPUs, time limit {run.solver_config["TimeLimit"]})')
+        return
+
+    errors = _run_experiment(experiment_results_path, runs, num_cpus, args.feasibility_check)
+    print(f'{len(runs) - len(errors)} of {len(runs)} runs solved')
+    if errors:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
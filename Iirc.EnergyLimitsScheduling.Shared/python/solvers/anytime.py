@@ -0,0 +1,54 @@
+from typing import Dict, Optional
+from pathlib import Path
+from datetime import datetime
+import json
+import os
+
+from datastructs.result import Result
+
+__all__ = [
+    'AnytimeResultWriter'
+]
+
+
+class AnytimeResultWriter:
+    """Persists the best result found so far, so that it survives the solver process being killed.
+
+    Each improving result atomically replaces the result file (with an extra `Timestamp` key ignored by the
+    readers) and, if the progress log path is given, appends a JSON line with the running time (in seconds),
+    timestamp, makespan and lower bound to the log.
+    """
+
+    def __init__(self, result_path: Path, progress_log_path: Optional[Path] = None):
+        self.result_path = result_path
+        self.progress_log_path = progress_log_path
+        self.best_makespan: Optional[float] = None
+
+    def __call__(self, result: Result):
+        makespan = result.makespan()
+        if makespan is None or (self.best_makespan is not None and makespan >= self.best_makespan):
+            return
+
+        self.best_makespan = makespan
+        timestamp = datetime.now().isoformat()
+        self.write(result, timestamp)
+
+        if self.progress_log_path is not None:
+            with self.progress_log_path.open('a') as f:
+                f.write(json.dumps({
+                    'RunningTime': result.running_time.total_seconds(),
+                    'Timestamp': timestamp,
+                    'Makespan': makespan,
+                    'LowerBound': result.lower_bound
+                }) + '\n')
+
+    def write(self, result: Result, timestamp: Optional[str] = None):
+        self.write_dict(result.to_dict(), timestamp)
+
+    def write_dict(self, d: Dict[str, object], timestamp: Optional[str] = None):
+        """Writes the result already converted by `Result.to_dict`."""
+        d['Timestamp'] = timestamp if timestamp is not None else datetime.now().isoformat()
+
+        tmp_result_path = self.result_path.with_name(self.result_path.name + '.tmp')
+        tmp_result_path.write_text(json.dumps(d))
+        os.replace(str(tmp_result_path), str(self.result_path))
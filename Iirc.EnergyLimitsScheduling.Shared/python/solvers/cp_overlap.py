@@ -1,113 +1,481 @@
 #!/usr/bin/env python3
 
+import time
+# The duration of the imports is reported in the timings of the result.
+start_time_imports = time.time()
+
+from typing import Callable, Dict, Optional
 from pathlib import Path
+import argparse
 import sys
 import json
 from datetime import timedelta
-import time
-from docplex.cp.parameters import VALUE_OFF, VALUE_AUTO
-from docplex.cp.model import CpoModel
-from docplex.cp.solution import CpoModelSolution
+import docplex.cp.config
 
 from datastructs.result import Result, Status
-from datastructs.instance import Instance
+from datastructs.instance import Instance, Operation
+from algorithms.time_windows import compute_time_windows
+from algorithms.bounds import compute_lower_bound, find_unschedulable_operations
+from solvers.rolling_horizon import solve_rolling_horizon
+from solvers.lns import solve_lns
+from algorithms.energy_consumption import start_times_to_array
+from algorithms.feasibility import FeasibilityStatus, check_feasibility, find_violations
+from algorithms.greedy_earliest_start_time import GreedyEarliestStartTime, PriorityRule, CannotScheduleException
+from solvers.cp_overlap_model import get_specialized_solver_config, report_solution, objective_lower_bound, \
+    compute_makespan, num_metering_intervals_covering
+from solvers.iterative_horizon import solve_iterative_horizon
+from solvers.worker import Worker
+from solvers.anytime import AnytimeResultWriter
+from solvers.portfolio import solve_portfolio, portfolio_variant_solver_configs
+from solvers.model_cache import build_model
+from solvers.solve_cache import DEFAULT_MAX_SIZE, SolveCache
 import utils
 import cp_utils
 
 start_time_solver = time.time()
 
-solver_config_path = Path(sys.argv[1]).resolve()
-instance_path = Path(sys.argv[2]).resolve()
-solver_result_path = Path(sys.argv[3]).resolve()
-
-solver_config = json.loads(solver_config_path.read_text())
-solver_config['TimeLimit'] = utils.parse_timedelta(solver_config['TimeLimit'])
-
-instance = Instance.from_json(instance_path.read_text())
-
-model = CpoModel()
-
-# RestartPropagationLimitFactor and TemporalRelaxation suggested by Philippe Laborie.
-model.set_parameters({
-    "RestartPropagationLimitFactor": 1000,
-    "TemporalRelaxation": VALUE_OFF,
-    "Workers": solver_config['NumWorkers'] if solver_config['NumWorkers'] > 0 else VALUE_AUTO
-})
-
-# Variables (classic job shop).
-operation_vars = dict()
-for job in instance.jobs:
-    for operation in job.operations:
-        operation_vars[operation] = model.interval_var(
-            length=operation.processing_time,
-            name='var_' + str(operation.id))
-        
-if solver_config['ValidStartTimes'] is not None:
-    for valid_start_time in solver_config['ValidStartTimes']:
-        operation = instance.jobs[valid_start_time["JobIndex"]].operations[valid_start_time["OperationIndex"]]
-        operation_var = operation_vars[operation]
-        operation_var.set_start((int(valid_start_time["StartTimeFrom"]), int(valid_start_time["StartTimeTo"])))
-
-# Can be changed by init start times.
-num_metering_intervals = instance.num_metering_intervals
-
-if solver_config['InitStartTimes'] is not None and solver_config['InitStartTimes']:
-    init_start_times = {instance.jobs[d['JobIndex']].operations[d['OperationIndex']]: d['StartTime']
-                        for d in solver_config['InitStartTimes']}
-    init_vars = CpoModelSolution()
-    for operation, start_time in init_start_times.items():
-        init_vars.add_interval_var_solution(operation_vars[operation], presence=True, start=int(round(start_time)))
-    model.set_starting_point(init_vars)
-
-    makespan = int(round(max([start_time + operation.processing_time
-                              for operation, start_time in init_start_times.items()])))
-    num_metering_intervals = int((makespan - 1) / instance.length_metering_interval) + 1
-
-machine_vars = dict()
-for machine_index in range(instance.num_machines):
-    machine_vars[machine_index] =\
-        model.sequence_var([operation_vars[operation]
-                            for job in instance.jobs
-                            for operation in job.operations if operation.machine_index == machine_index])
-
-# Constraints (classic job shop).
-for job in instance.jobs:
-    for operation, next_operation in zip(job.operations[:-1], job.operations[1:]):
-        model.add(model.end_before_start(operation_vars[operation], operation_vars[next_operation]))
-
-for machine_index in range(instance.num_machines):
-    model.add(model.no_overlap(machine_vars[machine_index]))
-    
-# Constraints (energy limits).
-if solver_config['WithEnergyLimits']:
-    for operation_var in operation_vars.values():
-        model.add(model.end_of(operation_var) <= num_metering_intervals * instance.length_metering_interval)
-
-    for metering_interval_index in range(num_metering_intervals):
-            model.add(model.sum(operation.power_consumption * model.overlap_length(
-                                    operation_vars[operation],
-                                    (metering_interval_index * instance.length_metering_interval,
-                                     (metering_interval_index + 1) * instance.length_metering_interval))
-                                for job in instance.jobs for operation in job.operations)
-                      <= instance.energy_limit)
-
-# Objective.
-model.add(model.minimize(model.max([model.end_of(operation_var) for operation_var in operation_vars.values()])))
-
-remaining_time = solver_config['TimeLimit'].total_seconds() - (time.time() - start_time_solver)
-solution = model.solve(TimeLimit=remaining_time)
-
-start_times = dict()
-if cp_utils.get_result_status(solution) in {Status.Heuristic, Status.Optimal}:
-    start_times = {operation: solution.get_var_solution(operation_vars[operation]).start
-                   for job in instance.jobs for operation in job.operations}
-
-solver_result = Result(
-    cp_utils.get_result_status(solution),
-    cp_utils.time_limit_reached(solution),
-    timedelta(seconds=time.time() - start_time_solver),
-    start_times,
-    solution.get_objective_bounds()[0]
-)
-
-solver_result_path.write_text(solver_result.to_json())
+
+def _greedy_warm_start(solver_config: dict, instance: Instance) -> Optional[Dict[Operation, int]]:
+    specialized_solver_config = get_specialized_solver_config(solver_config)
+    if not specialized_solver_config.get('GreedyWarmStart', True):
+        return None
+
+    priority_rule_value = specialized_solver_config.get(
+        'GreedyWarmStartPriorityRule', PriorityRule.EarliestStartTime.name)
+    try:
+        priority_rule = PriorityRule.parse(priority_rule_value)
+    except (KeyError, ValueError):
+        # E.g., EarliestStartTimeOverFixedOrder of C# needs the fixed order, the solve continues without the warm
+        # start.
+        print(f'Warning: greedy warm start skipped, priority rule {priority_rule_value} is not supported.',
+              file=sys.stderr)
+        return None
+
+    try:
+        start_times = GreedyEarliestStartTime(instance, solver_config['WithEnergyLimits']).schedule(priority_rule)
+    except CannotScheduleException:
+        return None
+
+    # The warm start bounds the number of metering intervals, so it must respect the valid start times.
+    if not _respects_valid_start_times(solver_config, instance, start_times):
+        return None
+
+    return start_times
+
+
+def _respects_valid_start_times(solver_config: dict, instance: Instance, start_times: Dict[Operation, float]) -> bool:
+    if solver_config['ValidStartTimes'] is None:
+        return True
+
+    time_windows = compute_time_windows(instance, None, solver_config['ValidStartTimes'])
+    for operation, start_time in start_times.items():
+        time_window = time_windows[operation]
+        if start_time < time_window.earliest_start \
+                or (time_window.latest_start is not None and start_time > time_window.latest_start):
+            return False
+    return True
+
+
+def _is_feasible_warm_start(solver_config: dict, instance: Instance, start_times: Dict[Operation, float]) -> bool:
+    """Whether the start times are a feasible schedule respecting the valid start times, i.e., can be the incumbent."""
+    return _respects_valid_start_times(solver_config, instance, start_times) and not find_violations(
+        instance, start_times_to_array(instance, start_times), solver_config['WithEnergyLimits'], first_only=True)
+
+
+def _solve_variant(
+        solver_config: dict,
+        instance: Instance,
+        start_time_solver: float,
+        timings: Optional[utils.PhaseTimings] = None,
+        on_solution: Optional[Callable[[Result], None]] = None) -> Result:
+    return _solve(
+        solver_config,
+        instance,
+        start_time_solver,
+        timings if timings is not None else utils.PhaseTimings(),
+        on_solution)
+
+
+def solve(
+        solver_config: dict,
+        instance: Instance,
+        start_time_solver: float,
+        timings: Optional[utils.PhaseTimings] = None,
+        on_solution: Optional[Callable[[Result], None]] = None) -> Result:
+    """Solves the instance, `on_solution` (if given) is called with each improving (heuristic) result."""
+    timings = timings if timings is not None else utils.PhaseTimings()
+
+    solve_cache = _get_solve_cache(solver_config)
+    cached = None
+    if solve_cache is not None:
+        with timings.measure('SolveCache'):
+            cache_key = SolveCache.key(solver_config, instance)
+            cached = solve_cache.get(cache_key, instance)
+
+    is_cache_hit = cached is not None and (cached.is_proven() or cached.covers(solver_config))
+    if is_cache_hit:
+        timings.add('SolveCacheHit', timings.timings.pop('SolveCache'))
+        result = Result(
+            cached.result.status,
+            False,
+            timedelta(seconds=time.time() - start_time_solver),
+            cached.result.start_times,
+            cached.result.lower_bound,
+            timings.timings,
+            cached.result.model_statistics
+        )
+    elif cached is not None:
+        # The budget is larger, the search continues from the cached schedule.
+        warm_solver_config = solver_config
+        if cached.result.start_times:
+            warm_solver_config = dict(solver_config, InitStartTimes=[
+                {'JobIndex': operation.job_index, 'OperationIndex': operation.index, 'StartTime': start_time}
+                for operation, start_time in cached.result.start_times.items()
+            ])
+        result = _with_cached_result(
+            _solve(warm_solver_config, instance, start_time_solver, timings, on_solution), cached.result)
+    else:
+        result = _solve(solver_config, instance, start_time_solver, timings, on_solution)
+
+    is_checked_infeasible = False
+    if get_specialized_solver_config(solver_config).get('CheckFeasibility', False) and result.start_times:
+        with timings.measure('FeasibilityCheck'):
+            feasibility_status = check_feasibility(
+                instance, start_times_to_array(instance, result.start_times), solver_config['WithEnergyLimits'])
+        if feasibility_status != FeasibilityStatus.Feasible:
+            # The run still writes a result, the schedule violating the constraints is dropped.
+            print(f'Error: schedule with status {result.status.name} is infeasible: {feasibility_status.name}',
+                  file=sys.stderr)
+            is_checked_infeasible = True
+            result = Result(
+                Status.NoSolution,
+                result.time_limit_reached,
+                result.running_time,
+                dict(),
+                result.lower_bound,
+                timings.timings,
+                result.model_statistics
+            )
+
+    if solve_cache is not None and not is_cache_hit and not is_checked_infeasible:
+        solve_cache.put(cache_key, solver_config, result)
+
+    return result
+
+
+def _get_solve_cache(solver_config: dict) -> Optional[SolveCache]:
+    specialized_solver_config = get_specialized_solver_config(solver_config)
+    if specialized_solver_config.get('SolveCache') is None:
+        return None
+
+    max_size = specialized_solver_config.get('SolveCacheMaxSize')
+    return SolveCache(
+        Path(specialized_solver_config['SolveCache']),
+        DEFAULT_MAX_SIZE if max_size is None else int(max_size * 1024 * 1024))
+
+
+def _with_cached_result(result: Result, cached_result: Result) -> Result:
+    """Combines the result of the solve warm started from the (time-limited) cached result with the cached one."""
+    lower_bounds = [lower_bound for lower_bound in [result.lower_bound, cached_result.lower_bound]
+                    if lower_bound is not None]
+    lower_bound = max(lower_bounds) if lower_bounds else None
+
+    status = result.status
+    start_times = result.start_times
+    if not start_times and cached_result.start_times:
+        status = Status.Heuristic
+        start_times = cached_result.start_times
+    if start_times and lower_bound is not None and compute_makespan(start_times) <= lower_bound:
+        status = Status.Optimal
+
+    return Result(
+        status,
+        result.time_limit_reached,
+        result.running_time,
+        start_times,
+        lower_bound,
+        result.timings,
+        result.model_statistics
+    )
+
+
+def _solve(
+        solver_config: dict,
+        instance: Instance,
+        start_time_solver: float,
+        timings: utils.PhaseTimings,
+        on_solution: Optional[Callable[[Result], None]] = None) -> Result:
+    if get_specialized_solver_config(solver_config).get('Portfolio'):
+        # The variants are not checked, only the reported schedule is.
+        return solve_portfolio(
+            _solve_variant, portfolio_variant_solver_configs(solver_config), instance, start_time_solver, on_solution)
+
+    # Can be changed by init start times.
+    num_metering_intervals = instance.num_metering_intervals
+
+    # Only a feasible warm start can be the incumbent (and bound the number of metering intervals), the initial
+    # start times of the config rejected by the feasibility checker are only the hint of the search.
+    init_start_times = None
+    hint_start_times = None
+    if solver_config['InitStartTimes'] is not None and solver_config['InitStartTimes']:
+        with timings.measure('WarmStart'):
+            given_start_times = {instance.get_operation(d['JobIndex'], d['OperationIndex']): d['StartTime']
+                                 for d in solver_config['InitStartTimes']}
+            if _is_feasible_warm_start(solver_config, instance, given_start_times):
+                init_start_times = given_start_times
+            else:
+                hint_start_times = given_start_times
+
+    if init_start_times is None:
+        with timings.measure('WarmStart'):
+            init_start_times = _greedy_warm_start(solver_config, instance)
+        if init_start_times:
+            report_solution(on_solution, start_time_solver, init_start_times, None, timings)
+
+    # Cheap lower bounds detect the hopeless instances, the optimal warm starts and cap the objective domain.
+    lower_bound = None
+    if get_specialized_solver_config(solver_config).get('LowerBounds', True):
+        with timings.measure('LowerBounds'):
+            lower_bound = compute_lower_bound(instance, solver_config['WithEnergyLimits'])
+            hopeless = solver_config['WithEnergyLimits'] and (
+                lower_bound > num_metering_intervals * instance.length_metering_interval
+                or find_unschedulable_operations(instance))
+        if hopeless:
+            return Result(
+                Status.Infeasible,
+                False,
+                timedelta(seconds=time.time() - start_time_solver),
+                dict(),
+                None,
+                timings.timings
+            )
+
+        # The greedy warm start is not checked otherwise, only a feasible schedule is claimed optimal.
+        if init_start_times and compute_makespan(init_start_times) <= lower_bound \
+                and _is_feasible_warm_start(solver_config, instance, init_start_times):
+            return Result(
+                Status.Optimal,
+                False,
+                timedelta(seconds=time.time() - start_time_solver),
+                init_start_times,
+                lower_bound,
+                timings.timings
+            )
+
+    if init_start_times:
+        num_metering_intervals = num_metering_intervals_covering(
+            compute_makespan(init_start_times), instance.length_metering_interval)
+
+    if get_specialized_solver_config(solver_config).get('RollingHorizon', False):
+        return solve_rolling_horizon(
+            solver_config,
+            instance,
+            start_time_solver,
+            init_start_times,
+            hint_start_times,
+            lower_bound,
+            timings)
+
+    if get_specialized_solver_config(solver_config).get('Lns', False):
+        return solve_lns(
+            solver_config,
+            instance,
+            start_time_solver,
+            num_metering_intervals,
+            init_start_times,
+            hint_start_times,
+            lower_bound,
+            timings,
+            on_solution)
+
+    if solver_config['WithEnergyLimits'] \
+            and get_specialized_solver_config(solver_config).get('IterativeHorizon', False):
+        return solve_iterative_horizon(
+            solver_config,
+            instance,
+            start_time_solver,
+            num_metering_intervals,
+            init_start_times,
+            hint_start_times,
+            lower_bound,
+            timings,
+            on_solution)
+
+    cp_model = build_model(solver_config, instance, num_metering_intervals, lower_bound, timings)
+    if cp_model.is_infeasible():
+        return Result(
+            Status.Infeasible,
+            False,
+            timedelta(seconds=time.time() - start_time_solver),
+            dict(),
+            None,
+            timings.timings,
+            cp_model.statistics()
+        )
+
+    if init_start_times or hint_start_times:
+        cp_model.set_starting_point(init_start_times if init_start_times else hint_start_times)
+
+    remaining_time = solver_config['TimeLimit'].total_seconds() - (time.time() - start_time_solver)
+    solution = cp_model.solve(
+        remaining_time,
+        None if on_solution is None else lambda solution: report_solution(
+            on_solution,
+            start_time_solver,
+            cp_model.get_start_times(solution),
+            objective_lower_bound(solution, lower_bound),
+            timings))
+
+    start_times = dict()
+    if cp_utils.get_result_status(solution) in {Status.Heuristic, Status.Optimal}:
+        start_times = cp_model.get_start_times(solution)
+
+    return Result(
+        cp_utils.get_result_status(solution),
+        cp_utils.time_limit_reached(solution),
+        timedelta(seconds=time.time() - start_time_solver),
+        start_times,
+        objective_lower_bound(solution, lower_bound),
+        timings.timings,
+        cp_model.statistics()
+    )
+
+
+def _serialize_result(result: Result, timings: utils.PhaseTimings) -> Dict[str, object]:
+    """Converts the result to the JSON-compatible dict, timing the conversion (the dumping cannot be in the timings)."""
+    with timings.measure('Serialization'):
+        result_dict = result.to_dict()
+    result_dict['Timings'] = dict(result_dict.get('Timings') or dict(), Serialization=timings.timings['Serialization'])
+    return result_dict
+
+
+def _parse_solver_config(solver_config: dict) -> dict:
+    solver_config['TimeLimit'] = utils.parse_timedelta(solver_config['TimeLimit'])
+    return solver_config
+
+
+def _solve_request(solver_config: dict, instance: Instance, start_time_solver: float) -> Result:
+    return solve(_parse_solver_config(solver_config), instance, start_time_solver)
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='Solve energy limits scheduling instances with CP Optimizer.')
+    parser.add_argument(
+        'solver_config_path',
+        metavar='SOLVER_CONFIG_PATH',
+        type=str,
+        nargs='?',
+        help='Path to the solver config file.')
+    parser.add_argument(
+        'instance_path',
+        metavar='INSTANCE_PATH',
+        type=str,
+        nargs='?',
+        help='Path to the instance file.')
+    parser.add_argument(
+        'solver_result_path',
+        metavar='SOLVER_RESULT_PATH',
+        type=str,
+        nargs='?',
+        help='Path where to write the result file.')
+    parser.add_argument(
+        '--worker',
+        dest='worker',
+        action='store_true',
+        help='Run as a long-lived worker answering solve requests (JSON lines) from the standard input.')
+    parser.add_argument(
+        '--socket',
+        dest='socket_path',
+        metavar='SOCKET_PATH',
+        type=str,
+        default=None,
+        help='In worker mode, listen on this Unix socket instead of the standard input.')
+    parser.add_argument(
+        '--num-cpus',
+        dest='num_cpus',
+        metavar='NUM_CPUS',
+        type=int,
+        default=None,
+        help='In worker mode, the number of CPUs shared by the concurrently solved requests. Default is all CPUs.')
+    parser.add_argument(
+        '--anytime',
+        dest='anytime',
+        action='store_true',
+        help='Rewrite the result file with each improving solution found during the search.')
+    parser.add_argument(
+        '--progress-log',
+        dest='progress_log_path',
+        metavar='PROGRESS_LOG_PATH',
+        type=str,
+        default=None,
+        help='In anytime mode, append the running time, makespan and lower bound of each improving solution to '
+             'this file (JSON lines).')
+    parser.add_argument(
+        '--resume',
+        dest='resume',
+        action='store_true',
+        help='In anytime mode, start from the solution in the existing result file (if any) unless the solver '
+             'config gives the initial start times.')
+
+    args = parser.parse_args()
+    if not args.worker and args.solver_result_path is None:
+        parser.error('SOLVER_CONFIG_PATH, INSTANCE_PATH and SOLVER_RESULT_PATH are required unless --worker is used')
+    if (args.progress_log_path is not None or args.resume) and not args.anytime:
+        parser.error('--progress-log and --resume require --anytime')
+
+    return args
+
+
+def _serve(num_cpus: Optional[int], socket_path: Optional[str]):
+    # The search log of the concurrent requests would interleave (and corrupt the responses on the standard output).
+    docplex.cp.config.context.solver.log_output = None
+    worker = Worker(_solve_request, num_cpus)
+    if socket_path is None:
+        worker.serve_stdio()
+    else:
+        worker.serve_socket(Path(socket_path).resolve())
+
+
+def main():
+    args = _parse_args()
+
+    if args.worker:
+        _serve(args.num_cpus, args.socket_path)
+        return
+
+    solver_config_path = Path(args.solver_config_path).resolve()
+    instance_path = Path(args.instance_path).resolve()
+    solver_result_path = Path(args.solver_result_path).resolve()
+
+    timings = utils.PhaseTimings()
+    timings.add('Imports', start_time_solver - start_time_imports)
+
+    with timings.measure('Parsing'):
+        solver_config = _parse_solver_config(json.loads(solver_config_path.read_text()))
+
+        instance = Instance.from_json(instance_path.read_text())
+
+    if not args.anytime:
+        solver_result = solve(solver_config, instance, start_time_solver, timings)
+        solver_result_path.write_text(json.dumps(_serialize_result(solver_result, timings)))
+        return
+
+    # The result file may exist but be empty (e.g., a temporary file created by the caller).
+    if args.resume and solver_result_path.exists() and solver_result_path.stat().st_size > 0 \
+            and not solver_config['InitStartTimes']:
+        previous_result = Result.from_json(solver_result_path.read_text(), instance)
+        if previous_result.start_times:
+            solver_config['InitStartTimes'] = [
+                {'JobIndex': operation.job_index, 'OperationIndex': operation.index, 'StartTime': start_time}
+                for operation, start_time in previous_result.start_times.items()
+            ]
+
+    anytime_result_writer = AnytimeResultWriter(
+        solver_result_path,
+        None if args.progress_log_path is None else Path(args.progress_log_path).resolve())
+    solver_result = solve(solver_config, instance, start_time_solver, timings, anytime_result_writer)
+    anytime_result_writer.write_dict(_serialize_result(solver_result, timings))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,430 @@
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, FrozenSet
+from enum import IntEnum
+from pathlib import Path
+from datetime import timedelta
+import json
+import os
+import time
+from docplex.cp.parameters import VALUE_OFF, VALUE_AUTO
+from docplex.cp.model import CpoModel
+from docplex.cp.solution import CpoModelSolution, CpoSolveResult
+from docplex.cp.solver.solver import CpoSolver
+from docplex.cp.expression import CpoExpr, INTERVAL_MAX
+
+from datastructs.result import Result, Status
+from datastructs.instance import Instance, Operation
+from algorithms.time_windows import TimeWindow, compute_time_windows, overlapped_metering_intervals
+import utils
+
+__all__ = [
+    'get_specialized_solver_config',
+    'EnergyFormulation',
+    'CpOverlapModel',
+    'report_solution',
+    'objective_lower_bound',
+    'compute_makespan',
+    'num_metering_intervals_covering'
+]
+
+
+def get_specialized_solver_config(solver_config: dict) -> dict:
+    specialized_solver_config = solver_config.get('SpecializedSolverConfig')
+    return specialized_solver_config if specialized_solver_config is not None else dict()
+
+
+class EnergyFormulation(IntEnum):
+    # Energy consumed in a metering interval is the overlap length of the operation with it.
+    Overlap = 0,
+    # Operations are split at the boundaries of the metering intervals into optional segments, the energy consumed
+    # in a metering interval is the length of the segment.
+    Segments = 1
+
+    @staticmethod
+    def parse(value) -> 'EnergyFormulation':
+        return EnergyFormulation[value] if isinstance(value, str) else EnergyFormulation(value)
+
+
+def _model_parameters(solver_config: dict) -> dict:
+    # RestartPropagationLimitFactor and TemporalRelaxation suggested by Philippe Laborie.
+    parameters = {
+        "RestartPropagationLimitFactor": 1000,
+        "TemporalRelaxation": VALUE_OFF,
+        "Workers": solver_config['NumWorkers'] if solver_config['NumWorkers'] > 0 else VALUE_AUTO
+    }
+    # CP Optimizer parameters overridden by the config, e.g., by the variants of the portfolio.
+    parameters.update(get_specialized_solver_config(solver_config).get('Parameters') or dict())
+    return parameters
+
+
+# Scale of the power consumptions and the energy limits in the segments formulation, whose energy constraints have
+# integer coefficients. The rounding error in a metering interval is far below the tolerance of the feasibility check.
+_ENERGY_SCALE = 1000000
+
+
+def _operation_var_name(operation: Operation) -> str:
+    # Named by the indices (not the ids), so that an exported model fits any instance of the same contents.
+    return f'var_{operation.job_index}_{operation.index}'
+
+
+def _segment_var_name(operation: Operation, metering_interval_index: int) -> str:
+    return f'segment_{operation.job_index}_{operation.index}_{metering_interval_index}'
+
+
+class CpOverlapModel:
+    """CP model of the problem, the number of metering intervals can be changed after it is built."""
+
+    def __init__(
+            self,
+            solver_config: dict,
+            instance: Instance,
+            num_metering_intervals: int,
+            timings: Optional[utils.PhaseTimings] = None,
+            consumed_energies: Optional[Sequence[float]] = None):
+        self.solver_config = solver_config
+        self.instance = instance
+        self.timings = timings if timings is not None else utils.PhaseTimings()
+        # Energy consumed in the metering intervals by the operations outside of the model (e.g., fixed by the
+        # rolling horizon), it is subtracted from the energy limit.
+        self.consumed_energies = consumed_energies
+        self.num_metering_intervals = 0
+        self.time_windows: Dict[Operation, TimeWindow] = dict()
+        # Metering interval index -> (overlapping operations, energy constraint).
+        self.energy_constraints: Dict[int, Tuple[FrozenSet[Operation], CpoExpr]] = dict()
+        self.energy_formulation = EnergyFormulation.parse(
+            get_specialized_solver_config(solver_config).get('EnergyFormulation', EnergyFormulation.Overlap.name))
+        # Segments formulation, (operation, metering interval index) -> segment variable.
+        self.segment_vars: Dict[Tuple[Operation, int], CpoExpr] = dict()
+        # Segments formulation, operation -> (metering interval indices of the segments, linking constraints).
+        self.segment_constraints: Dict[Operation, Tuple[range, List[CpoExpr]]] = dict()
+
+        # Statistics of the exported model, if the model is loaded (see `load`).
+        self.loaded_statistics: Optional[Dict[str, int]] = None
+
+        self.model = CpoModel()
+        self.model.set_parameters(_model_parameters(solver_config))
+
+        # Variables (classic job shop), the domains are set by `set_num_metering_intervals`.
+        with self.timings.measure('Variables'):
+            self.operation_vars = dict()
+            for job in instance.jobs:
+                for operation in job.operations:
+                    self.operation_vars[operation] = self.model.interval_var(
+                        length=operation.processing_time,
+                        name=_operation_var_name(operation))
+
+            self.machine_vars = dict()
+            for machine_index in range(instance.num_machines):
+                self.machine_vars[machine_index] =\
+                    self.model.sequence_var([self.operation_vars[operation]
+                                             for job in instance.jobs
+                                             for operation in job.operations
+                                             if operation.machine_index == machine_index],
+                                            name='machine_' + str(machine_index))
+
+        # Constraints (classic job shop).
+        with self.timings.measure('JobShopConstraints'):
+            self.num_job_shop_constraints = 0
+            for job in instance.jobs:
+                for operation, next_operation in zip(job.operations[:-1], job.operations[1:]):
+                    self.model.add(self.model.end_before_start(
+                        self.operation_vars[operation], self.operation_vars[next_operation]))
+                    self.num_job_shop_constraints += 1
+
+            for machine_index in range(instance.num_machines):
+                self.model.add(self.model.no_overlap(self.machine_vars[machine_index]))
+                self.num_job_shop_constraints += 1
+
+        # Objective.
+        self.makespan = self.model.max(
+            [self.model.end_of(operation_var) for operation_var in self.operation_vars.values()])
+        self.model.add(self.model.minimize(self.makespan))
+
+        self.set_num_metering_intervals(num_metering_intervals)
+
+    def is_infeasible(self) -> bool:
+        """Whether the preprocessing proved that no schedule fits into the metering intervals."""
+        return any(time_window.is_empty() for time_window in self.time_windows.values())
+
+    def set_num_metering_intervals(self, num_metering_intervals: int):
+        with self.timings.measure('Preprocessing'):
+            self._set_time_windows(num_metering_intervals)
+
+        # Constraints (energy limits), the completion of the operations within the horizon is ensured by the
+        # domains.
+        if self.solver_config['WithEnergyLimits'] and not self.is_infeasible():
+            with self.timings.measure('EnergyConstraints'):
+                self._update_energy_constraints()
+
+    def _set_time_windows(self, num_metering_intervals: int):
+        instance = self.instance
+        self.num_metering_intervals = num_metering_intervals
+
+        # Preprocessing: only the operations whose time window intersects a metering interval can consume energy
+        # in it.
+        horizon = num_metering_intervals * instance.length_metering_interval \
+            if self.solver_config['WithEnergyLimits'] else None
+        self.time_windows = compute_time_windows(instance, horizon, self.solver_config['ValidStartTimes'])
+        if self.is_infeasible():
+            return
+
+        for operation, time_window in self.time_windows.items():
+            self._set_domain(operation, time_window)
+
+    def _set_domain(self, operation: Operation, time_window: TimeWindow):
+        operation_var = self.operation_vars[operation]
+        operation_var.set_start((
+            time_window.earliest_start,
+            INTERVAL_MAX if time_window.latest_start is None else time_window.latest_start))
+        operation_var.set_end((
+            time_window.earliest_completion,
+            INTERVAL_MAX if time_window.latest_completion is None else time_window.latest_completion))
+
+    def fix_start_times(self, start_times: Dict[Operation, float]):
+        """Fixes the given start times, the domains of the other operations are reset to their time windows."""
+        for operation, time_window in self.time_windows.items():
+            if operation in start_times:
+                start_time = int(round(start_times[operation]))
+                time_window = TimeWindow(
+                    start_time, start_time, start_time + operation.processing_time,
+                    start_time + operation.processing_time)
+            self._set_domain(operation, time_window)
+
+    def _get_segment_var(self, operation: Operation, metering_interval_index: int) -> CpoExpr:
+        key = (operation, metering_interval_index)
+        if key not in self.segment_vars:
+            length_metering_interval = self.instance.length_metering_interval
+            metering_interval = (metering_interval_index * length_metering_interval,
+                                 (metering_interval_index + 1) * length_metering_interval)
+            self.segment_vars[key] = self.model.interval_var(
+                start=metering_interval,
+                end=metering_interval,
+                length=(1, min(operation.processing_time, length_metering_interval)),
+                optional=True,
+                name=_segment_var_name(operation, metering_interval_index))
+        return self.segment_vars[key]
+
+    def _update_segment_constraints(self, operation: Operation, metering_interval_indices: range):
+        """The present segments of the operation must exactly cover it."""
+        if operation in self.segment_constraints:
+            previous_metering_interval_indices, constraints = self.segment_constraints[operation]
+            if previous_metering_interval_indices == metering_interval_indices:
+                return
+            for constraint in constraints:
+                self.model.remove(constraint)
+            del self.segment_constraints[operation]
+            # E.g., the horizon shrank, the segments outside of the metering intervals are not in the model anymore.
+            for metering_interval_index in previous_metering_interval_indices:
+                if metering_interval_index not in metering_interval_indices:
+                    del self.segment_vars[(operation, metering_interval_index)]
+
+        if not metering_interval_indices:
+            return
+
+        segment_vars = [self._get_segment_var(operation, metering_interval_index)
+                        for metering_interval_index in metering_interval_indices]
+        constraints = [
+            self.model.span(self.operation_vars[operation], segment_vars),
+            self.model.sum(self.model.length_of(segment_var) for segment_var in segment_vars)
+            == operation.processing_time
+        ]
+        for constraint in constraints:
+            self.model.add(constraint)
+        self.segment_constraints[operation] = (metering_interval_indices, constraints)
+
+    def _energy_consumption(self, operation: Operation, metering_interval_index: int) -> CpoExpr:
+        if self.energy_formulation == EnergyFormulation.Segments:
+            return int(round(operation.power_consumption * _ENERGY_SCALE)) * self.model.length_of(
+                self.segment_vars[(operation, metering_interval_index)])
+
+        length_metering_interval = self.instance.length_metering_interval
+        return operation.power_consumption * self.model.overlap_length(
+            self.operation_vars[operation],
+            (metering_interval_index * length_metering_interval,
+             (metering_interval_index + 1) * length_metering_interval))
+
+    def _update_energy_constraints(self):
+        instance = self.instance
+        num_metering_intervals = self.num_metering_intervals
+        metering_interval_operations = [set() for _ in range(num_metering_intervals)]
+        for operation, time_window in self.time_windows.items():
+            metering_interval_indices = overlapped_metering_intervals(
+                operation, time_window, instance.length_metering_interval, num_metering_intervals)
+            for metering_interval_index in metering_interval_indices:
+                metering_interval_operations[metering_interval_index].add(operation)
+            if self.energy_formulation == EnergyFormulation.Segments:
+                self._update_segment_constraints(operation, metering_interval_indices)
+
+        for metering_interval_index in list(self.energy_constraints.keys()):
+            operations, energy_constraint = self.energy_constraints[metering_interval_index]
+            if metering_interval_index >= num_metering_intervals \
+                    or operations != metering_interval_operations[metering_interval_index]:
+                self.model.remove(energy_constraint)
+                del self.energy_constraints[metering_interval_index]
+
+        for metering_interval_index, operations in enumerate(metering_interval_operations):
+            if not operations or metering_interval_index in self.energy_constraints:
+                continue
+
+            energy_limit = instance.energy_limit
+            if self.consumed_energies is not None:
+                energy_limit = max(0.0, energy_limit - float(self.consumed_energies[metering_interval_index]))
+            if self.energy_formulation == EnergyFormulation.Segments:
+                energy_limit = int(round(energy_limit * _ENERGY_SCALE))
+            energy_constraint = self.model.sum(
+                self._energy_consumption(operation, metering_interval_index)
+                for operation in operations) <= energy_limit
+            self.model.add(energy_constraint)
+            self.energy_constraints[metering_interval_index] = (frozenset(operations), energy_constraint)
+
+    def add_makespan_lower_bound(self, lower_bound: int):
+        """Constrains the makespan to at least the lower bound, which no schedule can beat."""
+        self.model.add(self.makespan >= lower_bound)
+
+    def set_starting_point(self, start_times: Dict[Operation, float]):
+        length_metering_interval = self.instance.length_metering_interval
+        init_vars = CpoModelSolution()
+        for operation, start_time in start_times.items():
+            start_time = int(round(start_time))
+            init_vars.add_interval_var_solution(self.operation_vars[operation], presence=True, start=start_time)
+
+            if operation in self.segment_constraints:
+                for metering_interval_index in self.segment_constraints[operation][0]:
+                    segment_start = max(start_time, metering_interval_index * length_metering_interval)
+                    segment_end = min(start_time + operation.processing_time,
+                                      (metering_interval_index + 1) * length_metering_interval)
+                    segment_var = self.segment_vars[(operation, metering_interval_index)]
+                    if segment_start < segment_end:
+                        init_vars.add_interval_var_solution(
+                            segment_var, presence=True, start=segment_start, end=segment_end)
+                    else:
+                        init_vars.add_interval_var_solution(segment_var, presence=False)
+        self.model.set_starting_point(init_vars)
+
+    def solve(
+            self,
+            time_limit: float,
+            on_solution: Optional[Callable[[CpoSolveResult], None]] = None,
+            **parameters) -> CpoSolveResult:
+        """Solves the model, `on_solution` (if given) is called with each improving solution."""
+        with self.timings.measure('Search'):
+            if on_solution is None:
+                return self.model.solve(TimeLimit=max(0.0, time_limit), **parameters)
+            solver = CpoSolver(self.model, TimeLimit=max(0.0, time_limit), **parameters)
+            try:
+                solution = solver.search_next()
+                while solution:
+                    on_solution(solution)
+                    solution = solver.search_next()
+            finally:
+                # The last solution with the final status of the search.
+                solution = solver.end_search()
+            return solution
+
+    def export(self, path: Path):
+        """Writes the model in the CPO format, with its statistics and segments next to it."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written atomically, the files may be shared by concurrent solver processes.
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        tmp_path.write_text(json.dumps({
+            'Statistics': self.statistics(),
+            'Segments': [[operation.job_index, operation.index, metering_interval_indices.start,
+                          metering_interval_indices.stop]
+                         for operation, (metering_interval_indices, _) in self.segment_constraints.items()]
+        }))
+        os.replace(str(tmp_path), str(path.with_suffix('.json')))
+        self.model.export_model(str(tmp_path), add_source_location=False)
+        os.replace(str(tmp_path), str(path))
+
+    @staticmethod
+    def load(
+            solver_config: dict,
+            instance: Instance,
+            num_metering_intervals: int,
+            path: Path,
+            timings: Optional[utils.PhaseTimings] = None) -> 'CpOverlapModel':
+        """Loads the model written by `export`, the variables are found by their names."""
+        cp_model = CpOverlapModel.__new__(CpOverlapModel)
+        exported = json.loads(path.with_suffix('.json').read_text())
+
+        cp_model.solver_config = solver_config
+        cp_model.instance = instance
+        cp_model.timings = timings if timings is not None else utils.PhaseTimings()
+        cp_model.consumed_energies = None
+        cp_model.num_metering_intervals = num_metering_intervals
+        cp_model.time_windows = dict()
+        cp_model.energy_constraints = dict()
+        cp_model.energy_formulation = EnergyFormulation.parse(
+            get_specialized_solver_config(solver_config).get('EnergyFormulation', EnergyFormulation.Overlap.name))
+        cp_model.loaded_statistics = exported['Statistics']
+
+        cp_model.model = CpoModel()
+        cp_model.model.import_model(str(path))
+        cp_model.model.set_parameters(_model_parameters(solver_config))
+        variables = {var.get_name(): var for var in cp_model.model.get_all_variables()}
+        cp_model.operation_vars = {
+            operation: variables[_operation_var_name(operation)] for operation in instance.get_operations()
+        }
+        cp_model.machine_vars = {
+            machine_index: variables['machine_' + str(machine_index)] for machine_index in range(instance.num_machines)
+        }
+
+        cp_model.segment_vars = dict()
+        cp_model.segment_constraints = dict()
+        for job_index, operation_index, start, stop in exported['Segments']:
+            operation = instance.jobs[job_index].operations[operation_index]
+            cp_model.segment_constraints[operation] = (range(start, stop), [])
+            for metering_interval_index in range(start, stop):
+                cp_model.segment_vars[(operation, metering_interval_index)] = \
+                    variables[_segment_var_name(operation, metering_interval_index)]
+
+        return cp_model
+
+    def statistics(self) -> Dict[str, int]:
+        if self.loaded_statistics is not None:
+            return dict(self.loaded_statistics)
+
+        statistics = {
+            'NumVariables': len(self.operation_vars) + self.instance.num_machines + len(self.segment_vars),
+            'NumConstraints': self.num_job_shop_constraints + len(self.energy_constraints)
+                              + sum(len(constraints) for _, constraints in self.segment_constraints.values()),
+            'NumOverlapTerms': sum(len(operations) for operations, _ in self.energy_constraints.values())
+        }
+        return statistics
+
+    def get_start_times(self, solution: CpoSolveResult) -> Dict[Operation, int]:
+        return {operation: solution.get_var_solution(operation_var).start
+                for operation, operation_var in self.operation_vars.items()}
+
+
+def report_solution(
+        on_solution: Optional[Callable[[Result], None]],
+        start_time_solver: float,
+        start_times: Dict[Operation, float],
+        lower_bound: Optional[float],
+        timings: utils.PhaseTimings):
+    if on_solution is not None:
+        on_solution(Result(
+            Status.Heuristic,
+            False,
+            timedelta(seconds=time.time() - start_time_solver),
+            start_times,
+            lower_bound,
+            timings.timings
+        ))
+
+
+def objective_lower_bound(solution: CpoSolveResult, lower_bound: Optional[int]) -> Optional[float]:
+    """The better of the bound proved by the search and the precomputed lower bound."""
+    objective_bounds = solution.get_objective_bounds()
+    solver_lower_bound = objective_bounds[0] if objective_bounds else None
+    if solver_lower_bound is None:
+        return lower_bound
+    return solver_lower_bound if lower_bound is None else max(solver_lower_bound, lower_bound)
+
+
+def compute_makespan(start_times: Dict[Operation, float]) -> int:
+    return int(round(max([start_time + operation.processing_time for operation, start_time in start_times.items()])))
+
+
+def num_metering_intervals_covering(makespan: int, length_metering_interval: int) -> int:
+    return int((makespan - 1) / length_metering_interval) + 1
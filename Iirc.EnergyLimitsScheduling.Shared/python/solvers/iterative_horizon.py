@@ -0,0 +1,115 @@
+from typing import Callable, Dict, Optional
+from datetime import timedelta
+import time
+
+from datastructs.result import Result, Status
+from datastructs.instance import Instance, Operation
+from solvers.cp_overlap_model import CpOverlapModel, report_solution, objective_lower_bound, compute_makespan, \
+    num_metering_intervals_covering
+import utils
+import cp_utils
+
+__all__ = [
+    'solve_iterative_horizon'
+]
+
+
+def solve_iterative_horizon(
+        solver_config: dict,
+        instance: Instance,
+        start_time_solver: float,
+        num_metering_intervals: int,
+        init_start_times: Optional[Dict[Operation, float]],
+        hint_start_times: Optional[Dict[Operation, float]],
+        lower_bound: Optional[int],
+        timings: utils.PhaseTimings,
+        on_solution: Optional[Callable[[Result], None]]) -> Result:
+    """Shrinks the metering intervals below the incumbent until infeasible, then minimizes the makespan in them."""
+    length_metering_interval = instance.length_metering_interval
+    time_limit = solver_config['TimeLimit'].total_seconds()
+
+    def remaining_time():
+        return time_limit - (time.time() - start_time_solver)
+
+    def result(status, time_limit_reached, lower_bound):
+        return Result(
+            status,
+            time_limit_reached,
+            timedelta(seconds=time.time() - start_time_solver),
+            incumbent if incumbent is not None else dict(),
+            lower_bound,
+            timings.timings,
+            cp_model.statistics() if cp_model is not None else None
+        )
+
+    incumbent = init_start_times if init_start_times else None
+    cp_model = None
+    # Lower bound on the makespan, improved by the infeasible iterations.
+    lower_bound = lower_bound if lower_bound is not None else 0
+
+    # Shrinking phase, each iteration asks only for the first schedule.
+    while True:
+        if incumbent is not None:
+            num_metering_intervals = num_metering_intervals_covering(
+                compute_makespan(incumbent), length_metering_interval) - 1
+
+        if num_metering_intervals <= 0 or num_metering_intervals * length_metering_interval < lower_bound:
+            break
+
+        if cp_model is None:
+            cp_model = CpOverlapModel(solver_config, instance, num_metering_intervals, timings)
+            if lower_bound > 0:
+                cp_model.add_makespan_lower_bound(lower_bound)
+        else:
+            cp_model.set_num_metering_intervals(num_metering_intervals)
+
+        if cp_model.is_infeasible():
+            lower_bound = num_metering_intervals * length_metering_interval + 1
+            break
+
+        if remaining_time() <= 0:
+            return result(Status.Heuristic if incumbent is not None else Status.NoSolution, True, lower_bound)
+
+        if incumbent is not None:
+            cp_model.set_starting_point(incumbent)
+        elif hint_start_times:
+            cp_model.set_starting_point(hint_start_times)
+        solution = cp_model.solve(remaining_time(), SolutionLimit=1)
+        status = cp_utils.get_result_status(solution)
+        if status in {Status.Heuristic, Status.Optimal}:
+            incumbent = cp_model.get_start_times(solution)
+            report_solution(on_solution, start_time_solver, incumbent, lower_bound, timings)
+        elif status == Status.Infeasible:
+            lower_bound = num_metering_intervals * length_metering_interval + 1
+            break
+        else:
+            return result(
+                Status.Heuristic if incumbent is not None else Status.NoSolution,
+                cp_utils.time_limit_reached(solution),
+                lower_bound)
+
+    if incumbent is None:
+        return result(Status.Infeasible, False, None)
+
+    # Optimization phase in the metering intervals of the incumbent.
+    makespan = compute_makespan(incumbent)
+    if makespan <= lower_bound:
+        return result(Status.Optimal, False, makespan)
+
+    cp_model.set_num_metering_intervals(num_metering_intervals_covering(makespan, length_metering_interval))
+    cp_model.set_starting_point(incumbent)
+    solution = cp_model.solve(
+        remaining_time(),
+        None if on_solution is None else lambda solution: report_solution(
+            on_solution,
+            start_time_solver,
+            cp_model.get_start_times(solution),
+            objective_lower_bound(solution, lower_bound),
+            timings))
+    status = cp_utils.get_result_status(solution)
+    if status in {Status.Heuristic, Status.Optimal}:
+        incumbent = cp_model.get_start_times(solution)
+        lower_bound = objective_lower_bound(solution, lower_bound)
+        return result(status, cp_utils.time_limit_reached(solution), lower_bound)
+
+    return result(Status.Heuristic, cp_utils.time_limit_reached(solution), lower_bound)
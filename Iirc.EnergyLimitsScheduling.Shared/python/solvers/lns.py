@@ -0,0 +1,99 @@
+from typing import Callable, Dict, Optional
+from datetime import timedelta
+import time
+
+from datastructs.result import Result, Status
+from datastructs.instance import Instance, Operation
+from algorithms.lns import NeighborhoodType, AdaptiveNeighborhoods
+from solvers.cp_overlap_model import get_specialized_solver_config, CpOverlapModel, report_solution, \
+    compute_makespan
+import utils
+import cp_utils
+
+__all__ = [
+    'solve_lns'
+]
+
+
+def solve_lns(
+        solver_config: dict,
+        instance: Instance,
+        start_time_solver: float,
+        num_metering_intervals: int,
+        init_start_times: Optional[Dict[Operation, float]],
+        hint_start_times: Optional[Dict[Operation, float]],
+        lower_bound: Optional[int],
+        timings: utils.PhaseTimings,
+        on_solution: Optional[Callable[[Result], None]]) -> Result:
+    """Improves the incumbent by solving the neighborhoods with the other operations fixed to it."""
+    specialized_solver_config = get_specialized_solver_config(solver_config)
+    iteration_time_limit = specialized_solver_config.get('LnsIterationTimeLimit', 2.0)
+    neighborhoods = AdaptiveNeighborhoods(
+        instance,
+        [NeighborhoodType.parse(neighborhood_type)
+         for neighborhood_type in specialized_solver_config.get('LnsNeighborhoods') or list(NeighborhoodType)],
+        seed=specialized_solver_config.get('LnsSeed', 0))
+    time_limit = solver_config['TimeLimit'].total_seconds()
+
+    def remaining_time():
+        return time_limit - (time.time() - start_time_solver)
+
+    def result(status, time_limit_reached):
+        if status == Status.Heuristic and lower_bound is not None and compute_makespan(incumbent) <= lower_bound:
+            status = Status.Optimal
+        return Result(
+            status,
+            time_limit_reached,
+            timedelta(seconds=time.time() - start_time_solver),
+            incumbent if incumbent is not None else dict(),
+            lower_bound,
+            timings.timings,
+            dict(cp_model.statistics(), NumLnsIterations=num_iterations, NumLnsImprovements=num_improvements)
+        )
+
+    incumbent = init_start_times if init_start_times else None
+    num_iterations = 0
+    num_improvements = 0
+    cp_model = CpOverlapModel(solver_config, instance, num_metering_intervals, timings)
+    if cp_model.is_infeasible():
+        return result(Status.Infeasible if incumbent is None else Status.Heuristic, False)
+    if lower_bound is not None and lower_bound > 0:
+        cp_model.add_makespan_lower_bound(lower_bound)
+
+    if incumbent is None:
+        if hint_start_times:
+            cp_model.set_starting_point(hint_start_times)
+        solution = cp_model.solve(remaining_time(), SolutionLimit=1)
+        status = cp_utils.get_result_status(solution)
+        if status not in {Status.Heuristic, Status.Optimal}:
+            return result(status, cp_utils.time_limit_reached(solution))
+        incumbent = cp_model.get_start_times(solution)
+        if status == Status.Optimal:
+            return result(status, False)
+        report_solution(on_solution, start_time_solver, incumbent, lower_bound, timings)
+
+    while remaining_time() > 0 and (lower_bound is None or compute_makespan(incumbent) > lower_bound):
+        neighborhood_type = neighborhoods.select()
+        free_operations = neighborhoods.free_operations(neighborhood_type, incumbent)
+        cp_model.fix_start_times({operation: start_time for operation, start_time in incumbent.items()
+                                  if operation not in free_operations})
+        cp_model.set_starting_point(incumbent)
+        solution = cp_model.solve(min(iteration_time_limit, remaining_time()))
+        num_iterations += 1
+
+        status = cp_utils.get_result_status(solution)
+        improved = False
+        if status in {Status.Heuristic, Status.Optimal}:
+            start_times = cp_model.get_start_times(solution)
+            makespan = compute_makespan(start_times)
+            improved = makespan < compute_makespan(incumbent)
+            # The moves to the schedules of the same makespan diversify the search.
+            if makespan <= compute_makespan(incumbent):
+                incumbent = start_times
+            if improved:
+                num_improvements += 1
+                report_solution(on_solution, start_time_solver, incumbent, lower_bound, timings)
+        neighborhoods.update(neighborhood_type, improved, status == Status.Optimal)
+
+    cp_model.fix_start_times(dict())
+    return result(Status.Heuristic, remaining_time() <= 0)
@@ -0,0 +1,69 @@
+from typing import Optional
+from pathlib import Path
+import hashlib
+import json
+import docplex
+
+from datastructs.instance import Instance
+from solvers.cp_overlap_model import get_specialized_solver_config, EnergyFormulation, CpOverlapModel
+from solvers.solve_cache import instance_digest
+import utils
+
+__all__ = [
+    'model_cache_path',
+    'build_model'
+]
+
+
+# Version of the exported models (the variable names and the sidecar JSON), other versions are not used.
+_MODEL_CACHE_FORMAT = 2
+
+
+def model_cache_path(
+        solver_config: dict,
+        instance: Instance,
+        num_metering_intervals: int,
+        lower_bound: Optional[int]) -> Optional[Path]:
+    """Path of the exported model in `ModelCache`, keyed by the instance contents and the formulation options."""
+    model_cache = get_specialized_solver_config(solver_config).get('ModelCache')
+    if model_cache is None:
+        return None
+
+    formulation = json.dumps({
+        'WithEnergyLimits': solver_config['WithEnergyLimits'],
+        'ValidStartTimes': solver_config['ValidStartTimes'],
+        'EnergyFormulation': EnergyFormulation.parse(
+            get_specialized_solver_config(solver_config).get(
+                'EnergyFormulation', EnergyFormulation.Overlap.name)).name,
+        'NumMeteringIntervals': num_metering_intervals,
+        'LowerBound': lower_bound,
+        # The CPO format may differ between the versions.
+        'Docplex': docplex.__version__,
+        'Format': _MODEL_CACHE_FORMAT
+    }, sort_keys=True)
+    key = hashlib.sha256((instance_digest(instance) + formulation).encode()).hexdigest()
+    return Path(model_cache) / f'{key}.cpo'
+
+
+def build_model(
+        solver_config: dict,
+        instance: Instance,
+        num_metering_intervals: int,
+        lower_bound: Optional[int],
+        timings: utils.PhaseTimings) -> CpOverlapModel:
+    """Builds the model with the makespan lower bound, loads it from `ModelCache` or exports it there."""
+    path = model_cache_path(solver_config, instance, num_metering_intervals, lower_bound)
+    if path is not None and path.exists() and path.with_suffix('.json').exists():
+        with timings.measure('ModelLoad'):
+            return CpOverlapModel.load(solver_config, instance, num_metering_intervals, path, timings)
+
+    cp_model = CpOverlapModel(solver_config, instance, num_metering_intervals, timings)
+    if cp_model.is_infeasible():
+        return cp_model
+
+    if lower_bound is not None and lower_bound > 0:
+        cp_model.add_makespan_lower_bound(lower_bound)
+    if path is not None:
+        with timings.measure('ModelExport'):
+            cp_model.export(path)
+    return cp_model
@@ -0,0 +1,181 @@
+from typing import Callable, Dict, List, Optional
+from datetime import timedelta
+import multiprocessing
+import os
+import queue
+import signal
+import time
+
+from datastructs.instance import Instance
+from datastructs.result import Result, Status
+
+__all__ = [
+    'portfolio_variant_solver_configs',
+    'solve_portfolio'
+]
+
+# (solver config, instance, start time of the solver, timings, callback of the improving results) -> result.
+SolveFn = Callable[..., Result]
+
+# Time (in seconds) given to the variants to report their results after the time limit.
+_GRACE_PERIOD = 10.0
+
+# The variants are started by spawning, forking is not safe in the threads of the worker mode.
+_CONTEXT = multiprocessing.get_context('spawn')
+
+
+def _run_variant(
+        solve: SolveFn,
+        solver_config: dict,
+        instance: Instance,
+        start_time_solver: float,
+        variant_index: int,
+        messages: multiprocessing.Queue):
+    # The variant leads a process group of its own, so that it is stopped together with its CP Optimizer processes.
+    if hasattr(os, 'setpgrp'):
+        os.setpgrp()
+
+    def on_solution(result: Result):
+        messages.put(('Solution', variant_index, result.to_dict()))
+
+    try:
+        result = solve(solver_config, instance, start_time_solver, None, on_solution)
+        messages.put(('Result', variant_index, result.to_dict()))
+    except Exception as e:
+        messages.put(('Error', variant_index, f'{type(e).__name__}: {e}'))
+
+
+def _stop_variant(process: multiprocessing.Process):
+    """Kills the variant and the processes it started (e.g., CP Optimizer), which survive its termination."""
+    if hasattr(os, 'killpg'):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+            return
+        except ProcessLookupError:
+            # The variant did not create its process group yet, so it did not start any process either.
+            pass
+    process.kill()
+
+
+def _is_proven(best: Optional[Result], lower_bound: Optional[float]) -> bool:
+    if best is None:
+        return False
+    return best.status == Status.Optimal or (lower_bound is not None and best.makespan() <= lower_bound + 1e-6)
+
+
+def portfolio_variant_solver_configs(solver_config: dict) -> List[dict]:
+    """Variants override the specialized solver config, the workers are split evenly unless a variant sets them."""
+    specialized_solver_config = solver_config.get('SpecializedSolverConfig') or dict()
+    variants = specialized_solver_config['Portfolio']
+    num_workers = solver_config['NumWorkers'] if solver_config['NumWorkers'] > 0 else os.cpu_count()
+
+    variant_solver_configs = []
+    for variant in variants:
+        variant = dict(variant)
+        variant_solver_config = dict(solver_config)
+        variant_solver_config['NumWorkers'] = variant.pop('NumWorkers', max(1, num_workers // len(variants)))
+        variant_solver_config['SpecializedSolverConfig'] = {
+            **{key: value for key, value in specialized_solver_config.items() if key != 'Portfolio'},
+            **variant
+        }
+        variant_solver_configs.append(variant_solver_config)
+    return variant_solver_configs
+
+
+def solve_portfolio(
+        solve: SolveFn,
+        variant_solver_configs: List[dict],
+        instance: Instance,
+        start_time_solver: float,
+        on_solution: Optional[Callable[[Result], None]] = None) -> Result:
+    """Solves by the variants in spawned processes (`solve` must be module-level), stops them once the bound is met."""
+    messages = _CONTEXT.Queue()
+    processes = [
+        _CONTEXT.Process(
+            target=_run_variant,
+            args=(solve, variant_solver_config, instance, start_time_solver, variant_index, messages),
+            daemon=True)
+        for variant_index, variant_solver_config in enumerate(variant_solver_configs)
+    ]
+    for process in processes:
+        process.start()
+
+    time_limit = max(variant_solver_config['TimeLimit'].total_seconds()
+                     for variant_solver_config in variant_solver_configs)
+    best: Optional[Result] = None
+    lower_bound: Optional[float] = None
+    infeasible = False
+    time_limit_reached = False
+    num_running = len(processes)
+    errors: Dict[int, str] = dict()
+    try:
+        while num_running > 0 and not infeasible and not _is_proven(best, lower_bound):
+            remaining_time = time_limit + _GRACE_PERIOD - (time.time() - start_time_solver)
+            try:
+                kind, variant_index, payload = messages.get(timeout=max(0.0, remaining_time))
+            except queue.Empty:
+                time_limit_reached = True
+                break
+
+            if kind == 'Error':
+                errors[variant_index] = payload
+                num_running -= 1
+                continue
+
+            result = Result.from_dict(payload, instance)
+            if kind == 'Result':
+                num_running -= 1
+                time_limit_reached = time_limit_reached or result.time_limit_reached
+                if result.status == Status.Infeasible:
+                    infeasible = True
+                elif result.status == Status.Optimal:
+                    # The optimal makespan of a variant is the optimal makespan of the instance.
+                    result.lower_bound = result.makespan()
+
+            if result.lower_bound is not None and (lower_bound is None or result.lower_bound > lower_bound):
+                lower_bound = result.lower_bound
+
+            if result.status in {Status.Optimal, Status.Heuristic} and result.start_times:
+                improved = best is None or result.makespan() < best.makespan()
+                if improved or (result.makespan() == best.makespan() and result.status == Status.Optimal):
+                    best = result
+                    if improved and on_solution is not None:
+                        on_solution(Result(
+                            Status.Heuristic,
+                            False,
+                            timedelta(seconds=time.time() - start_time_solver),
+                            best.start_times,
+                            lower_bound,
+                            best.timings))
+    finally:
+        for process in processes:
+            if process.is_alive():
+                _stop_variant(process)
+        for process in processes:
+            process.join()
+
+    if errors and best is None and not infeasible:
+        raise RuntimeError('All portfolio variants failed: ' + '; '.join(
+            f'variant {variant_index}: {error}' for variant_index, error in sorted(errors.items())))
+
+    running_time = timedelta(seconds=time.time() - start_time_solver)
+    if infeasible:
+        return Result(Status.Infeasible, False, running_time, dict(), None)
+    if best is None:
+        return Result(Status.NoSolution, time_limit_reached, running_time, dict(), lower_bound)
+
+    if _is_proven(best, lower_bound):
+        status = Status.Optimal
+        time_limit_reached = False
+        lower_bound = best.makespan() if best.status == Status.Optimal else lower_bound
+    else:
+        status = Status.Heuristic
+
+    return Result(
+        status,
+        time_limit_reached,
+        running_time,
+        best.start_times,
+        lower_bound,
+        best.timings,
+        best.model_statistics)
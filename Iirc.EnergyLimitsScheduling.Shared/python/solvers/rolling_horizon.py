@@ -0,0 +1,122 @@
+from typing import Dict, Optional
+from datetime import timedelta
+import time
+
+from datastructs.result import Result, Status
+from datastructs.instance import Instance, Operation
+from algorithms.time_windows import compute_time_windows
+from algorithms.rolling_horizon import build_subproblem
+from solvers.cp_overlap_model import get_specialized_solver_config, CpOverlapModel, compute_makespan
+import utils
+import cp_utils
+
+__all__ = [
+    'solve_rolling_horizon'
+]
+
+
+def solve_rolling_horizon(
+        solver_config: dict,
+        instance: Instance,
+        start_time_solver: float,
+        init_start_times: Optional[Dict[Operation, float]],
+        hint_start_times: Optional[Dict[Operation, float]],
+        lower_bound: Optional[int],
+        timings: utils.PhaseTimings) -> Result:
+    """Solves the instance window by window, fixing the operations that complete before each committed time."""
+    specialized_solver_config = get_specialized_solver_config(solver_config)
+    length_metering_interval = instance.length_metering_interval
+    window = max(1, specialized_solver_config.get('RollingHorizonWindow', 8))
+    overlap = specialized_solver_config.get('RollingHorizonOverlap', 2)
+    window_length = window * length_metering_interval
+    commit_length = max(1, window - overlap) * length_metering_interval
+    time_limit = solver_config['TimeLimit'].total_seconds()
+    # The warm start is feasible, it is reported if the windows do not find a better schedule.
+    feasible_warm_start = init_start_times if init_start_times else None
+
+    def result(status, start_times, time_limit_reached):
+        if feasible_warm_start is not None \
+                and (not start_times or compute_makespan(feasible_warm_start) < compute_makespan(start_times)):
+            status = Status.Heuristic
+            start_times = feasible_warm_start
+        if start_times and lower_bound is not None and compute_makespan(start_times) <= lower_bound:
+            status = Status.Optimal
+        return Result(
+            status,
+            time_limit_reached,
+            timedelta(seconds=time.time() - start_time_solver),
+            start_times,
+            lower_bound,
+            timings.timings,
+            dict(model_statistics, NumWindows=num_windows)
+        )
+
+    # The hint start times may be incomplete, the heads of the operations are used for the missing ones.
+    guide = {operation: time_window.earliest_start
+             for operation, time_window in compute_time_windows(
+                 instance, None, solver_config['ValidStartTimes']).items()}
+    guide.update(init_start_times if init_start_times else hint_start_times or dict())
+    guide_makespan = compute_makespan(guide)
+
+    operations = list(instance.get_operations())
+    fixed_start_times: Dict[Operation, float] = dict()
+    # Start times of the last subproblem, the not fixed ones are the starting point of the next subproblem.
+    start_times: Dict[Operation, float] = dict()
+    committed_time = 0
+    num_windows = 0
+    # The largest subproblem.
+    model_statistics = dict()
+    time_limit_reached = False
+    while len(fixed_start_times) < len(operations):
+        included_operations = {operation for operation in operations
+                               if operation not in fixed_start_times
+                               and guide[operation] < committed_time + window_length}
+        if not included_operations:
+            committed_time += commit_length
+            continue
+
+        is_last = len(fixed_start_times) + len(included_operations) == len(operations)
+        num_remaining_windows = 1 if is_last else -(-(guide_makespan - committed_time) // commit_length)
+
+        # The subproblem ends with its window (or the last guide completion of its operations), the whole horizon is
+        # used only if no schedule fits into it.
+        window_end = max(committed_time + window_length,
+                         max(guide[operation] + operation.processing_time for operation in included_operations))
+        window_horizon = -(-window_end // length_metering_interval) * length_metering_interval
+        status = Status.Infeasible
+        num_windows += 1
+        for horizon in sorted({min(window_horizon, instance.horizon), instance.horizon}):
+            with timings.measure('Preprocessing'):
+                subproblem = build_subproblem(
+                    instance, fixed_start_times, included_operations, solver_config['ValidStartTimes'],
+                    solver_config['WithEnergyLimits'], horizon)
+            cp_model = CpOverlapModel(
+                dict(solver_config, ValidStartTimes=subproblem.valid_start_times, InitStartTimes=None),
+                subproblem.instance,
+                subproblem.instance.num_metering_intervals,
+                timings,
+                subproblem.consumed_energies if solver_config['WithEnergyLimits'] else None)
+            for name, value in cp_model.statistics().items():
+                model_statistics[name] = max(model_statistics.get(name, 0), value)
+            if cp_model.is_infeasible():
+                continue
+
+            starting_point = subproblem.from_original_start_times(start_times)
+            if starting_point:
+                cp_model.set_starting_point(starting_point)
+            remaining_time = time_limit - (time.time() - start_time_solver)
+            solution = cp_model.solve(remaining_time / max(1, num_remaining_windows))
+            time_limit_reached = time_limit_reached or cp_utils.time_limit_reached(solution)
+            status = cp_utils.get_result_status(solution)
+            if status != Status.Infeasible:
+                break
+        if status not in {Status.Heuristic, Status.Optimal}:
+            return result(Status.NoSolution, dict(), time_limit_reached)
+
+        start_times = subproblem.to_original_start_times(cp_model.get_start_times(solution))
+        committed_time += commit_length
+        for operation, start_time in start_times.items():
+            if is_last or start_time + operation.processing_time <= committed_time:
+                fixed_start_times[operation] = start_time
+
+    return result(Status.Heuristic, fixed_start_times, time_limit_reached)
@@ -0,0 +1,161 @@
+from typing import Optional
+from pathlib import Path
+import hashlib
+import json
+import os
+
+from datastructs.instance import Instance
+from datastructs.result import Result, Status
+
+__all__ = [
+    'DEFAULT_MAX_SIZE',
+    'instance_digest',
+    'CachedResult',
+    'SolveCache'
+]
+
+# Default bound of the total size of the cache files (in bytes).
+DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+
+# Keys of the specialized solver config that do not change the solved problem nor the solver behavior.
+_IGNORED_SPECIALIZED_KEYS = frozenset(['SolveCache', 'SolveCacheMaxSize', 'CheckFeasibility', 'ModelCache'])
+
+
+def instance_digest(instance: Instance) -> str:
+    """Hash of the instance contents, the ids of the jobs and operations and the metadata are ignored."""
+    digest = hashlib.sha256()
+    digest.update(json.dumps([
+        instance.num_machines,
+        instance.energy_limit,
+        instance.horizon,
+        instance.length_metering_interval
+    ]).encode())
+    for job in instance.jobs:
+        digest.update(json.dumps([
+            [operation.machine_index, operation.processing_time, operation.power_consumption]
+            for operation in job.operations
+        ]).encode())
+    return digest.hexdigest()
+
+
+def _num_workers(solver_config: dict) -> int:
+    return solver_config['NumWorkers'] if solver_config['NumWorkers'] > 0 else os.cpu_count()
+
+
+class CachedResult:
+    """Result of a previous solve of the same problem with the budget (time limit in seconds, workers) it got."""
+
+    __slots__ = [
+        'result',
+        'time_limit',
+        'num_workers'
+    ]
+
+    def __init__(self, result: Result, time_limit: float, num_workers: int):
+        self.result = result
+        self.time_limit = time_limit
+        self.num_workers = num_workers
+
+    def is_proven(self) -> bool:
+        """Whether the result cannot be improved by a larger budget."""
+        return self.result.status in {Status.Optimal, Status.Infeasible}
+
+    def covers(self, solver_config: dict) -> bool:
+        """Whether the budget of the solver config is not larger than the one of the result."""
+        return solver_config['TimeLimit'].total_seconds() <= self.time_limit \
+            and _num_workers(solver_config) <= self.num_workers
+
+
+class SolveCache:
+    """Results of the solver in a directory, keyed by the hash of the instance contents and the solver config.
+
+    The time limit and the number of workers are not part of the key but stored with the result, so that a result
+    limited by a smaller budget can be found (and used as a warm start). Each entry is a JSON file replaced
+    atomically, so the cache can be shared by concurrent solver processes. The least recently used entries are
+    evicted when the total size of the files exceeds `max_size` (in bytes).
+    """
+
+    def __init__(self, path: Path, max_size: int = DEFAULT_MAX_SIZE):
+        self.path = path
+        self.max_size = max_size
+
+    @staticmethod
+    def key(solver_config: dict, instance: Instance) -> str:
+        specialized_solver_config = solver_config.get('SpecializedSolverConfig')
+        specialized_solver_config = {
+            name: value
+            for name, value in (specialized_solver_config if specialized_solver_config is not None else dict()).items()
+            if name not in _IGNORED_SPECIALIZED_KEYS
+        }
+        config = json.dumps({
+            'WithEnergyLimits': solver_config['WithEnergyLimits'],
+            'ContinuousStartTimes': solver_config.get('ContinuousStartTimes', False),
+            'InitStartTimes': solver_config['InitStartTimes'] if solver_config['InitStartTimes'] else None,
+            'FixedOrder': solver_config.get('FixedOrder'),
+            'ValidStartTimes': solver_config['ValidStartTimes'],
+            'SpecializedSolverConfig': specialized_solver_config
+        }, sort_keys=True)
+        return hashlib.sha256((instance_digest(instance) + config).encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / f'{key}.json'
+
+    def get(self, key: str, instance: Instance) -> Optional[CachedResult]:
+        entry_path = self._entry_path(key)
+        try:
+            entry = json.loads(entry_path.read_text())
+            # The access time is not reliably updated by the file systems, the modification time orders the eviction.
+            os.utime(str(entry_path))
+        except (OSError, ValueError):
+            return None
+
+        return CachedResult(Result.from_dict(entry['Result'], instance), entry['TimeLimit'], entry['NumWorkers'])
+
+    def put(self, key: str, solver_config: dict, result: Result):
+        """Stores the result unless the cached one is proven or was given a larger budget."""
+        if result.status not in {Status.Optimal, Status.Infeasible, Status.Heuristic}:
+            return
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        entry_path = self._entry_path(key)
+        try:
+            entry = json.loads(entry_path.read_text())
+            cached_status = Status(entry['Result']['Status'])
+            # A heuristic result replaces only the one found with at most the same budget (see `covers`).
+            if cached_status in {Status.Optimal, Status.Infeasible} \
+                    or (result.status == Status.Heuristic
+                        and not (entry['TimeLimit'] <= solver_config['TimeLimit'].total_seconds()
+                                 and entry['NumWorkers'] <= _num_workers(solver_config))):
+                return
+        except (OSError, ValueError):
+            pass
+
+        tmp_entry_path = entry_path.with_name(f'{entry_path.name}.{os.getpid()}.tmp')
+        tmp_entry_path.write_text(json.dumps({
+            'TimeLimit': solver_config['TimeLimit'].total_seconds(),
+            'NumWorkers': _num_workers(solver_config),
+            'Result': result.to_dict()
+        }))
+        os.replace(str(tmp_entry_path), str(entry_path))
+
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for entry_path in self.path.glob('*.json'):
+            try:
+                stat = entry_path.stat()
+            except OSError:
+                # Evicted by a concurrent process.
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, entry_path in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                entry_path.unlink()
+            except OSError:
+                pass
+            size -= entry_size
@@ -0,0 +1,156 @@
+from typing import Callable, Dict, TextIO, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import threading
+import socketserver
+import json
+import time
+import os
+import sys
+
+from datastructs.instance import Instance
+from datastructs.result import Result
+
+__all__ = [
+    'Worker'
+]
+
+SolveFn = Callable[[Dict[str, object], Instance, float], Result]
+
+
+class _CpuBudget:
+    """Hands out CPUs to the solve requests in the order of their arrival."""
+
+    def __init__(self, num_cpus: int):
+        self.num_cpus = num_cpus
+        self.available = num_cpus
+        self.next_ticket = 0
+        self.serving_ticket = 0
+        self.condition = threading.Condition()
+
+    def acquire(self, num_cpus: int) -> int:
+        num_cpus = min(max(1, num_cpus), self.num_cpus)
+        with self.condition:
+            ticket = self.next_ticket
+            self.next_ticket += 1
+            self.condition.wait_for(lambda: self.serving_ticket == ticket and self.available >= num_cpus)
+            self.serving_ticket += 1
+            self.available -= num_cpus
+            self.condition.notify_all()
+        return num_cpus
+
+    def release(self, num_cpus: int):
+        with self.condition:
+            self.available += num_cpus
+            self.condition.notify_all()
+
+
+class Worker:
+    """Long-lived solver process answering solve requests.
+
+    The requests and the responses are JSON objects, one per line. A request contains `Id` (echoed back in the
+    response), `SolverConfig` (the same content as the solver config file) and either `Instance` (the instance
+    JSON object) or `InstancePath`. If `ResultPath` is given, the result is also written there. The response
+    contains either `Result` (the same content as the result file) or `Error`.
+
+    A request occupies `NumWorkers` CPUs of the budget (all of them if `NumWorkers` is not positive), the
+    requests are started in the order of arrival as soon as enough CPUs are free.
+    """
+
+    def __init__(self, solve: SolveFn, num_cpus: Optional[int] = None):
+        self.solve = solve
+        self.num_cpus = num_cpus if num_cpus is not None and num_cpus > 0 else os.cpu_count()
+        self.cpu_budget = _CpuBudget(self.num_cpus)
+        self.executor = ThreadPoolExecutor(max_workers=self.num_cpus)
+
+    def handle(self, request: Dict[str, object]) -> Dict[str, object]:
+        response = {'Id': request.get('Id')}
+        try:
+            if request.get('Instance') is not None:
+                instance = Instance.from_dict(request['Instance'])
+            else:
+                instance = Instance.from_json(Path(request['InstancePath']).read_text())
+
+            num_workers = request['SolverConfig'].get('NumWorkers', 0)
+            num_cpus = self.cpu_budget.acquire(num_workers if num_workers > 0 else self.num_cpus)
+            try:
+                result = self.solve(request['SolverConfig'], instance, time.time())
+            finally:
+                self.cpu_budget.release(num_cpus)
+
+            if request.get('ResultPath') is not None:
+                Path(request['ResultPath']).write_text(result.to_json())
+
+            response['Result'] = result.to_dict()
+        except Exception as e:
+            response['Error'] = f'{type(e).__name__}: {e}'
+
+        return response
+
+    def serve_stream(self, input: TextIO, output: TextIO):
+        output_lock = threading.Lock()
+
+        def respond(request: Dict[str, object]):
+            response = json.dumps(self.handle(request))
+            with output_lock:
+                output.write(response + '\n')
+                output.flush()
+
+        futures = []
+        for line in input:
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                with output_lock:
+                    output.write(json.dumps({'Id': None, 'Error': f'Invalid request: {e}'}) + '\n')
+                    output.flush()
+                continue
+
+            futures.append(self.executor.submit(respond, request))
+
+        for future in futures:
+            future.result()
+
+    def serve_stdio(self):
+        """Serves the standard input, the responses own the standard output, other writes to it go to stderr."""
+        # Redirected on the file descriptor level, so that also the solver subprocesses do not corrupt the responses.
+        sys.stdout.flush()
+        output = os.fdopen(os.dup(sys.stdout.fileno()), 'w')
+        os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+        with output:
+            self.serve_stream(sys.stdin, output)
+
+    def serve_socket(self, socket_path: Path):
+        worker = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                worker.serve_stream(
+                    (line.decode('utf-8') for line in self.rfile),
+                    _SocketWriter(self.wfile))
+
+        if socket_path.exists():
+            socket_path.unlink()
+
+        with socketserver.ThreadingUnixStreamServer(str(socket_path), Handler) as server:
+            server.daemon_threads = True
+            try:
+                server.serve_forever()
+            finally:
+                socket_path.unlink()
+
+
+class _SocketWriter:
+
+    def __init__(self, wfile):
+        self.wfile = wfile
+
+    def write(self, s: str):
+        self.wfile.write(s.encode('utf-8'))
+
+    def flush(self):
+        self.wfile.flush()
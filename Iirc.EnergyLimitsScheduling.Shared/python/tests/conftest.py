@@ -0,0 +1,55 @@
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# The modules are imported relative to the python directory, as by the scripts (PYTHONPATH set by `PythonScript`).
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from datastructs.instance import Instance
+from benchmarks.instance_generator import generate_instance
+
+
+@pytest.fixture
+def make_raw_instance():
+    """Returns a factory of the random instances in the JSON format (see `generate_instance`), the same seed gives
+    the same instance."""
+    def make(seed: int, num_jobs: int = 6, num_operations_per_job: int = 3, num_machines: int = 3) -> dict:
+        return generate_instance(random.Random(seed), num_jobs, num_operations_per_job, num_machines, 0.5, 0.5, 0)
+    return make
+
+
+@pytest.fixture
+def make_instance(make_raw_instance):
+    """Returns a factory of the random instances, see `make_raw_instance`."""
+    def make(seed: int, num_jobs: int = 6, num_operations_per_job: int = 3, num_machines: int = 3) -> Instance:
+        raw = make_raw_instance(seed, num_jobs, num_operations_per_job, num_machines)
+        return Instance.from_json(json.dumps(raw), f'instance_{seed}.json')
+    return make
+
+
+@pytest.fixture
+def shift_ids():
+    """Returns a function shifting the ids of the jobs and operations of a raw instance (in place)."""
+    def shift(raw: dict, offset: int) -> dict:
+        for job in raw['Jobs']:
+            job['Id'] += offset
+            for operation in job['Operations']:
+                operation['Id'] += offset
+        return raw
+    return shift
+
+
+@pytest.fixture(scope='session')
+def cp_optimizer():
+    """Skips the test if CP Optimizer (the solver executable of docplex) is not available."""
+    docplex_model = pytest.importorskip('docplex.cp.model')
+    from docplex.cp.utils import CpoException
+    model = docplex_model.CpoModel()
+    model.add(model.interval_var(length=1))
+    try:
+        model.solve(TimeLimit=1, log_output=None)
+    except CpoException as exception:
+        pytest.skip(f'CP Optimizer is not available: {exception}')
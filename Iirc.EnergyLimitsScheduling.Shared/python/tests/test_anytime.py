@@ -0,0 +1,52 @@
+from datetime import timedelta
+import json
+
+from datastructs.result import Result, Status
+from solvers.anytime import AnytimeResultWriter
+
+
+def _shifted_result(instance, shift, running_time=1):
+    """Schedules the operations one after another from `shift`."""
+    start_times = dict()
+    time_available = shift
+    for operation in instance.get_operations():
+        start_times[operation] = time_available
+        time_available += operation.processing_time
+    return Result(Status.Heuristic, False, timedelta(seconds=running_time), start_times, 5.0)
+
+
+def test_keeps_best_result(tmp_path, make_instance):
+    instance = make_instance(0)
+    result_path = tmp_path / 'result.json'
+    progress_log_path = tmp_path / 'progress.jsonl'
+    writer = AnytimeResultWriter(result_path, progress_log_path)
+
+    writer(Result(Status.NoSolution, False, timedelta(seconds=0), None, None))
+    assert not result_path.exists()
+
+    for running_time, shift in enumerate([20, 10, 15, 10, 0]):
+        writer(_shifted_result(instance, shift, running_time))
+        # The file is complete after every write and is readable as a result.
+        assert Result.from_json(result_path.read_text(), instance).makespan() == writer.best_makespan
+    assert writer.best_makespan == _shifted_result(instance, 0).makespan()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['progress.jsonl', 'result.json']
+
+    progress = [json.loads(line) for line in progress_log_path.read_text().splitlines()]
+    assert [d['RunningTime'] for d in progress] == [0, 1, 4]
+    assert [d['Makespan'] for d in progress] == [_shifted_result(instance, shift).makespan() for shift in [20, 10, 0]]
+    assert all(d['LowerBound'] == 5.0 for d in progress)
+    assert json.loads(result_path.read_text())['Timestamp'] == progress[-1]['Timestamp']
+
+
+def test_final_write(tmp_path, make_instance):
+    instance = make_instance(0)
+    result_path = tmp_path / 'result.json'
+    writer = AnytimeResultWriter(result_path)
+    writer(_shifted_result(instance, 0))
+
+    # The final result replaces the best one, even if it has no schedule.
+    writer.write(Result(Status.NoSolution, True, timedelta(seconds=3), None, 7.0))
+    result = Result.from_json(result_path.read_text(), instance)
+    assert result.status == Status.NoSolution
+    assert result.lower_bound == 7.0
+    assert [path.name for path in tmp_path.iterdir()] == ['result.json']
@@ -0,0 +1,78 @@
+from datetime import timedelta
+import json
+import math
+
+import numpy as np
+
+from datastructs.arrays import ArrayInstance, ArrayResult
+from datastructs.instance import Instance
+from datastructs.result import Result, Status
+from algorithms.energy_consumption import operation_arrays
+
+
+def _assert_same_instances(array_instance, instance):
+    assert array_instance.num_operations == len(list(instance.get_operations()))
+    assert array_instance.energy_limit == instance.energy_limit
+    assert array_instance.horizon == instance.horizon
+    assert array_instance.num_metering_intervals == instance.num_metering_intervals
+    assert array_instance.metadata == instance.metadata
+    assert array_instance.instance_filename == instance.instance_filename
+    assert [job.id for job in array_instance.jobs] == [job.id for job in instance.jobs]
+    for array_operation, operation in zip(array_instance.get_operations(), instance.get_operations()):
+        assert (array_operation.id, array_operation.index, array_operation.job_index, array_operation.machine_index,
+                array_operation.processing_time, array_operation.power_consumption) \
+            == (operation.id, operation.index, operation.job_index, operation.machine_index,
+                operation.processing_time, operation.power_consumption)
+
+
+def test_instance(make_raw_instance):
+    raw = make_raw_instance(0)
+    instance = Instance.from_dict(raw, 'instance.json')
+
+    _assert_same_instances(ArrayInstance.from_dict(raw, 'instance.json'), instance)
+    _assert_same_instances(ArrayInstance.from_json(json.dumps(raw), 'instance.json'), instance)
+    array_instance = ArrayInstance.from_instance(instance)
+    _assert_same_instances(array_instance, instance)
+    assert array_instance.get_operation(2, 1).id == instance.get_operation(2, 1).id
+
+    # The views are interchangeable with the operations, e.g., as dict keys.
+    operations = {operation: operation.id for operation in instance.get_operations()}
+    assert all(operations[operation] == operation.id for operation in array_instance.get_operations())
+
+    for array, expected in zip(operation_arrays(array_instance), operation_arrays(instance)):
+        assert np.array_equal(array, expected)
+
+
+def test_result(make_instance):
+    instance = make_instance(0)
+    array_instance = ArrayInstance.from_instance(instance)
+    operations = list(instance.get_operations())
+    # Every other operation has a start time.
+    start_times = {operation: float(10 * position) for position, operation in enumerate(operations[::2])}
+    result = Result(Status.Heuristic, True, timedelta(seconds=1.5), start_times, 42.0)
+
+    array_result = ArrayResult.from_result(result, array_instance)
+    assert np.count_nonzero(~np.isnan(array_result.start_times_array)) == len(start_times)
+    assert array_result.makespan() == result.makespan()
+    assert {operation.id: start_time for operation, start_time in array_result.start_times.items()} \
+        == {operation.id: start_time for operation, start_time in start_times.items()}
+    assert array_result.to_dict() == result.to_dict()
+
+    array_result = ArrayResult.from_json(result.to_json(), array_instance)
+    assert np.array_equal(array_result.start_times_array, ArrayResult.from_result(result, array_instance)
+                          .start_times_array, equal_nan=True)
+    assert Result.from_json(array_result.to_json(), instance).to_dict() == result.to_dict()
+
+
+def test_result_without_start_times(make_instance):
+    array_instance = ArrayInstance.from_instance(make_instance(0))
+    result = Result(Status.NoSolution, True, timedelta(seconds=1), None, None)
+    for array_result in [ArrayResult.from_result(result, array_instance),
+                         ArrayResult.from_json(result.to_json(), array_instance)]:
+        assert array_result.start_times is None
+        assert array_result.makespan() is None
+
+    array_result = ArrayResult.from_dict(dict(result.to_dict(), StartTimes=[]), array_instance)
+    assert array_result.start_times == dict()
+    assert array_result.makespan() is None
+    assert all(math.isnan(start_time) for start_time in array_result.start_times_array)
@@ -0,0 +1,43 @@
+import pytest
+
+from datastructs.instance import Instance, Job, Operation
+from algorithms.bounds import compute_lower_bound, energy_bound, find_unschedulable_operations, \
+    min_num_metering_intervals
+from algorithms.greedy_earliest_start_time import CannotScheduleException, GreedyEarliestStartTime, PriorityRule
+
+
+def _single_operation_jobs(operations, num_machines, energy_limit, length_metering_interval):
+    """Instance of single operation jobs given by (machine index, processing time, power consumption)."""
+    jobs = [
+        Job(index, index, [Operation(index, 0, index, machine_index, processing_time, power_consumption)])
+        for index, (machine_index, processing_time, power_consumption) in enumerate(operations)
+    ]
+    return Instance(num_machines, jobs, energy_limit, 10 * length_metering_interval, length_metering_interval)
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('with_energy_limits', [False, True])
+def test_lower_bound_of_greedy_schedule(make_instance, seed, with_energy_limits):
+    instance = make_instance(seed)
+    try:
+        start_times = GreedyEarliestStartTime(instance, with_energy_limits).schedule(PriorityRule.EarliestStartTime)
+    except CannotScheduleException:
+        pytest.skip('The greedy heuristic cannot schedule the instance within its horizon.')
+
+    makespan = max(start_time + operation.processing_time for operation, start_time in start_times.items())
+    assert compute_lower_bound(instance, with_energy_limits) <= makespan
+
+
+def test_energy_limited_bound():
+    # Two operations, each consuming the whole energy limit of a metering interval, the optimal makespan is 20.
+    instance = _single_operation_jobs([(0, 10, 1.0), (1, 10, 1.0)], 2, 10.0, 10)
+    assert compute_lower_bound(instance, False) == 10
+    assert min_num_metering_intervals(instance) == 2
+    assert energy_bound(instance) == 11
+    assert 11 <= compute_lower_bound(instance) <= 20
+
+
+def test_find_unschedulable_operations():
+    instance = _single_operation_jobs([(0, 10, 1.0), (0, 4, 6.0), (0, 5, 3.0), (0, 30, 1.1)], 1, 10.0, 10)
+    # Half of the 4 units of the second operation consume 12 in a metering interval, the last operation covers one.
+    assert [operation.id for operation in find_unschedulable_operations(instance)] == [1, 3]
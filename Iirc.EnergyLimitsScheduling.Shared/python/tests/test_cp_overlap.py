@@ -0,0 +1,101 @@
+from datetime import timedelta
+import re
+import time
+
+import pytest
+
+pytest.importorskip('docplex')
+
+from docplex.cp.cpo.cpo_compiler import CpoCompiler
+
+from datastructs.result import Result, Status
+from solvers import cp_overlap
+from solvers.cp_overlap_model import CpOverlapModel
+
+
+def _solver_config(**specialized_solver_config) -> dict:
+    return {
+        'TimeLimit': timedelta(seconds=10),
+        'NumWorkers': 1,
+        'WithEnergyLimits': True,
+        'InitStartTimes': None,
+        'ValidStartTimes': None,
+        'SpecializedSolverConfig': specialized_solver_config
+    }
+
+
+class _ModelBuilt(Exception):
+    pass
+
+
+def test_infeasible_warm_start_at_lower_bound_is_not_optimal(monkeypatch, make_instance):
+    instance = make_instance(0)
+    # All the operations at time zero, the makespan is at most any lower bound but the jobs overlap.
+    monkeypatch.setattr(
+        cp_overlap, '_greedy_warm_start',
+        lambda solver_config, instance: {operation: 0 for operation in instance.get_operations()})
+
+    def build_model(*args):
+        raise _ModelBuilt()
+    monkeypatch.setattr(cp_overlap, 'build_model', build_model)
+
+    # The model is built (for the search) instead of returning the warm start as optimal.
+    with pytest.raises(_ModelBuilt):
+        cp_overlap.solve(_solver_config(), instance, time.time())
+
+
+def test_infeasible_checked_schedule_is_no_solution(monkeypatch, make_instance):
+    instance = make_instance(0)
+    monkeypatch.setattr(
+        cp_overlap, '_solve',
+        lambda solver_config, instance, start_time_solver, timings, on_solution: Result(
+            Status.Heuristic, True, timedelta(seconds=1), {operation: 0 for operation in instance.get_operations()},
+            10))
+
+    result = cp_overlap.solve(_solver_config(CheckFeasibility=True), instance, time.time())
+    assert result.status == Status.NoSolution
+    assert result.start_times == dict()
+    assert result.time_limit_reached and result.lower_bound == 10
+    assert 'FeasibilityCheck' in result.timings
+
+
+def test_segments_shrinking_horizon(make_instance):
+    instance = make_instance(0)
+    cp_model = CpOverlapModel(_solver_config(EnergyFormulation='Segments'), instance, instance.num_metering_intervals)
+    num_segment_vars = len(cp_model.segment_vars)
+
+    cp_model.set_num_metering_intervals(instance.num_metering_intervals // 2)
+    assert not cp_model.is_infeasible()
+    # Only the segments within the metering intervals of the operations are kept.
+    assert set(cp_model.segment_vars) == {
+        (operation, metering_interval_index)
+        for operation, (metering_interval_indices, _) in cp_model.segment_constraints.items()
+        for metering_interval_index in metering_interval_indices
+    }
+    assert all(metering_interval_index < instance.num_metering_intervals // 2
+               for _, metering_interval_index in cp_model.segment_vars)
+    assert len(cp_model.segment_vars) < num_segment_vars
+    assert cp_model.statistics()['NumVariables'] \
+        == len(cp_model.operation_vars) + instance.num_machines + len(cp_model.segment_vars)
+
+
+def test_segments_integer_energy_constraints(make_instance):
+    instance = make_instance(0)
+    cp_model = CpOverlapModel(_solver_config(EnergyFormulation='Segments'), instance, instance.num_metering_intervals)
+    cpo = CpoCompiler(cp_model.model).get_as_string()
+
+    energy_constraints = [line for line in cpo.splitlines() if 'lengthOf' in line and '<=' in line]
+    assert len(energy_constraints) == len(cp_model.energy_constraints)
+    assert not any(re.search(r'\d\.\d', line) for line in energy_constraints)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_segments_same_makespan_as_overlap(make_instance, cp_optimizer, seed):
+    instance = make_instance(seed)
+    results = [
+        cp_overlap.solve(_solver_config(EnergyFormulation=energy_formulation), instance, time.time())
+        for energy_formulation in ['Overlap', 'Segments']
+    ]
+    assert results[0].status == results[1].status
+    if results[0].status == Status.Optimal:
+        assert results[0].makespan() == results[1].makespan()
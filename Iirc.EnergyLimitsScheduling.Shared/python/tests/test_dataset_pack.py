@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from datastructs.arrays import ArrayInstance
+from datastructs.dataset_pack import DatasetPack, write_dataset_pack
+
+
+def test_round_trip(tmp_path, make_raw_instance):
+    instances = [
+        ArrayInstance.from_dict(make_raw_instance(seed, num_jobs=seed + 1), f'instance_{seed}.json')
+        for seed in range(4)
+    ]
+    pack_path = tmp_path / 'dataset.pack'
+    write_dataset_pack(instances, pack_path)
+
+    pack = DatasetPack(pack_path)
+    assert len(pack) == len(instances)
+    assert pack.instance_filenames == [instance.instance_filename for instance in instances]
+    assert 'instance_0.json' in pack and 'missing.json' not in pack
+
+    # Materialized out of order, the arrays of the instances must not mix.
+    for instance in reversed(instances):
+        packed = pack[instance.instance_filename]
+        for name in ['job_ids', 'job_offsets', 'operation_ids', 'machine_indices', 'processing_times',
+                     'power_consumptions']:
+            assert np.array_equal(getattr(packed, name), getattr(instance, name))
+        for name in ['num_machines', 'energy_limit', 'horizon', 'length_metering_interval', 'metadata']:
+            assert getattr(packed, name) == getattr(instance, name)
+        assert [operation.id for operation in packed.jobs[-1].operations] \
+            == [operation.id for operation in instance.jobs[-1].operations]
+
+    assert [instance.instance_filename for instance in pack.instances()] == pack.instance_filenames
+    assert not pack['instance_0.json'].processing_times.flags.writeable
+
+
+def test_not_a_pack(tmp_path):
+    path = tmp_path / 'instance.json'
+    path.write_bytes(b'{}'.ljust(128))
+    with pytest.raises(ValueError):
+        DatasetPack(path)
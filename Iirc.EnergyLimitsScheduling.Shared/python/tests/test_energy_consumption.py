@@ -0,0 +1,52 @@
+import numpy as np
+
+from algorithms.energy_consumption import operation_arrays, compute_consumption_in_metering_intervals
+
+
+def _brute_force_consumptions(start_times, processing_times, power_consumptions, length_metering_interval,
+                              num_metering_intervals):
+    """Energy consumed in the metering intervals, accumulated time unit by time unit (integer start times)."""
+    consumptions = np.zeros(num_metering_intervals)
+    for start_time, processing_time, power_consumption in zip(start_times, processing_times, power_consumptions):
+        if np.isnan(start_time):
+            continue
+        for time in range(int(start_time), int(start_time + processing_time)):
+            if time // length_metering_interval < num_metering_intervals:
+                consumptions[time // length_metering_interval] += power_consumption
+    return consumptions
+
+
+def test_consumption_matches_brute_force(make_instance):
+    rng = np.random.default_rng(0)
+    for seed in range(10):
+        instance = make_instance(seed)
+        processing_times, power_consumptions = operation_arrays(instance)
+        start_times = rng.integers(0, instance.horizon, size=len(processing_times)).astype(np.float64)
+        # Operations without a start time are skipped.
+        start_times[rng.random(len(start_times)) < 0.1] = np.nan
+
+        consumptions = compute_consumption_in_metering_intervals(
+            start_times, processing_times, power_consumptions, instance.length_metering_interval,
+            instance.num_metering_intervals)
+
+        np.testing.assert_allclose(consumptions, _brute_force_consumptions(
+            start_times, processing_times, power_consumptions, instance.length_metering_interval,
+            instance.num_metering_intervals))
+
+
+def test_batch_matches_single_schedules(make_instance):
+    rng = np.random.default_rng(1)
+    instance = make_instance(0)
+    processing_times, power_consumptions = operation_arrays(instance)
+    # Continuous start times.
+    start_times = rng.uniform(0, instance.horizon, size=(5, len(processing_times)))
+
+    consumptions = compute_consumption_in_metering_intervals(
+        start_times, processing_times, power_consumptions, instance.length_metering_interval,
+        instance.num_metering_intervals)
+
+    assert consumptions.shape == (5, instance.num_metering_intervals)
+    for schedule_start_times, schedule_consumptions in zip(start_times, consumptions):
+        np.testing.assert_allclose(schedule_consumptions, compute_consumption_in_metering_intervals(
+            schedule_start_times, processing_times, power_consumptions, instance.length_metering_interval,
+            instance.num_metering_intervals))
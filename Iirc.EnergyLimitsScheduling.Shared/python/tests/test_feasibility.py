@@ -0,0 +1,124 @@
+import math
+import random
+
+import numpy as np
+
+from algorithms.energy_consumption import start_times_to_array
+from algorithms.feasibility import FeasibilityStatus, check_feasibility, find_violations
+from algorithms.greedy_earliest_start_time import GreedyEarliestStartTime, PriorityRule
+
+
+def _is_greater(a: float, b: float) -> bool:
+    return a > b and not math.isclose(a, b)
+
+
+def _brute_force_violations(instance, start_times, with_energy_limits=True):
+    """Returns the status of the first violated check (in the order of the C# `FeasibilityChecker`) and its
+    operation positions (the first of each pair) or metering intervals, all the pairs of operations are compared."""
+    operations = list(instance.get_operations())
+    positions = {operation: position for position, operation in enumerate(operations)}
+
+    missing = {positions[operation] for operation in operations if operation not in start_times}
+    if missing:
+        return FeasibilityStatus.OperationHasNoStartTime, missing
+
+    def completion(operation):
+        return start_times[operation] + operation.processing_time
+
+    precedences = {positions[operation]
+                   for job in instance.jobs
+                   for operation, next_operation in zip(job.operations[:-1], job.operations[1:])
+                   if _is_greater(completion(operation), start_times[next_operation])}
+    if precedences:
+        return FeasibilityStatus.JobPrecedenceViolated, precedences
+
+    for operation in operations:
+        for other_operation in operations:
+            if operation is not other_operation and operation.machine_index == other_operation.machine_index \
+                    and start_times[operation] <= start_times[other_operation] \
+                    and _is_greater(completion(operation), start_times[other_operation]):
+                return FeasibilityStatus.OverlappingOperations, None
+
+    if not with_energy_limits:
+        return FeasibilityStatus.Feasible, None
+
+    outside_horizon = {positions[operation] for operation in operations
+                       if _is_greater(completion(operation), instance.horizon)}
+    if outside_horizon:
+        return FeasibilityStatus.OperationOutsideHorizon, outside_horizon
+
+    length_metering_interval = instance.length_metering_interval
+    violated = set()
+    for metering_interval_index in range(instance.num_metering_intervals):
+        metering_interval_start = metering_interval_index * length_metering_interval
+        consumption = sum(
+            operation.power_consumption * max(0.0, min(completion(operation),
+                                                       metering_interval_start + length_metering_interval)
+                                              - max(start_times[operation], metering_interval_start))
+            for operation in operations)
+        if _is_greater(consumption, instance.energy_limit):
+            violated.add(metering_interval_index)
+    if violated:
+        return FeasibilityStatus.EnergyLimitViolated, violated
+
+    return FeasibilityStatus.Feasible, None
+
+
+def _perturbed_schedules(instance, rng: random.Random):
+    """Yields the greedy schedule and its perturbations violating various constraints."""
+    start_times = GreedyEarliestStartTime(instance, True).schedule(PriorityRule.EarliestStartTime)
+    operations = list(instance.get_operations())
+    yield start_times
+    for _ in range(30):
+        perturbed = dict(start_times)
+        for operation in rng.sample(operations, rng.randint(1, 3)):
+            perturbed[operation] = max(0, perturbed[operation] + rng.randint(-20, 20))
+        yield perturbed
+    yield {operation: start_time for operation, start_time in start_times.items() if operation != operations[0]}
+    yield {**start_times, operations[-1]: instance.horizon}
+    # Without the energy limits, they are likely violated.
+    yield dict(zip(operations, _left_shifted(instance)))
+
+
+def _left_shifted(instance):
+    """Start times of the semi-active schedule of the operations in the job order, ignoring the energy limits."""
+    machine_available = [0] * instance.num_machines
+    start_times = []
+    for job in instance.jobs:
+        job_available = 0
+        for operation in job.operations:
+            start_time = max(machine_available[operation.machine_index], job_available)
+            start_times.append(start_time)
+            job_available = machine_available[operation.machine_index] = start_time + operation.processing_time
+    return start_times
+
+
+def test_find_violations_matches_brute_force(make_instance):
+    rng = random.Random(0)
+    found_statuses = set()
+    for seed in range(8):
+        instance = make_instance(seed)
+        for start_times in _perturbed_schedules(instance, rng):
+            for with_energy_limits in [True, False]:
+                status, details = _brute_force_violations(instance, start_times, with_energy_limits)
+                violations = find_violations(instance, start_times_to_array(instance, start_times), with_energy_limits)
+                found_statuses.add(status)
+
+                assert check_feasibility(
+                    instance, start_times_to_array(instance, start_times), with_energy_limits) == status
+                assert {violation.status for violation in violations} == (
+                    set() if status == FeasibilityStatus.Feasible else {status})
+                if status == FeasibilityStatus.EnergyLimitViolated:
+                    assert {violation.metering_interval_index for violation in violations} == details
+                elif status != FeasibilityStatus.OverlappingOperations and details is not None:
+                    assert {violation.operation_positions[0] for violation in violations} == details
+
+    # The schedules cover all the checks.
+    assert found_statuses == set(FeasibilityStatus)
+
+
+def test_first_only(make_instance):
+    instance = make_instance(0)
+    start_times = np.zeros(len(list(instance.get_operations())))
+    violations = find_violations(instance, start_times, first_only=True)
+    assert len(violations) == 1
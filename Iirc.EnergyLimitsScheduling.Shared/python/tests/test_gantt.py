@@ -0,0 +1,106 @@
+import numpy as np
+import pytest
+
+pytest.importorskip('matplotlib')
+
+from matplotlib.collections import PolyCollection
+import matplotlib.pyplot as plt
+
+from algorithms.energy_consumption import operation_arrays, start_times_to_array, \
+    compute_consumption_in_metering_intervals
+import vizualization.gantt
+from vizualization.gantt import _compute_stack_bottoms, _rectangles
+
+vizualization.gantt.configure(usetex=False, headless=True)
+
+
+def _sequential_start_times(instance):
+    start_times = dict()
+    time_available = 0
+    for operation in instance.get_operations():
+        start_times[operation] = time_available
+        time_available += operation.processing_time
+    return start_times
+
+
+def _rectangles_of(ax):
+    """Returns the bottom left corners and the sizes of the rectangles in the polygon collection of the axes."""
+    collections = [collection for collection in ax.collections if isinstance(collection, PolyCollection)]
+    assert len(collections) == 1
+    vertices = np.array([path.vertices[:4] for path in collections[0].get_paths()])
+    corners = vertices[:, 0]
+    sizes = vertices[:, 2] - vertices[:, 0]
+    return corners, sizes
+
+
+def _consumptions(instance, start_times, num_metering_intervals):
+    processing_times, power_consumptions = operation_arrays(instance)
+    return compute_consumption_in_metering_intervals(
+        start_times_to_array(instance, start_times)[np.newaxis, :],
+        processing_times,
+        power_consumptions,
+        instance.length_metering_interval,
+        num_metering_intervals)[0]
+
+
+def test_rectangles():
+    rectangles = _rectangles(np.array([0, 5]), np.array([1, 2]), np.array([3, 4]), 0.5)
+    assert rectangles.shape == (2, 4, 2)
+    assert rectangles[1].tolist() == [[5, 2], [9, 2], [9, 2.5], [5, 2.5]]
+
+
+def test_compute_stack_bottoms():
+    bottoms = _compute_stack_bottoms(np.array([0, 0, 1, 3, 3, 3]), np.array([1.0, 2.0, 4.0, 1.0, 1.0, 3.0]))
+    assert bottoms.tolist() == [0.0, 1.0, 0.0, 0.0, 1.0, 2.0]
+    assert _compute_stack_bottoms(np.array([], dtype=np.int64), np.array([])).size == 0
+
+
+def test_draw(make_instance):
+    instance = make_instance(0)
+    start_times = _sequential_start_times(instance)
+    fig = vizualization.gantt.draw(instance, start_times, title='test')
+    try:
+        gantt_ax, energy_ax = fig.axes
+
+        # One rectangle per operation, on the row of its machine.
+        corners, sizes = _rectangles_of(gantt_ax)
+        operations = list(start_times)
+        assert corners[:, 0].tolist() == [start_times[operation] for operation in operations]
+        assert sizes[:, 0].tolist() == [operation.processing_time for operation in operations]
+        assert np.allclose(corners[:, 1], [(instance.num_machines - 1 - operation.machine_index) * 0.9 + 0.1
+                                           for operation in operations])
+
+        # The stacks sum up to the consumptions in the metering intervals.
+        makespan = max(start_time + operation.processing_time for operation, start_time in start_times.items())
+        num_metering_intervals = int(round(makespan / instance.length_metering_interval)) + 1
+        corners, sizes = _rectangles_of(energy_ax)
+        metering_interval_indices = (corners[:, 0] // instance.length_metering_interval).astype(np.int64)
+        assert np.allclose(
+            np.bincount(metering_interval_indices, weights=sizes[:, 1], minlength=num_metering_intervals),
+            _consumptions(instance, start_times, num_metering_intervals))
+        for metering_interval_index in np.unique(metering_interval_indices):
+            stack = np.flatnonzero(metering_interval_indices == metering_interval_index)
+            tops = np.sort(corners[stack, 1] + sizes[stack, 1])
+            assert np.allclose(np.sort(corners[stack, 1]), np.r_[0.0, tops[:-1]])
+    finally:
+        plt.close(fig)
+
+
+def test_draw_downsampled(make_instance):
+    instance = make_instance(0)
+    start_times = _sequential_start_times(instance)
+    fig = vizualization.gantt.draw(instance, start_times, max_energy_bars=5)
+    try:
+        makespan = max(start_time + operation.processing_time for operation, start_time in start_times.items())
+        num_metering_intervals = int(round(makespan / instance.length_metering_interval)) + 1
+        group_size = int(np.ceil(num_metering_intervals / 5))
+        consumptions = np.zeros(int(np.ceil(num_metering_intervals / group_size)) * group_size)
+        consumptions[:num_metering_intervals] = _consumptions(instance, start_times, num_metering_intervals)
+
+        # One bar per group of metering intervals, with the maximum consumption among them.
+        corners, sizes = _rectangles_of(fig.axes[1])
+        assert len(corners) <= 5
+        assert np.allclose(sizes[:, 1], consumptions.reshape(-1, group_size).max(axis=1))
+        assert np.all(corners[:, 1] == 0.0)
+    finally:
+        plt.close(fig)
@@ -0,0 +1,109 @@
+from datetime import timedelta
+import json
+import os
+
+import pytest
+
+pytest.importorskip('matplotlib')
+
+from datastructs.instance import Instance
+from datastructs.result import Result, Status
+from scripts.gantt_batch import INDEX_FILENAME, _export_instance_charts, _get_chart_path, _write_index
+
+SOLVER_IDS = ['a', 'b']
+# Modification times (in seconds) of the sources, older than the rendered charts.
+SOURCE_MTIME = 1000000000
+
+
+def _sequential_result(instance):
+    start_times = dict()
+    time_available = 0
+    for operation in instance.get_operations():
+        start_times[operation] = time_available
+        time_available += operation.processing_time
+    return Result(Status.Heuristic, False, timedelta(seconds=1), start_times, None)
+
+
+def _write(path, content, mtime):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    os.utime(str(path), (mtime, mtime))
+
+
+@pytest.fixture
+def dataset(tmp_path, make_raw_instance):
+    """Two instances, solver a has a schedule on both, solver b no schedule on the first and no result on the second."""
+    dataset_path = tmp_path / 'dataset'
+    dataset_results_path = tmp_path / 'results'
+    output_path = tmp_path / 'charts'
+    instances = []
+    for seed in range(2):
+        raw = make_raw_instance(seed)
+        _write(dataset_path / f'{seed}.json', json.dumps(raw), SOURCE_MTIME)
+        instance = Instance.from_dict(raw, f'{seed}.json')
+        instances.append(instance)
+        _write(dataset_results_path / 'a' / instance.instance_filename, _sequential_result(instance).to_json(),
+               SOURCE_MTIME)
+    _write(dataset_results_path / 'b' / '0.json',
+           Result(Status.NoSolution, True, timedelta(seconds=1), None, None).to_json(), SOURCE_MTIME)
+    return dataset_path, dataset_results_path, output_path, instances
+
+
+def _export(dataset, instance_filename, force=False):
+    dataset_path, dataset_results_path, output_path, _ = dataset
+    return _export_instance_charts(
+        dataset_path, None, dataset_results_path, output_path, SOLVER_IDS, 'png', 10, False, force, instance_filename)
+
+
+def test_get_chart_path(tmp_path):
+    assert _get_chart_path(tmp_path, 'a', 'instance.json', 'svg') == tmp_path / 'a' / 'instance.svg'
+
+
+def test_export_instance_charts(dataset):
+    dataset_path, dataset_results_path, output_path, instances = dataset
+
+    charts = _export(dataset, '0.json')
+    assert charts == {'a': ('Heuristic', _sequential_result(instances[0]).makespan()), 'b': ('NoSolution', None)}
+    assert _get_chart_path(output_path, 'a', '0.json', 'png').exists()
+    assert not (output_path / 'b').exists()
+
+    assert _export(dataset, '1.json') == {'a': ('Heuristic', _sequential_result(instances[1]).makespan())}
+
+
+def test_export_skips_up_to_date_charts(dataset):
+    dataset_path, dataset_results_path, output_path, _ = dataset
+    chart_path = _get_chart_path(output_path, 'a', '0.json', 'png')
+    _export(dataset, '0.json')
+
+    def is_rendered(**kwargs):
+        os.utime(str(chart_path), (SOURCE_MTIME + 10, SOURCE_MTIME + 10))
+        charts = _export(dataset, '0.json', **kwargs)
+        assert charts['a'][1] is not None
+        return chart_path.stat().st_mtime != SOURCE_MTIME + 10
+
+    # Newer than its sources, the chart is kept unless forced.
+    assert not is_rendered()
+    assert is_rendered(force=True)
+
+    # Rendered again if the result or the instance is newer.
+    os.utime(str(dataset_results_path / 'a' / '0.json'), (SOURCE_MTIME + 20, SOURCE_MTIME + 20))
+    assert is_rendered()
+    os.utime(str(dataset_results_path / 'a' / '0.json'), (SOURCE_MTIME, SOURCE_MTIME))
+    os.utime(str(dataset_path / '0.json'), (SOURCE_MTIME + 20, SOURCE_MTIME + 20))
+    assert is_rendered()
+
+
+def test_write_index(dataset):
+    _, _, output_path, _ = dataset
+    output_path.mkdir()
+    charts = [_export(dataset, '0.json'), _export(dataset, '1.json')]
+    _write_index(output_path, SOLVER_IDS, ['0.json', '1.json'], charts, 'png', 'experiment: <dataset>')
+
+    index = (output_path / INDEX_FILENAME).read_text()
+    assert '<title>experiment: &lt;dataset&gt;</title>' in index
+    rows = [line for line in index.splitlines() if line.startswith('<tr><td>')]
+    assert rows == [
+        f'<tr><td>0.json</td><td><a href="a/0.png">Heuristic {charts[0]["a"][1]:g}</a></td>'
+        '<td>NoSolution</td></tr>',
+        f'<tr><td>1.json</td><td><a href="a/1.png">Heuristic {charts[1]["a"][1]:g}</a></td><td></td></tr>'
+    ]
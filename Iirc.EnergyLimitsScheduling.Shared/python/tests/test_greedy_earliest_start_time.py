@@ -0,0 +1,77 @@
+import pytest
+
+from algorithms.energy_consumption import operation_arrays, start_times_to_array, \
+    compute_consumption_in_metering_intervals
+from algorithms.greedy_earliest_start_time import CannotScheduleException, GreedyEarliestStartTime, PriorityRule
+from algorithms.time_windows import compute_time_windows
+
+
+def assert_feasible(instance, start_times, with_energy_limits=True):
+    assert set(start_times) == set(instance.get_operations())
+    for job in instance.jobs:
+        for operation, next_operation in zip(job.operations, job.operations[1:]):
+            assert start_times[operation] + operation.processing_time <= start_times[next_operation]
+
+    machine_operations = dict()
+    for operation in instance.get_operations():
+        machine_operations.setdefault(operation.machine_index, []).append(operation)
+    for operations in machine_operations.values():
+        operations.sort(key=start_times.get)
+        for operation, next_operation in zip(operations, operations[1:]):
+            assert start_times[operation] + operation.processing_time <= start_times[next_operation]
+
+    if with_energy_limits:
+        assert all(start_times[operation] + operation.processing_time <= instance.horizon
+                   for operation in instance.get_operations())
+        processing_times, power_consumptions = operation_arrays(instance)
+        consumptions = compute_consumption_in_metering_intervals(
+            start_times_to_array(instance, start_times),
+            processing_times,
+            power_consumptions,
+            instance.length_metering_interval,
+            instance.num_metering_intervals)
+        assert consumptions.max() <= instance.energy_limit + 1e-6
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('priority_rule', list(PriorityRule))
+def test_schedule_is_feasible(make_instance, seed, priority_rule):
+    instance = make_instance(seed)
+    try:
+        start_times = GreedyEarliestStartTime(instance).schedule(priority_rule)
+    except CannotScheduleException:
+        pytest.skip('The greedy heuristic cannot schedule the instance within its horizon.')
+
+    assert_feasible(instance, start_times)
+    for operation, time_window in compute_time_windows(instance, instance.horizon).items():
+        assert time_window.earliest_start <= start_times[operation] <= time_window.latest_start
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_schedule_without_energy_limits(make_instance, seed):
+    instance = make_instance(seed)
+    start_times = GreedyEarliestStartTime(instance, False).schedule(PriorityRule.EarliestStartTime)
+    assert_feasible(instance, start_times, False)
+
+    # The operations are appended to their machines at the earliest.
+    for operation, start_time in start_times.items():
+        job = instance.jobs[operation.job_index]
+        previous_completions = [
+            start_times[other_operation] + other_operation.processing_time
+            for other_operation in instance.get_operations()
+            if other_operation.machine_index == operation.machine_index
+            and start_times[other_operation] < start_time]
+        if operation.index > 0:
+            previous_operation = job.operations[operation.index - 1]
+            previous_completions.append(start_times[previous_operation] + previous_operation.processing_time)
+        assert start_time == max(previous_completions, default=0)
+
+
+def test_reference_start_times_order(make_instance):
+    instance = make_instance(0)
+    # The reverse job order, the jobs are sequenced on the machines as given.
+    reference_start_times = {
+        operation: -operation.job_index * 100 + operation.index for operation in instance.get_operations()}
+    start_times = GreedyEarliestStartTime(instance, False).schedule(PriorityRule.StartTime, reference_start_times)
+    assert_feasible(instance, start_times, False)
+    assert all(start_times[operation] == 0 for operation in instance.jobs[-1].operations[:1])
@@ -0,0 +1,88 @@
+import json
+from datetime import timedelta
+
+import pytest
+
+from datastructs.instance import Instance
+from datastructs.result import Result, Status
+
+
+def _assert_same_instances(instance, expected):
+    for name in ['num_machines', 'energy_limit', 'horizon', 'length_metering_interval', 'num_metering_intervals',
+                 'metadata', 'instance_filename']:
+        assert getattr(instance, name) == getattr(expected, name)
+    assert [job.id for job in instance.jobs] == [job.id for job in expected.jobs]
+    for operation, expected_operation in zip(instance.get_operations(), expected.get_operations()):
+        assert (operation.id, operation.index, operation.job_index, operation.machine_index,
+                operation.processing_time, operation.power_consumption) \
+            == (expected_operation.id, expected_operation.index, expected_operation.job_index,
+                expected_operation.machine_index, expected_operation.processing_time,
+                expected_operation.power_consumption)
+
+
+@pytest.mark.parametrize('indent', [None, 4])
+def test_lazy_instance(make_raw_instance, indent):
+    raw = make_raw_instance(0)
+    s = json.dumps(dict(Jobs=raw.pop('Jobs'), **raw), indent=indent)
+
+    instance = Instance.from_json(s, 'instance.json', lazy=True)
+    assert not instance.is_loaded
+    assert instance.metadata == raw['Metadata']
+    assert instance.horizon == raw['Horizon']
+    assert not instance.is_loaded
+
+    expected = Instance.from_json(s, 'instance.json')
+    assert [operation.id for operation in instance.get_operations()] \
+        == [operation.id for operation in expected.get_operations()]
+    assert not instance.is_loaded
+
+    _assert_same_instances(instance, expected)
+    assert instance.is_loaded
+
+
+def test_lazy_instance_from_file(tmp_path, make_raw_instance):
+    raw = make_raw_instance(0)
+    path = tmp_path / 'instance.json'
+    path.write_text(json.dumps(raw))
+
+    instance = Instance.from_file(path, 'instance.json', lazy=True)
+    # The jobs are packed from the content read at once.
+    path.unlink()
+    _assert_same_instances(instance, Instance.from_dict(raw, 'instance.json'))
+
+
+def test_invalid_json():
+    with pytest.raises(ValueError):
+        Instance.from_json('[]', lazy=True)
+    with pytest.raises(ValueError):
+        Instance.from_json('{"Jobs": [[]', lazy=True)
+
+
+def test_get_operation(make_raw_instance):
+    raw = make_raw_instance(0)
+    instance = Instance.from_json(json.dumps(raw), lazy=True)
+    expected = Instance.from_dict(raw)
+
+    operation = instance.get_operation(2, 1)
+    expected_operation = expected.get_operation(2, 1)
+    assert operation == expected_operation
+    assert (operation.index, operation.job_index, operation.machine_index, operation.processing_time,
+            operation.power_consumption) \
+        == (expected_operation.index, expected_operation.job_index, expected_operation.machine_index,
+            expected_operation.processing_time, expected_operation.power_consumption)
+    with pytest.raises(IndexError):
+        instance.get_operation(2, len(raw['Jobs'][2]['Operations']))
+    assert not instance.is_loaded
+
+
+def test_result_of_lazy_instance(make_raw_instance):
+    raw = make_raw_instance(0)
+    expected = Instance.from_dict(raw)
+    start_times = {operation: 10 * operation.id for operation in expected.get_operations()}
+    s = Result(Status.Heuristic, False, timedelta(seconds=1), start_times, None).to_json()
+
+    instance = Instance.from_json(json.dumps(raw), lazy=True)
+    result = Result.from_json(s, instance)
+    assert not instance.is_loaded
+    assert {operation.id: start_time for operation, start_time in result.start_times.items()} \
+        == {operation.id: start_time for operation, start_time in start_times.items()}
@@ -0,0 +1,144 @@
+from datetime import timedelta
+import time
+
+import pytest
+
+pytest.importorskip('docplex')
+
+from docplex.cp.model import SOLVE_STATUS_FEASIBLE, SOLVE_STATUS_INFEASIBLE, SOLVE_STATUS_OPTIMAL
+
+from datastructs.result import Status
+from solvers import cp_overlap, iterative_horizon
+import utils
+
+
+def _solver_config(**specialized_solver_config) -> dict:
+    return {
+        'TimeLimit': timedelta(seconds=10),
+        'NumWorkers': 1,
+        'WithEnergyLimits': True,
+        'InitStartTimes': None,
+        'ValidStartTimes': None,
+        'SpecializedSolverConfig': specialized_solver_config
+    }
+
+
+class _Solution:
+
+    def __init__(self, solve_status, start_times, lower_bound=None):
+        self.solve_status = solve_status
+        self.start_times = start_times
+        self.lower_bound = lower_bound
+
+    def get_solve_status(self):
+        return self.solve_status
+
+    def get_fail_status(self):
+        return None
+
+    def get_objective_bounds(self):
+        return None if self.lower_bound is None else (self.lower_bound,)
+
+
+class _Model:
+    """Feasible in at least `min_num_metering_intervals`, the schedules complete at the end of the horizon."""
+
+    min_num_metering_intervals = 6
+
+    def __init__(self, solver_config, instance, num_metering_intervals, timings):
+        self.instance = instance
+        self.calls = [('Build', num_metering_intervals)]
+        self.num_metering_intervals = num_metering_intervals
+        _Model.last = self
+
+    def add_makespan_lower_bound(self, lower_bound):
+        self.calls.append(('LowerBound', lower_bound))
+
+    def set_num_metering_intervals(self, num_metering_intervals):
+        self.calls.append(('Intervals', num_metering_intervals))
+        self.num_metering_intervals = num_metering_intervals
+
+    def is_infeasible(self):
+        return False
+
+    def set_starting_point(self, start_times):
+        pass
+
+    def solve(self, time_limit, on_solution=None, **parameters):
+        self.calls.append(('Solve', parameters.get('SolutionLimit')))
+        if self.num_metering_intervals < self.min_num_metering_intervals:
+            return _Solution(SOLVE_STATUS_INFEASIBLE, None)
+
+        length_metering_interval = self.instance.length_metering_interval
+        if parameters.get('SolutionLimit') == 1:
+            makespan = self.num_metering_intervals * length_metering_interval
+            return _Solution(SOLVE_STATUS_FEASIBLE, self._schedule(makespan))
+
+        makespan = (self.min_num_metering_intervals - 1) * length_metering_interval + 1
+        return _Solution(SOLVE_STATUS_OPTIMAL, self._schedule(makespan), makespan)
+
+    def _schedule(self, makespan):
+        return {
+            operation: makespan - operation.processing_time for operation in self.instance.get_operations()
+        }
+
+    def get_start_times(self, solution):
+        return solution.start_times
+
+    def statistics(self):
+        return dict()
+
+
+def test_shrinks_until_infeasible(monkeypatch, make_instance):
+    instance = make_instance(0)
+    monkeypatch.setattr(iterative_horizon, 'CpOverlapModel', _Model)
+    reported = []
+
+    result = iterative_horizon.solve_iterative_horizon(
+        _solver_config(), instance, time.time(), 10, None, None, None, utils.PhaseTimings(), reported.append)
+
+    # The first schedule of each iteration fills the metering intervals, the next iteration drops the last one.
+    assert _Model.last.calls == [
+        ('Build', 10), ('Solve', 1),
+        ('Intervals', 9), ('Solve', 1),
+        ('Intervals', 8), ('Solve', 1),
+        ('Intervals', 7), ('Solve', 1),
+        ('Intervals', 6), ('Solve', 1),
+        ('Intervals', 5), ('Solve', 1),
+        ('Intervals', 6), ('Solve', None)
+    ]
+    assert len(reported) == 5
+    length_metering_interval = instance.length_metering_interval
+    assert result.status == Status.Optimal
+    assert result.makespan() == 5 * length_metering_interval + 1
+    assert result.lower_bound == 5 * length_metering_interval + 1
+
+
+def test_lower_bound_stops_shrinking(monkeypatch, make_instance):
+    instance = make_instance(0)
+    monkeypatch.setattr(iterative_horizon, 'CpOverlapModel', _Model)
+    lower_bound = 9 * instance.length_metering_interval
+
+    result = iterative_horizon.solve_iterative_horizon(
+        _solver_config(), instance, time.time(), 10, None, None, lower_bound, utils.PhaseTimings(), None)
+
+    # The metering intervals are not shrunk below the lower bound, the schedule at the lower bound is optimal.
+    assert _Model.last.calls == [
+        ('Build', 10), ('LowerBound', lower_bound), ('Solve', 1),
+        ('Intervals', 9), ('Solve', 1)
+    ]
+    assert result.status == Status.Optimal
+    assert result.makespan() == 9 * instance.length_metering_interval
+    assert result.lower_bound == 9 * instance.length_metering_interval
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_same_makespan_as_overlap(make_instance, cp_optimizer, seed):
+    instance = make_instance(seed)
+    results = [
+        cp_overlap.solve(_solver_config(IterativeHorizon=iterative), instance, time.time())
+        for iterative in [False, True]
+    ]
+    assert results[0].status == results[1].status
+    if results[0].status == Status.Optimal:
+        assert results[0].makespan() == results[1].makespan()
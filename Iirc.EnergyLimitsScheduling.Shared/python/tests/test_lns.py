@@ -0,0 +1,56 @@
+import pytest
+
+from algorithms.greedy_earliest_start_time import CannotScheduleException, GreedyEarliestStartTime, PriorityRule
+from algorithms.lns import AdaptiveNeighborhoods, NeighborhoodType, critical_path
+
+
+def _greedy_schedule(instance):
+    try:
+        return GreedyEarliestStartTime(instance).schedule(PriorityRule.EarliestStartTime)
+    except CannotScheduleException:
+        pytest.skip('The greedy heuristic cannot schedule the instance within its horizon.')
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_critical_path(make_instance, seed):
+    instance = make_instance(seed)
+    start_times = _greedy_schedule(instance)
+    path = critical_path(instance, start_times)
+
+    makespan = max(start_time + operation.processing_time for operation, start_time in start_times.items())
+    assert start_times[path[-1]] + path[-1].processing_time == makespan
+    for operation, next_operation in zip(path, path[1:]):
+        assert start_times[operation] + operation.processing_time <= start_times[next_operation]
+
+
+@pytest.mark.parametrize('neighborhood_type', list(NeighborhoodType))
+def test_free_operations(make_instance, neighborhood_type):
+    instance = make_instance(0)
+    start_times = _greedy_schedule(instance)
+    neighborhoods = AdaptiveNeighborhoods(instance, [neighborhood_type], initial_size=0.5, seed=0)
+
+    free_operations = neighborhoods.free_operations(neighborhood_type, start_times)
+    assert free_operations and free_operations <= set(start_times)
+    if neighborhood_type == NeighborhoodType.Machines:
+        assert len({operation.machine_index for operation in free_operations}) \
+            == round(0.5 * instance.num_machines)
+    elif neighborhood_type == NeighborhoodType.CriticalPath:
+        # Whole jobs are freed.
+        for job_index in {operation.job_index for operation in free_operations}:
+            assert set(instance.jobs[job_index].operations) <= free_operations
+
+
+def test_update():
+    neighborhoods = AdaptiveNeighborhoods(None, list(NeighborhoodType), initial_size=0.5, growth=2.0, seed=0)
+    neighborhoods.update(NeighborhoodType.TimeWindow, False, True)
+    neighborhoods.update(NeighborhoodType.Machines, False, False)
+    neighborhoods.update(NeighborhoodType.CriticalPath, True, False)
+    assert neighborhoods.sizes == {
+        NeighborhoodType.TimeWindow: 1.0,
+        NeighborhoodType.Machines: 0.25,
+        NeighborhoodType.CriticalPath: 0.5
+    }
+
+    # The successful neighborhood is selected more often.
+    selected = [neighborhoods.select() for _ in range(1000)]
+    assert selected.count(NeighborhoodType.CriticalPath) > selected.count(NeighborhoodType.Machines)
@@ -0,0 +1,84 @@
+from datetime import timedelta
+import time
+
+import pytest
+
+pytest.importorskip('docplex')
+
+from datastructs.instance import Instance
+from datastructs.result import Status
+from solvers import cp_overlap, model_cache
+import utils
+
+
+def _solver_config(directory: str, energy_formulation: str) -> dict:
+    return {
+        'TimeLimit': timedelta(seconds=10),
+        'NumWorkers': 1,
+        'WithEnergyLimits': True,
+        'InitStartTimes': None,
+        'ValidStartTimes': None,
+        'SpecializedSolverConfig': {'ModelCache': directory, 'EnergyFormulation': energy_formulation}
+    }
+
+
+@pytest.mark.parametrize('energy_formulation', ['Overlap', 'Segments'])
+def test_loaded_model_of_instance_with_other_ids(tmp_path, make_raw_instance, shift_ids, energy_formulation):
+    instance = Instance.from_dict(make_raw_instance(0))
+    # Same contents (hence the same cache entry), different ids.
+    shifted_ids = Instance.from_dict(shift_ids(make_raw_instance(0), 1000))
+    solver_config = _solver_config(str(tmp_path), energy_formulation)
+
+    exported_timings = utils.PhaseTimings()
+    exported = model_cache.build_model(solver_config, instance, instance.num_metering_intervals, 10, exported_timings)
+    loaded_timings = utils.PhaseTimings()
+    loaded = model_cache.build_model(solver_config, shifted_ids, instance.num_metering_intervals, 10, loaded_timings)
+
+    assert 'ModelExport' in exported_timings.timings
+    assert 'ModelLoad' in loaded_timings.timings and 'Variables' not in loaded_timings.timings
+    assert loaded.statistics() == exported.statistics()
+
+    # The variables are those of the imported model.
+    loaded_vars = [*loaded.operation_vars.values(), *loaded.segment_vars.values(), *loaded.machine_vars.values()]
+    assert {var.get_name() for var in loaded_vars} == {var.get_name() for var in loaded.model.get_all_variables()}
+    assert len(loaded.segment_vars) == len(exported.segment_vars)
+    assert (energy_formulation == 'Segments') == bool(loaded.segment_vars)
+
+    # The operations at the same positions have the same variables.
+    assert [loaded.operation_vars[operation].get_name() for operation in shifted_ids.get_operations()] \
+        == [exported.operation_vars[operation].get_name() for operation in instance.get_operations()]
+
+
+@pytest.mark.parametrize('energy_formulation', ['Overlap', 'Segments'])
+def test_solve_loaded_model(tmp_path, make_instance, cp_optimizer, energy_formulation):
+    instance = make_instance(0)
+    solver_config = _solver_config(str(tmp_path), energy_formulation)
+    # Without the lower bounds, an optimal warm start would be returned before the model is built.
+    solver_config['SpecializedSolverConfig']['LowerBounds'] = False
+
+    built = cp_overlap.solve(solver_config, instance, time.time())
+    assert list(tmp_path.glob('*.cpo'))
+    loaded_timings = utils.PhaseTimings()
+    loaded = cp_overlap.solve(solver_config, instance, time.time(), loaded_timings)
+
+    assert 'ModelLoad' in loaded_timings.timings
+    assert loaded.status == built.status == Status.Optimal
+    assert loaded.makespan() == built.makespan()
+    assert set(loaded.start_times) == set(instance.get_operations())
+
+
+def test_cache_key(tmp_path, make_instance):
+    instance = make_instance(0)
+    path = model_cache.model_cache_path(
+        _solver_config(str(tmp_path), 'Overlap'), instance, instance.num_metering_intervals, None)
+    assert path.parent == tmp_path
+
+    # The formulation options define the model.
+    assert path != model_cache.model_cache_path(
+        _solver_config(str(tmp_path), 'Segments'), instance, instance.num_metering_intervals, None)
+    assert path != model_cache.model_cache_path(
+        _solver_config(str(tmp_path), 'Overlap'), instance, instance.num_metering_intervals - 1, None)
+    assert path != model_cache.model_cache_path(
+        _solver_config(str(tmp_path), 'Overlap'), instance, instance.num_metering_intervals, 10)
+    assert path != model_cache.model_cache_path(
+        _solver_config(str(tmp_path), 'Overlap'), make_instance(1), instance.num_metering_intervals, None)
@@ -0,0 +1,113 @@
+from datetime import timedelta
+from pathlib import Path
+import subprocess
+import time
+
+import pytest
+
+from datastructs.result import Result, Status
+from solvers.portfolio import solve_portfolio
+
+
+def _shifted_start_times(instance, shift):
+    start_times = dict()
+    time_available = shift
+    for operation in instance.get_operations():
+        start_times[operation] = time_available
+        time_available += operation.processing_time
+    return start_times
+
+
+def _solve(solver_config, instance, start_time_solver, timings, on_solution):
+    """Variant reporting the schedules shifted by `Shifts` in turn, the last one with `Status`.
+
+    With `ChildPidPath`, the variant starts a child process (as CP Optimizer) and waits for it. With
+    `WaitForPath`, the variant waits for the file before reporting anything.
+    """
+    if 'ChildPidPath' in solver_config:
+        child = subprocess.Popen(['sleep', '60'])
+        Path(solver_config['ChildPidPath']).write_text(str(child.pid))
+        child.wait()
+    if 'WaitForPath' in solver_config:
+        while not Path(solver_config['WaitForPath']).exists():
+            time.sleep(0.01)
+    if 'Error' in solver_config:
+        raise ValueError(solver_config['Error'])
+
+    for shift in solver_config['Shifts'][:-1]:
+        on_solution(Result(Status.Heuristic, False, timedelta(seconds=0), _shifted_start_times(instance, shift), None))
+    return Result(
+        solver_config['Status'],
+        False,
+        timedelta(seconds=0),
+        _shifted_start_times(instance, solver_config['Shifts'][-1]),
+        solver_config['LowerBound'])
+
+
+def _variant(shifts, status=Status.Heuristic, lower_bound=None, **kwargs):
+    return dict(
+        TimeLimit=timedelta(seconds=30), Shifts=shifts, Status=status, LowerBound=lower_bound, **kwargs)
+
+
+def _is_running(pid):
+    try:
+        stat = Path(f'/proc/{pid}/stat').read_text()
+    except FileNotFoundError:
+        return False
+    return stat[stat.rindex(')') + 2] != 'Z'
+
+
+def test_best_of_variants(make_instance):
+    instance = make_instance(0)
+    solutions = []
+    result = solve_portfolio(
+        _solve,
+        [_variant([30, 20], lower_bound=10.0), _variant([25, 15, 5], lower_bound=3.0), _variant([40])],
+        instance,
+        time.time(),
+        solutions.append)
+
+    assert result.status == Status.Heuristic
+    assert not result.time_limit_reached
+    assert result.makespan() == Result(None, None, None, _shifted_start_times(instance, 5), None).makespan()
+    assert result.lower_bound == 10.0
+    # Only the improving solutions are reported.
+    makespans = [solution.makespan() for solution in solutions]
+    assert makespans == sorted(makespans, reverse=True) and len(set(makespans)) == len(makespans)
+    assert makespans[-1] == result.makespan()
+
+
+def test_proven_optimum_stops_variants(tmp_path, make_instance):
+    if not Path('/proc/self/stat').exists():
+        pytest.skip('The processes are inspected through /proc.')
+
+    instance = make_instance(0)
+    child_pid_path = tmp_path / 'child.pid'
+    start_time = time.time()
+    result = solve_portfolio(
+        _solve,
+        [_variant([0], ChildPidPath=str(child_pid_path)),
+         _variant([10, 0], Status.Optimal, WaitForPath=str(child_pid_path))],
+        instance,
+        start_time)
+
+    assert time.time() - start_time < 30
+    assert result.status == Status.Optimal
+    assert result.lower_bound == result.makespan()
+
+    # The child process of the killed variant is killed too.
+    child_pid = int(child_pid_path.read_text())
+    for _ in range(100):
+        if not _is_running(child_pid):
+            break
+        time.sleep(0.05)
+    assert not _is_running(child_pid)
+
+
+def test_errors(make_instance):
+    instance = make_instance(0)
+    result = solve_portfolio(_solve, [_variant([0], Error='a'), _variant([10])], instance, time.time())
+    assert result.status == Status.Heuristic
+
+    with pytest.raises(RuntimeError, match='variant 1: ValueError: b'):
+        solve_portfolio(_solve, [_variant([0], Error='a'), _variant([0], Error='b')], instance, time.time())
@@ -0,0 +1,48 @@
+from datetime import timedelta
+import json
+
+from datastructs.arrays import ArrayInstance, ArrayResult
+from datastructs.result import Result, Status
+
+
+def _result(instance, timings=None, model_statistics=None):
+    start_times = {operation: 10 * operation.id for operation in instance.get_operations()}
+    return Result(Status.Optimal, False, timedelta(seconds=2), start_times, 40, timings, model_statistics)
+
+
+def test_timings_and_statistics_round_trip(make_instance):
+    instance = make_instance(0)
+    timings = {'ModelBuild': 0.25, 'Search': 1.5, 'FeasibilityCheck': 0.125}
+    model_statistics = {'NumVariables': 18, 'NumConstraints': 42}
+    result = _result(instance, timings, model_statistics)
+
+    d = json.loads(result.to_json())
+    assert d['Timings'] == timings
+    assert d['ModelStatistics'] == model_statistics
+
+    for loaded in [Result.from_dict(result.to_dict(), instance), Result.from_json(result.to_json(), instance)]:
+        assert loaded.timings == timings
+        assert loaded.model_statistics == model_statistics
+        assert loaded.status == result.status
+        assert loaded.running_time == result.running_time
+        assert loaded.lower_bound == result.lower_bound
+        assert loaded.start_times == result.start_times
+        assert loaded.to_dict() == result.to_dict()
+
+    array_result = ArrayResult.from_json(result.to_json(), ArrayInstance.from_instance(instance))
+    assert array_result.timings == timings
+    assert array_result.model_statistics == model_statistics
+
+
+def test_without_timings_and_statistics(make_instance):
+    instance = make_instance(0)
+    result = _result(instance)
+
+    # The sections are omitted (as written by the C# solvers), not written as nulls.
+    d = result.to_dict()
+    assert 'Timings' not in d and 'ModelStatistics' not in d
+
+    loaded = Result.from_json(result.to_json(), instance)
+    assert loaded.timings is None
+    assert loaded.model_statistics is None
+    assert loaded.to_dict() == d
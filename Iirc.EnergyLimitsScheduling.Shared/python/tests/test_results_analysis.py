@@ -0,0 +1,141 @@
+from datetime import timedelta
+import json
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pandas')
+pytest.importorskip('matplotlib')
+
+from algorithms.energy_consumption import operation_arrays, start_times_to_array, \
+    compute_consumption_in_metering_intervals, are_energy_limits_satisfied
+from datastructs.instance import Instance
+from datastructs.result import Result, Status
+from scripts.results_analysis import GroupedInstances, InstanceResults, ResultRecord, _timings_table, \
+    _load_instances_results, _reduce_instance_results, _compute_metering_interval_iterations
+
+
+def _sequential_start_times(instance):
+    start_times = dict()
+    time_available = 0
+    for operation in instance.get_operations():
+        start_times[operation] = time_available
+        time_available += operation.processing_time
+    return start_times
+
+
+def _results(instance):
+    """Results of the solvers on the instance, solver c has no result on the last instance."""
+    results = {
+        # All at time zero, likely violating the energy limits.
+        'a': Result(Status.Optimal, False, timedelta(seconds=1),
+                    {operation: 0 for operation in instance.get_operations()}, None),
+        'b': Result(Status.Heuristic, True, timedelta(seconds=1), _sequential_start_times(instance), None,
+                    {'Search': 1.0}),
+        'c': Result(Status.NoSolution, True, timedelta(seconds=1), None, None)
+    }
+    if instance.instance_filename == '2.json':
+        del results['c']
+    return results
+
+
+def _energy_limits_satisfied(instance, start_times):
+    processing_times, power_consumptions = operation_arrays(instance)
+    consumptions = compute_consumption_in_metering_intervals(
+        start_times_to_array(instance, start_times)[np.newaxis, :],
+        processing_times,
+        power_consumptions,
+        instance.length_metering_interval,
+        instance.num_metering_intervals)
+    return bool(are_energy_limits_satisfied(consumptions, instance.energy_limit)[0])
+
+
+@pytest.fixture
+def dataset(tmp_path, make_raw_instance):
+    dataset_path = tmp_path / 'dataset'
+    dataset_results_path = tmp_path / 'results'
+    dataset_path.mkdir()
+    instances = []
+    for seed in range(3):
+        raw = make_raw_instance(seed)
+        (dataset_path / f'{seed}.json').write_text(json.dumps(raw))
+        instance = Instance.from_dict(raw, f'{seed}.json')
+        instances.append(instance)
+        for solver_id, result in _results(instance).items():
+            (dataset_results_path / solver_id).mkdir(parents=True, exist_ok=True)
+            (dataset_results_path / solver_id / instance.instance_filename).write_text(result.to_json())
+    return dataset_path, dataset_results_path, instances
+
+
+def test_reduce_instance_results(dataset):
+    dataset_path, dataset_results_path, instances = dataset
+    for instance in instances:
+        reduced = _reduce_instance_results(dataset_path, None, dataset_results_path, ['a', 'b', 'c'], True,
+                                           instance.instance_filename)
+        assert reduced.instance_filename == instance.instance_filename
+        assert reduced.metadata == instance.metadata
+
+        results = _results(instance)
+        assert set(reduced.results) == {'a', 'b', 'c'}
+        for solver_id, record in reduced.results.items():
+            if solver_id not in results:
+                assert record is None
+                continue
+
+            result = results[solver_id]
+            assert record.status == result.status
+            assert record.timings == result.timings
+            if result.start_times is None:
+                assert record.makespan is None and record.energy_limits_satisfied is None
+                continue
+
+            # The results checked as one batch are attributed to their solvers.
+            assert record.makespan == result.makespan()
+            assert record.energy_limits_satisfied == _energy_limits_satisfied(instance, result.start_times)
+            if result.status == Status.Optimal:
+                assert record.metering_interval_iterations == _compute_metering_interval_iterations(
+                    instance.horizon, instance.length_metering_interval, record.makespan)
+            else:
+                assert record.metering_interval_iterations is None
+
+
+def test_reduce_without_energy_limits_check(dataset):
+    dataset_path, dataset_results_path, instances = dataset
+    reduced = _reduce_instance_results(dataset_path, None, dataset_results_path, ['a', 'b'], False, '0.json')
+    assert all(record.energy_limits_satisfied is None for record in reduced.results.values())
+
+
+def test_load_instances_results_in_parallel(dataset):
+    dataset_path, dataset_results_path, instances = dataset
+    solver_ids = ['a', 'b', 'c']
+    loaded = _load_instances_results(dataset_path, None, dataset_results_path, solver_ids, True, 2)
+
+    # Same as the reduction in this process, for every instance exactly once.
+    assert sorted(instance_results.instance_filename for instance_results in loaded) \
+        == sorted(instance.instance_filename for instance in instances)
+    for instance_results in loaded:
+        expected = _reduce_instance_results(dataset_path, None, dataset_results_path, solver_ids, True,
+                                            instance_results.instance_filename)
+        assert instance_results.metadata == expected.metadata
+        for solver_id in solver_ids:
+            record, expected_record = instance_results.results[solver_id], expected.results[solver_id]
+            if expected_record is None:
+                assert record is None
+                continue
+            assert [getattr(record, name) for name in ResultRecord.__slots__] \
+                == [getattr(expected_record, name) for name in ResultRecord.__slots__]
+
+
+def test_timings_table_counts_missing_phases_as_zero():
+    instances = [
+        InstanceResults('0.json', {'n': 1}, {'a': ResultRecord(Status.Optimal, timings={'Search': 2.0, 'Parsing': 1.0},
+                                                               model_statistics={'NumVariables': 4})}),
+        InstanceResults('1.json', {'n': 1}, {'a': ResultRecord(Status.Optimal, timings={'Search': 4.0})}),
+        # Without the timings, e.g., a result of a solver not reporting them.
+        InstanceResults('2.json', {'n': 1}, {'a': ResultRecord(Status.Optimal)}),
+        InstanceResults('3.json', {'n': 1}, {'a': None})
+    ]
+
+    df = _timings_table([GroupedInstances({'n': 1}, instances)], ['a'], ['n'])
+    assert df.to_dict('records') == [
+        {'n': 1, 'solver': 'a', 'count': 2, 'NumVariables': 2.0, 'Parsing': 0.5, 'Search': 3.0}]
@@ -0,0 +1,109 @@
+from datetime import timedelta
+import json
+import os
+
+import pytest
+
+from datastructs.instance import Instance
+from datastructs.result import Result, Status
+from datastructs.results_index import ResultsIndex
+
+SOLVER_IDS = ['a', 'b']
+
+
+def _sequential_result(instance, status=Status.Heuristic):
+    """Schedules the operations one after another, the makespan is the sum of the processing times."""
+    start_times = dict()
+    time_available = 0
+    for operation in instance.get_operations():
+        start_times[operation] = time_available
+        time_available += operation.processing_time
+    return Result(status, False, timedelta(seconds=1), start_times, None)
+
+
+def _write(path, content, mtime_ns):
+    path.write_text(content)
+    os.utime(str(path), ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def dataset(tmp_path, make_raw_instance):
+    """Dataset of three instances with the results of both solvers, except of solver b on the last instance."""
+    dataset_path = tmp_path / 'dataset'
+    dataset_results_path = tmp_path / 'results'
+    dataset_path.mkdir()
+    instances = []
+    for seed in range(3):
+        raw = make_raw_instance(seed)
+        _write(dataset_path / f'{seed}.json', json.dumps(raw), 10 ** 18)
+        instances.append(Instance.from_dict(raw, f'{seed}.json'))
+    for solver_id in SOLVER_IDS:
+        (dataset_results_path / solver_id).mkdir(parents=True)
+        for instance in instances[:3 if solver_id == 'a' else 2]:
+            _write(dataset_results_path / solver_id / instance.instance_filename,
+                   _sequential_result(instance).to_json(), 10 ** 18)
+    return dataset_path, dataset_results_path, instances
+
+
+def test_refresh_parses_only_changed_files(tmp_path, dataset):
+    dataset_path, dataset_results_path, instances = dataset
+    index = ResultsIndex(tmp_path / 'index.sqlite')
+
+    assert index.refresh(dataset_path, dataset_results_path, SOLVER_IDS, 1) == 5
+    assert index.refresh(dataset_path, dataset_results_path, SOLVER_IDS, 1) == 0
+    assert sorted(instance.instance_filename for instance in index.instances()) == ['0.json', '1.json', '2.json']
+
+    results = index.results(SOLVER_IDS)
+    assert len(results) == 5
+    for instance in instances:
+        result = results[('a', instance.instance_filename)]
+        assert result.status == Status.Heuristic
+        assert result.running_time == 1
+        assert result.makespan == sum(operation.processing_time for operation in instance.get_operations())
+
+    # A changed and a new result file.
+    _write(dataset_results_path / 'a' / '0.json',
+           _sequential_result(instances[0], Status.NoSolution).to_json(), 2 * 10 ** 18)
+    _write(dataset_results_path / 'b' / '2.json', _sequential_result(instances[2]).to_json(), 10 ** 18)
+    assert index.refresh(dataset_path, dataset_results_path, SOLVER_IDS, 1) == 2
+    results = index.results(SOLVER_IDS)
+    assert results[('a', '0.json')].status == Status.NoSolution
+    assert results[('a', '0.json')].makespan is None
+    assert ('b', '2.json') in results
+
+    # All results of a changed instance are parsed again.
+    os.utime(str(dataset_path / '1.json'), ns=(2 * 10 ** 18, 2 * 10 ** 18))
+    assert index.refresh(dataset_path, dataset_results_path, SOLVER_IDS, 1) == 2
+
+    # The index is persistent.
+    index.close()
+    index = ResultsIndex(tmp_path / 'index.sqlite')
+    assert index.refresh(dataset_path, dataset_results_path, SOLVER_IDS, 1) == 0
+    assert len(index.results(SOLVER_IDS)) == 6
+    assert len(index.results(['a'])) == 3
+
+
+def test_refresh_removes_deleted_files(tmp_path, dataset):
+    dataset_path, dataset_results_path, instances = dataset
+    index = ResultsIndex(tmp_path / 'index.sqlite')
+    index.refresh(dataset_path, dataset_results_path, SOLVER_IDS, 1)
+
+    (dataset_results_path / 'a' / '1.json').unlink()
+    (dataset_path / '0.json').unlink()
+    assert index.refresh(dataset_path, dataset_results_path, SOLVER_IDS, 1) == 0
+    assert sorted(instance.instance_filename for instance in index.instances()) == ['1.json', '2.json']
+    assert sorted(index.results(SOLVER_IDS)) == [('a', '2.json'), ('b', '1.json')]
+
+
+def test_refresh_skips_incomplete_files(tmp_path, dataset):
+    dataset_path, dataset_results_path, instances = dataset
+    _write(dataset_results_path / 'b' / '2.json', '{"Status": ', 10 ** 18)
+    index = ResultsIndex(tmp_path / 'index.sqlite')
+
+    index.refresh(dataset_path, dataset_results_path, SOLVER_IDS, 1)
+    assert ('b', '2.json') not in index.results(SOLVER_IDS)
+
+    # Parsed once it is written completely.
+    _write(dataset_results_path / 'b' / '2.json', _sequential_result(instances[2]).to_json(), 2 * 10 ** 18)
+    assert index.refresh(dataset_path, dataset_results_path, SOLVER_IDS, 1) == 1
+    assert ('b', '2.json') in index.results(SOLVER_IDS)
@@ -0,0 +1,147 @@
+from datetime import timedelta
+import json
+import os
+
+import numpy as np
+import pytest
+
+from datastructs.arrays import ArrayInstance, ArrayResult
+from datastructs.dataset_pack import write_dataset_pack
+from datastructs.instance import Instance
+from datastructs.result import Result, Status
+from datastructs.results_store import ResultsStore, pack_start_times, unpack_start_times
+from algorithms.energy_consumption import start_times_to_array
+
+SOLVER_IDS = ['a', 'b']
+
+
+def _result(instance, status=Status.Heuristic):
+    """Schedules every other operation one after another, the others have no start time."""
+    start_times = dict()
+    time_available = 0
+    for operation in list(instance.get_operations())[::2]:
+        start_times[operation] = time_available + 0.5
+        time_available += operation.processing_time
+    return Result(status, False, timedelta(seconds=2), start_times, 1.0, {'Solve': 0.5}, {'NumVariables': 3})
+
+
+@pytest.fixture
+def dataset(tmp_path, make_raw_instance):
+    dataset_path = tmp_path / 'dataset'
+    dataset_results_path = tmp_path / 'results'
+    dataset_path.mkdir()
+    instances = []
+    for seed in range(3):
+        raw = make_raw_instance(seed)
+        (dataset_path / f'{seed}.json').write_text(json.dumps(raw))
+        instances.append(Instance.from_dict(raw, f'{seed}.json'))
+    for solver_id in SOLVER_IDS:
+        (dataset_results_path / solver_id).mkdir(parents=True)
+        for instance in instances:
+            (dataset_results_path / solver_id / instance.instance_filename).write_text(_result(instance).to_json())
+    return dataset_path, dataset_results_path, instances
+
+
+def test_pack_start_times(make_instance):
+    instance = make_instance(0)
+    start_times = _result(instance).start_times
+    packed = pack_start_times(instance, start_times)
+    assert np.array_equal(unpack_start_times(packed), start_times_to_array(instance, start_times), equal_nan=True)
+    assert pack_start_times(instance, None) is None
+    assert unpack_start_times(None) is None
+
+
+def test_append(tmp_path, dataset):
+    dataset_path, dataset_results_path, instances = dataset
+    store = ResultsStore(tmp_path / 'store.sqlite')
+
+    assert store.append('d', dataset_path, dataset_results_path, SOLVER_IDS, num_processes=1) == 6
+    assert store.append('d', dataset_path, dataset_results_path, SOLVER_IDS, num_processes=1) == 0
+    assert store.datasets() == ['d']
+    assert store.solver_ids('d') == SOLVER_IDS
+    assert sorted(instance.instance_filename for instance in store.instances('d')) == ['0.json', '1.json', '2.json']
+
+    results = store.results('d', SOLVER_IDS)
+    assert len(results) == 6
+    for instance in instances:
+        expected = _result(instance)
+        result = results[('a', instance.instance_filename)]
+        assert result.status == Status.Heuristic
+        assert result.makespan == expected.makespan()
+        assert result.timings == expected.timings
+        assert result.model_statistics == expected.model_statistics
+        assert result.start_times is None
+
+    # Only the changed file is parsed, the runs of the removed files are kept.
+    result_path = dataset_results_path / 'b' / '1.json'
+    result_path.write_text(_result(instances[1], Status.NoSolution).to_json())
+    os.utime(str(result_path), ns=(2 * 10 ** 18, 2 * 10 ** 18))
+    (dataset_results_path / 'a' / '2.json').unlink()
+    assert store.append('d', dataset_path, dataset_results_path, SOLVER_IDS, num_processes=1) == 1
+    results = store.results('d', SOLVER_IDS)
+    assert results[('b', '1.json')].status == Status.NoSolution
+    assert ('a', '2.json') in results
+
+
+def test_start_times_round_trip(tmp_path, dataset):
+    dataset_path, dataset_results_path, instances = dataset
+    store = ResultsStore(tmp_path / 'store.sqlite')
+    store.append('d', dataset_path, dataset_results_path, SOLVER_IDS, num_processes=1)
+
+    for instance in instances:
+        expected = _result(instance)
+        assert np.array_equal(
+            store.results('d', ['a'], with_start_times=True)[('a', instance.instance_filename)].start_times,
+            start_times_to_array(instance, expected.start_times),
+            equal_nan=True)
+        assert Result.from_store(store, 'd', 'a', instance).to_dict() == expected.to_dict()
+
+        array_instance = ArrayInstance.from_instance(instance)
+        assert ArrayResult.from_store(store, 'd', 'a', array_instance).to_dict() \
+            == ArrayResult.from_result(expected, array_instance).to_dict()
+
+    assert store.result('d', 'a', 'missing.json') is None
+    assert Result.from_store(store, 'd', 'c', instances[0]) is None
+
+
+def test_add(tmp_path, make_instance):
+    instance = make_instance(0)
+    store = ResultsStore(tmp_path / 'store.sqlite')
+    store.add('d', 'a', instance, _result(instance))
+    store.add('d', 'a', instance, Result(Status.NoSolution, True, timedelta(seconds=3), None, None))
+    store.close()
+
+    store = ResultsStore(tmp_path / 'store.sqlite')
+    result = store.result('d', 'a', instance.instance_filename)
+    assert result.status == Status.NoSolution
+    assert result.start_times is None
+    assert [i.instance_filename for i in store.instances('d')] == [instance.instance_filename]
+
+
+def test_add_file_backed(tmp_path, dataset):
+    dataset_path, dataset_results_path, instances = dataset
+    store = ResultsStore(tmp_path / 'store.sqlite')
+    for solver_id in SOLVER_IDS:
+        for instance in instances:
+            store.add(
+                'd', solver_id, instance, _result(instance),
+                dataset_results_path / solver_id / instance.instance_filename,
+                dataset_path / instance.instance_filename)
+
+    # The added runs are up to date with their files.
+    assert store.append('d', dataset_path, dataset_results_path, SOLVER_IDS, num_processes=1) == 0
+    (dataset_results_path / 'a' / instances[0].instance_filename).write_text(
+        Result(Status.NoSolution, True, timedelta(seconds=3), None, None).to_json())
+    assert store.append('d', dataset_path, dataset_results_path, SOLVER_IDS, num_processes=1) == 1
+
+
+def test_append_dataset_pack(tmp_path, dataset):
+    dataset_path, dataset_results_path, instances = dataset
+    pack_path = tmp_path / 'dataset.pack'
+    write_dataset_pack([ArrayInstance.from_instance(instance) for instance in instances], pack_path)
+    store = ResultsStore(tmp_path / 'store.sqlite')
+
+    assert store.append('d', dataset_path, dataset_results_path, SOLVER_IDS, pack_path, num_processes=1) == 6
+    assert store.append('d', dataset_path, dataset_results_path, SOLVER_IDS, pack_path, num_processes=1) == 0
+    for instance in instances:
+        assert Result.from_store(store, 'd', 'b', instance).to_dict() == _result(instance).to_dict()
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from datastructs.instance import Instance, Job, Operation
+from algorithms.energy_consumption import start_times_to_array
+from algorithms.feasibility import find_violations
+from algorithms.greedy_earliest_start_time import CannotScheduleException, GreedyEarliestStartTime, PriorityRule
+from algorithms.rolling_horizon import build_subproblem
+
+
+def _assert_within_valid_start_times(subproblem, start_times):
+    for valid_start_time in subproblem.valid_start_times:
+        operation = subproblem.instance.jobs[valid_start_time['JobIndex']] \
+            .operations[valid_start_time['OperationIndex']]
+        assert valid_start_time['StartTimeFrom'] <= start_times[operation] <= valid_start_time['StartTimeTo']
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_subproblem_keeps_fixed_prefix(make_instance, seed):
+    instance = make_instance(seed)
+    try:
+        start_times = GreedyEarliestStartTime(instance).schedule(PriorityRule.EarliestStartTime)
+    except CannotScheduleException:
+        pytest.skip('The greedy heuristic cannot schedule the instance within its horizon.')
+    makespan = max(start_time + operation.processing_time for operation, start_time in start_times.items())
+    fixed_start_times = {operation: start_time for operation, start_time in start_times.items()
+                         if start_time + operation.processing_time <= makespan // 2}
+    included_operations = set(start_times) - set(fixed_start_times)
+    subproblem = build_subproblem(instance, fixed_start_times, included_operations)
+
+    assert set(subproblem.operations.values()) == included_operations
+    assert subproblem.consumed_energies.sum() == pytest.approx(sum(
+        operation.processing_time * operation.power_consumption for operation in fixed_start_times))
+
+    # The free operations of the schedule start within the bounds given by the fixed ones.
+    subproblem_start_times = subproblem.from_original_start_times(start_times)
+    assert subproblem.to_original_start_times(subproblem_start_times) \
+        == {operation: start_times[operation] for operation in included_operations}
+    _assert_within_valid_start_times(subproblem, subproblem_start_times)
+
+
+def test_energy_limits_force_idle_time():
+    # Each operation consumes the whole energy limit of a metering interval, so they must run in different ones
+    # although the machines are free.
+    jobs = [Job(index, index, [Operation(index, 0, index, index, 5, 1.0)]) for index in range(3)]
+    instance = Instance(3, jobs, 5.0, 30, 10)
+    start_times = {job.operations[0]: 10 * job.index for job in jobs}
+    assert not find_violations(instance, start_times_to_array(instance, start_times))
+
+    subproblem = build_subproblem(instance, dict(), set(instance.get_operations()))
+    _assert_within_valid_start_times(subproblem, subproblem.from_original_start_times(start_times))
+    assert np.all(subproblem.consumed_energies == 0)
+
+    # Without the energy limits, the operations are left-shifted.
+    subproblem = build_subproblem(instance, dict(), set(instance.get_operations()), with_energy_limits=False)
+    assert all(valid_start_time['StartTimeTo'] == 15 for valid_start_time in subproblem.valid_start_times)
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_subproblem_bounded_by_window(make_instance, seed):
+    instance = make_instance(seed)
+    try:
+        start_times = GreedyEarliestStartTime(instance).schedule(PriorityRule.EarliestStartTime)
+    except CannotScheduleException:
+        pytest.skip('The greedy heuristic cannot schedule the instance within its horizon.')
+    makespan = max(start_time + operation.processing_time for operation, start_time in start_times.items())
+    fixed_start_times = {operation: start_time for operation, start_time in start_times.items()
+                         if start_time + operation.processing_time <= makespan // 2}
+    included_operations = set(start_times) - set(fixed_start_times)
+    horizon = -(-makespan // instance.length_metering_interval) * instance.length_metering_interval
+    subproblem = build_subproblem(instance, fixed_start_times, included_operations, horizon=horizon)
+
+    assert subproblem.instance.horizon == horizon
+    assert subproblem.instance.num_metering_intervals == horizon // instance.length_metering_interval
+    assert len(subproblem.consumed_energies) == subproblem.instance.num_metering_intervals
+    assert subproblem.consumed_energies.sum() == pytest.approx(sum(
+        operation.processing_time * operation.power_consumption for operation in fixed_start_times))
+    for valid_start_time in subproblem.valid_start_times:
+        operation = subproblem.instance.jobs[valid_start_time['JobIndex']] \
+            .operations[valid_start_time['OperationIndex']]
+        assert valid_start_time['StartTimeTo'] == horizon - operation.processing_time
+    # The greedy schedule fits into the window.
+    _assert_within_valid_start_times(subproblem, subproblem.from_original_start_times(start_times))
@@ -0,0 +1,151 @@
+import json
+
+import pytest
+
+from scripts import run_experiment
+
+# Solver writing the schedule of the operations one after another after sleeping, it logs its start and end to
+# log.jsonl next to the solvers directory. The specialized solver config gives its id and the instances on which it
+# fails (`FailOn`) or finds a schedule without start times (`Infeasible`).
+_FAKE_SOLVER = """
+import json
+import sys
+import time
+from pathlib import Path
+
+solver_config = json.loads(Path(sys.argv[1]).read_text())
+instance_path = Path(sys.argv[2])
+instance = json.loads(instance_path.read_text())
+specialized_solver_config = solver_config['SpecializedSolverConfig']
+
+
+def log(event):
+    with (Path(__file__).resolve().parent.parent / 'log.jsonl').open('a') as f:
+        f.write(json.dumps({
+            'Event': event,
+            'Time': time.time(),
+            'SolverId': specialized_solver_config['Id'],
+            'InstanceFilename': instance_path.name,
+            'InitStartTimes': solver_config['InitStartTimes']
+        }) + '\\n')
+
+
+log('Start')
+time.sleep(0.3)
+if instance_path.name in specialized_solver_config.get('FailOn', []):
+    log('End')
+    sys.exit(1)
+
+start_times = []
+time_available = 0
+for job_index, job in enumerate(instance['Jobs']):
+    for operation_index, operation in enumerate(job['Operations']):
+        start_times.append({'JobIndex': job_index, 'OperationIndex': operation_index, 'StartTime': time_available})
+        time_available += operation['ProcessingTime']
+if instance_path.name in specialized_solver_config.get('Infeasible', []):
+    start_times = []
+
+Path(sys.argv[3]).write_text(json.dumps({
+    'Status': 3,
+    'TimeLimitReached': False,
+    'RunningTime': '0:0:1',
+    'LowerBound': None,
+    'StartTimes': start_times
+}))
+log('End')
+"""
+
+
+def _solver_prescription(solver_id, num_workers, time_limit, init_start_times_from=None, **kwargs):
+    return {
+        'Id': solver_id,
+        'SolverName': 'Fake',
+        'Config': {'NumWorkers': num_workers, 'TimeLimit': time_limit},
+        'SpecializedSolverConfig': dict(Id=solver_id, **kwargs),
+        'InitStartTimesFrom': init_start_times_from
+    }
+
+
+@pytest.fixture
+def experiment(tmp_path, monkeypatch, make_raw_instance):
+    (tmp_path / 'solvers').mkdir()
+    (tmp_path / 'solvers' / 'fake.py').write_text(_FAKE_SOLVER)
+    monkeypatch.setattr(run_experiment, '_PYTHON_PATH', tmp_path)
+    monkeypatch.setitem(run_experiment.PYTHON_SOLVERS, 'Fake', 'fake')
+
+    datasets_path = tmp_path / 'datasets'
+    (datasets_path / 'd').mkdir(parents=True)
+    for seed in range(4):
+        # Single operation instances, the schedule starting it at zero is feasible.
+        (datasets_path / 'd' / f'{seed}.json').write_text(json.dumps(make_raw_instance(seed, 1, 1, 1)))
+
+    prescription = {
+        'DatasetNames': ['d'],
+        'GlobalConfig': {'TimeLimit': '0:0:10'},
+        'Solvers': [
+            _solver_prescription('a', 2, '0:0:20', FailOn=['3.json']),
+            _solver_prescription('b', 1, None, 'a', Infeasible=['2.json']),
+            _solver_prescription('c', 0, '0:0:5')
+        ]
+    }
+    return datasets_path, tmp_path / 'results', prescription
+
+
+def test_plan_runs(experiment):
+    datasets_path, experiment_results_path, prescription = experiment
+    runs = run_experiment._plan_runs(datasets_path, experiment_results_path, prescription, 3)
+
+    assert len(runs) == 12
+    assert [run.solver_id for run in runs] == ['a'] * 4 + ['b'] * 4 + ['c'] * 4
+    assert {run.solver_id: run.num_cpus for run in runs} == {'a': 2, 'b': 1, 'c': 3}
+    # The larger instances first.
+    sizes = [run.instance_path.stat().st_size for run in runs[:4]]
+    assert sizes == sorted(sizes, reverse=True)
+
+    (experiment_results_path / 'd' / 'b').mkdir(parents=True)
+    (experiment_results_path / 'd' / 'b' / '0.json').write_text('{}')
+    runs = run_experiment._plan_runs(datasets_path, experiment_results_path, prescription, 1)
+    assert ('d', 'b', '0.json') not in {run.key for run in runs}
+    assert all(run.num_cpus == 1 for run in runs)
+    assert len(run_experiment._plan_runs(datasets_path, experiment_results_path, prescription, 1, False)) == 12
+
+
+def test_run_experiment(tmp_path, experiment):
+    datasets_path, experiment_results_path, prescription = experiment
+    num_cpus = 3
+    runs = run_experiment._plan_runs(datasets_path, experiment_results_path, prescription, num_cpus)
+    errors = run_experiment._run_experiment(experiment_results_path, runs, num_cpus)
+
+    assert errors == {
+        ('d', 'a', '3.json'): 'solver exited with code 1',
+        ('d', 'b', '3.json'): 'a failed',
+        ('d', 'b', '2.json'): 'feasibility check failed: OperationHasNoStartTime'
+    }
+    for run in runs:
+        assert run.result_path.exists() == (run.key not in errors)
+    assert not list(experiment_results_path.glob('*/*/.*.tmp'))
+
+    log = [json.loads(line) for line in (tmp_path / 'log.jsonl').read_text().splitlines()]
+    starts = {(d['SolverId'], d['InstanceFilename']): d for d in log if d['Event'] == 'Start'}
+    ends = {(d['SolverId'], d['InstanceFilename']): d for d in log if d['Event'] == 'End'}
+    assert ('b', '3.json') not in starts
+
+    # The CPUs of the runs executing at the same time fit into the budget.
+    num_run_cpus = {'a': 2, 'b': 1, 'c': num_cpus}
+    for start in starts.values():
+        used_cpus = sum(
+            num_run_cpus[other_key[0]]
+            for other_key, other_start in starts.items()
+            if other_start['Time'] <= start['Time'] < ends[other_key]['Time'])
+        assert used_cpus <= num_cpus
+
+    # The runs of b start after the runs of a on the same instances and start from their schedules.
+    for instance_filename in ['0.json', '1.json', '2.json']:
+        assert starts[('b', instance_filename)]['Time'] >= ends[('a', instance_filename)]['Time']
+        assert starts[('b', instance_filename)]['InitStartTimes'] == json.loads(
+            (experiment_results_path / 'd' / 'a' / instance_filename).read_text())['StartTimes']
+    assert starts[('a', '0.json')]['InitStartTimes'] is None
+
+    # Resumed experiment runs only the failed ones.
+    assert {run.key for run in run_experiment._plan_runs(datasets_path, experiment_results_path, prescription, 3)} \
+        == set(errors)
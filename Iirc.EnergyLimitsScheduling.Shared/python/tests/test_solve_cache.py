@@ -0,0 +1,93 @@
+from datetime import timedelta
+
+from datastructs.instance import Instance
+from datastructs.result import Result, Status
+from algorithms.greedy_earliest_start_time import GreedyEarliestStartTime, PriorityRule
+from solvers.solve_cache import SolveCache, instance_digest
+
+
+def _solver_config(time_limit: int, **specialized_solver_config) -> dict:
+    return {
+        'TimeLimit': timedelta(seconds=time_limit),
+        'NumWorkers': 2,
+        'WithEnergyLimits': True,
+        'InitStartTimes': None,
+        'ValidStartTimes': None,
+        'SpecializedSolverConfig': specialized_solver_config
+    }
+
+
+def _result(instance: Instance, status: Status) -> Result:
+    start_times = GreedyEarliestStartTime(instance, True).schedule(PriorityRule.EarliestStartTime)
+    return Result(status, status == Status.Heuristic, timedelta(seconds=1), start_times, 10.0, {'Search': 1.0})
+
+
+def test_round_trip(tmp_path, make_instance):
+    instance = make_instance(0)
+    solve_cache = SolveCache(tmp_path)
+    solver_config = _solver_config(10)
+    key = SolveCache.key(solver_config, instance)
+    assert solve_cache.get(key, instance) is None
+
+    result = _result(instance, Status.Heuristic)
+    solve_cache.put(key, solver_config, result)
+    cached = solve_cache.get(key, instance)
+
+    assert cached.result.status == Status.Heuristic
+    assert cached.result.start_times == result.start_times
+    assert cached.result.lower_bound == result.lower_bound
+    assert cached.covers(_solver_config(10)) and not cached.covers(_solver_config(20))
+    assert not cached.is_proven()
+
+
+def test_key(make_raw_instance, make_instance, shift_ids):
+    instance = Instance.from_dict(make_raw_instance(0))
+    shifted_ids = Instance.from_dict(shift_ids(make_raw_instance(0), 100))
+
+    # Only the contents of the instance and the problem defining options matter.
+    assert instance_digest(shifted_ids) == instance_digest(instance)
+    assert SolveCache.key(_solver_config(10), instance) == SolveCache.key(_solver_config(20), shifted_ids)
+    assert SolveCache.key(_solver_config(10), instance) == SolveCache.key(
+        _solver_config(10, SolveCache='elsewhere', CheckFeasibility=True), instance)
+    assert SolveCache.key(_solver_config(10), instance) != SolveCache.key(
+        _solver_config(10, EnergyFormulation='Segments'), instance)
+    assert SolveCache.key(_solver_config(10), instance) != SolveCache.key(_solver_config(10), make_instance(1))
+
+
+def test_put_keeps_better_entries(tmp_path, make_instance):
+    instance = make_instance(0)
+    solve_cache = SolveCache(tmp_path)
+    key = SolveCache.key(_solver_config(10), instance)
+
+    solve_cache.put(key, _solver_config(20), _result(instance, Status.Heuristic))
+    # A smaller budget does not replace the result.
+    solve_cache.put(key, _solver_config(10), Result(Status.NoSolution, True, timedelta(), dict(), None))
+    solve_cache.put(key, _solver_config(10), _result(instance, Status.Heuristic))
+    assert solve_cache.get(key, instance).time_limit == 20
+    # Nor does a longer time limit with fewer workers.
+    solve_cache.put(key, dict(_solver_config(30), NumWorkers=1), _result(instance, Status.Heuristic))
+    assert (solve_cache.get(key, instance).time_limit, solve_cache.get(key, instance).num_workers) == (20, 2)
+    solve_cache.put(key, _solver_config(30), _result(instance, Status.Heuristic))
+    assert solve_cache.get(key, instance).time_limit == 30
+
+    solve_cache.put(key, _solver_config(10), _result(instance, Status.Optimal))
+    solve_cache.put(key, _solver_config(30), _result(instance, Status.Heuristic))
+    cached = solve_cache.get(key, instance)
+    assert cached.is_proven() and cached.time_limit == 10
+
+
+def test_eviction(tmp_path, make_instance):
+    solve_cache = SolveCache(tmp_path)
+    instances = [make_instance(seed) for seed in range(3)]
+    keys = [SolveCache.key(_solver_config(10), instance) for instance in instances]
+    solve_cache.put(keys[0], _solver_config(10), _result(instances[0], Status.Heuristic))
+    entry_size = sum(entry_path.stat().st_size for entry_path in tmp_path.glob('*.json'))
+
+    # Room for about two entries, the least recently used one is evicted.
+    solve_cache.max_size = int(2.5 * entry_size)
+    solve_cache.put(keys[1], _solver_config(10), _result(instances[1], Status.Heuristic))
+    solve_cache.put(keys[2], _solver_config(10), _result(instances[2], Status.Heuristic))
+
+    assert solve_cache.get(keys[0], instances[0]) is None
+    assert solve_cache.get(keys[1], instances[1]) is not None
+    assert solve_cache.get(keys[2], instances[2]) is not None
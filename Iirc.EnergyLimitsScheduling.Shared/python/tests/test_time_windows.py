@@ -0,0 +1,71 @@
+import pytest
+
+from algorithms.time_windows import TimeWindow, compute_time_windows, overlapped_metering_intervals
+
+
+def _left_shifted(instance):
+    """Start times of the semi-active schedule of the operations in the job order, ignoring the energy limits."""
+    machine_available = [0] * instance.num_machines
+    start_times = dict()
+    for job in instance.jobs:
+        job_available = 0
+        for operation in job.operations:
+            start_time = max(machine_available[operation.machine_index], job_available)
+            start_times[operation] = start_time
+            job_available = machine_available[operation.machine_index] = start_time + operation.processing_time
+    return start_times
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_schedule_within_time_windows(make_instance, seed):
+    instance = make_instance(seed)
+    start_times = _left_shifted(instance)
+    makespan = max(start_time + operation.processing_time for operation, start_time in start_times.items())
+
+    for operation, time_window in compute_time_windows(instance, makespan).items():
+        assert not time_window.is_empty()
+        assert time_window.earliest_start <= start_times[operation] <= time_window.latest_start
+        assert time_window.earliest_completion == time_window.earliest_start + operation.processing_time
+        assert time_window.latest_completion <= makespan
+
+    # The heads of the operations are tight for the first operations of the jobs.
+    for job in instance.jobs:
+        assert compute_time_windows(instance, None)[job.operations[0]].earliest_start == 0
+
+
+def test_valid_start_times(make_instance):
+    instance = make_instance(0)
+    job = instance.jobs[0]
+    valid_start_times = [{'JobIndex': 0, 'OperationIndex': 1, 'StartTimeFrom': 100, 'StartTimeTo': 200}]
+    time_windows = compute_time_windows(instance, None, valid_start_times)
+
+    assert time_windows[job.operations[1]].earliest_start == 100
+    assert time_windows[job.operations[1]].latest_start == 200
+    # Propagated to the preceding and following operations of the job.
+    assert time_windows[job.operations[0]].latest_start == 200 - job.operations[0].processing_time
+    assert time_windows[job.operations[2]].earliest_start == 100 + job.operations[1].processing_time
+    assert time_windows[job.operations[2]].latest_start is None
+
+    # The operation cannot complete by the horizon.
+    assert compute_time_windows(instance, 100, valid_start_times)[job.operations[1]].is_empty()
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_overlapped_metering_intervals(make_instance, seed):
+    instance = make_instance(seed)
+    length_metering_interval = instance.length_metering_interval
+    for operation, time_window in compute_time_windows(instance, instance.horizon).items():
+        metering_interval_indices = overlapped_metering_intervals(
+            operation, time_window, length_metering_interval, instance.num_metering_intervals)
+
+        # Every start time in the window overlaps only the returned metering intervals and all of them are reached.
+        reached = set()
+        for start_time in range(time_window.earliest_start, time_window.latest_start + 1):
+            for time in range(start_time, start_time + operation.processing_time):
+                reached.add(time // length_metering_interval)
+        assert reached == set(metering_interval_indices)
+
+
+def test_overlapped_metering_intervals_of_empty_window(make_instance):
+    operation = next(make_instance(0).get_operations())
+    assert not overlapped_metering_intervals(operation, TimeWindow(10, 5, 20, 15), 15, 10)
@@ -0,0 +1,119 @@
+from datetime import timedelta
+from pathlib import Path
+import io
+import json
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+
+from datastructs.result import Result, Status
+from solvers.worker import Worker
+
+
+def _left_shifted_solve(solver_config, instance, start_time_solver):
+    """Schedules the operations of the jobs one after another, ignoring the machines and the energy limits."""
+    start_times = dict()
+    time_available = 0
+    for operation in instance.get_operations():
+        start_times[operation] = time_available
+        time_available += operation.processing_time
+    return Result(Status.Heuristic, False, timedelta(seconds=0), start_times, None)
+
+
+def test_handle(tmp_path, make_raw_instance):
+    raw = make_raw_instance(0)
+    instance_path = tmp_path / 'instance.json'
+    instance_path.write_text(json.dumps(raw))
+    result_path = tmp_path / 'result.json'
+    worker = Worker(_left_shifted_solve, 1)
+
+    response = worker.handle({'Id': 1, 'SolverConfig': {}, 'Instance': raw})
+    assert response['Id'] == 1
+    assert response['Result']['Status'] == Status.Heuristic
+    assert len(response['Result']['StartTimes']) == sum(len(job['Operations']) for job in raw['Jobs'])
+
+    assert worker.handle({
+        'Id': 2,
+        'SolverConfig': {},
+        'InstancePath': str(instance_path),
+        'ResultPath': str(result_path)
+    }) == {'Id': 2, 'Result': response['Result']}
+    assert json.loads(result_path.read_text()) == json.loads(json.dumps(response['Result']))
+
+
+def test_handle_error(tmp_path):
+    worker = Worker(_left_shifted_solve, 1)
+    response = worker.handle({'Id': 'a', 'SolverConfig': {}, 'InstancePath': str(tmp_path / 'missing.json')})
+    assert response['Id'] == 'a'
+    assert response['Error'].startswith('FileNotFoundError')
+
+
+def test_serve_stream(make_raw_instance):
+    requests = [json.dumps({'Id': i, 'SolverConfig': {}, 'Instance': make_raw_instance(i)}) for i in range(4)]
+    output = io.StringIO()
+    Worker(_left_shifted_solve, 2).serve_stream(iter(requests[:2] + ['', 'not json'] + requests[2:]), output)
+
+    responses = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert sorted(response['Id'] for response in responses if 'Result' in response) == list(range(4))
+    assert [response['Id'] for response in responses if 'Error' in response] == [None]
+
+
+def test_cpu_budget(make_raw_instance):
+    lock = threading.Lock()
+    num_used_cpus = [0]
+    max_num_used_cpus = [0]
+
+    def solve(solver_config, instance, start_time_solver):
+        with lock:
+            num_used_cpus[0] += solver_config['NumWorkers']
+            max_num_used_cpus[0] = max(max_num_used_cpus[0], num_used_cpus[0])
+        time.sleep(0.05)
+        with lock:
+            num_used_cpus[0] -= solver_config['NumWorkers']
+        return _left_shifted_solve(solver_config, instance, start_time_solver)
+
+    requests = [
+        json.dumps({'Id': i, 'SolverConfig': {'NumWorkers': num_workers}, 'Instance': make_raw_instance(i)})
+        for i, num_workers in enumerate([2, 1, 3, 1, 2, 2])
+    ]
+    output = io.StringIO()
+    Worker(solve, 3).serve_stream(iter(requests), output)
+
+    assert len(output.getvalue().splitlines()) == len(requests)
+    assert max_num_used_cpus[0] <= 3
+
+
+def test_serve_stdio_keeps_responses_parsable(make_raw_instance):
+    # The solve writes to the standard output as the search log of CP Optimizer and its subprocess do.
+    script = textwrap.dedent('''
+        import os
+        import subprocess
+        import sys
+
+        from tests.test_worker import _left_shifted_solve
+        from solvers.worker import Worker
+
+        def solve(solver_config, instance, start_time_solver):
+            print('search log')
+            sys.stdout.flush()
+            os.write(1, b'raw search log\\n')
+            subprocess.run(['echo', 'subprocess search log'])
+            return _left_shifted_solve(solver_config, instance, start_time_solver)
+
+        Worker(solve, 2).serve_stdio()
+    ''')
+    requests = [json.dumps({'Id': i, 'SolverConfig': {}, 'Instance': make_raw_instance(i)}) for i in range(3)]
+    completed = subprocess.run(
+        [sys.executable, '-c', script],
+        input='\n'.join(requests) + '\n',
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        cwd=str(Path(__file__).resolve().parent.parent),
+        check=True)
+
+    responses = [json.loads(line) for line in completed.stdout.splitlines()]
+    assert sorted(response['Id'] for response in responses if 'Result' in response) == list(range(3))
+    assert completed.stderr.count('search log') == 9
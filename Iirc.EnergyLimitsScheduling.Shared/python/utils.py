@@ -1,6 +1,9 @@
+from typing import Dict
+from contextlib import contextmanager
 from datetime import timedelta
 import re
 import math
+import time
 
 def parse_timedelta(s):
     """Create timedelta object representing time delta
@@ -29,4 +32,21 @@ def timedelta_to_str(td: timedelta) -> str:
     s = s - (hours * 3600)
     minutes = s // 60
     seconds = s - (minutes * 60)
-    return '%d:%d:%d' % (hours, minutes, seconds)
\ No newline at end of file
+    return '%d:%d:%d' % (hours, minutes, seconds)
+
+class PhaseTimings:
+    """Accumulates the durations (in seconds) of named phases, a phase can be measured repeatedly."""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = dict()
+
+    def add(self, phase: str, duration: float):
+        self.timings[phase] = self.timings.get(phase, 0.0) + duration
+
+    @contextmanager
+    def measure(self, phase: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start)
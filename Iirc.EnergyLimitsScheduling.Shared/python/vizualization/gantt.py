@@ -1,61 +1,76 @@
-from typing import Tuple, List, Dict, Optional
+from typing import Tuple, Dict, Optional
 
 import matplotlib
-matplotlib.rc('font',**{'family':'sans-serif','sans-serif':['Helvetica']})
-matplotlib.rc('text', usetex=True)
-matplotlib.rc('text.latex', preamble=r'\usepackage{amsmath}')
 import numpy as np
-import matplotlib.pyplot as plt
 import struct
-from matplotlib.patches import Rectangle
 
 from datastructs.instance import Instance, Operation, Job
+from algorithms.energy_consumption import compute_operation_consumptions
 
 __all__ = [
+    'configure',
     'draw'
 ]
 
 
-def _generate_colors(n: int) -> List[Tuple[float, float, float]]:
+def configure(usetex: bool = True, headless: bool = False):
+    """Configures matplotlib for the charts, must be called before `matplotlib.pyplot` is used.
+
+    With `usetex`, the texts are typeset by LaTeX (needs a LaTeX installation). With `headless`, the Agg backend is
+    used, so the charts can be saved without a display.
+    """
+    if headless:
+        matplotlib.use('Agg')
+    matplotlib.rc('font', **{'family': 'sans-serif', 'sans-serif': ['Helvetica', 'Arial', 'DejaVu Sans']})
+    matplotlib.rc('text', usetex=usetex)
+    if usetex:
+        matplotlib.rc('text.latex', preamble=r'\usepackage{amsmath}')
+
+
+def _generate_colors(n: int) -> np.ndarray:
+    import matplotlib.pyplot as plt
+
     def scale_rgb_color(r: int, g: int, b: int) -> Tuple[float, float, float]:
         return (r / 255.0, g / 255.0, b / 255.0)
 
-    # Backup old randomness state.
-    rand_state = np.random.get_state()
-    np.random.seed(0)
-
     # Some nice-looking default colors.
     colors = [
-        scale_rgb_color(*struct.unpack('BBB', bytes.fromhex(color[1:])))
+        scale_rgb_color(*struct.unpack('BBB', bytes.fromhex(matplotlib.colors.to_hex(color)[1:])))
         for color in plt.rcParams['axes.prop_cycle'].by_key()['color']
     ]
 
-    # If needed, add more random colors.
-    colors.extend(np.random.rand(3) for _ in range(n - len(colors)))
+    # If needed, add more random colors (always the same ones).
+    rng = np.random.RandomState(0)
+    colors.extend(tuple(rng.rand(3)) for _ in range(n - len(colors)))
     del colors[n:]
 
-    # Restore old randomness state.
-    np.random.set_state(rand_state)
+    return np.array(colors, dtype=np.float64).reshape(-1, 3)
 
-    return colors
 
-def _get_machine_bottom_y(machine_index: int, num_machines: int, machine_height: int) -> int:
-    return (num_machines - 1 - machine_index) * machine_height
+def _rectangles(x: np.ndarray, y: np.ndarray, widths: np.ndarray, heights: np.ndarray) -> np.ndarray:
+    """Returns the vertices of the rectangles given by their bottom left corners and sizes, shape (n, 4, 2)."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    right = x + widths
+    top = y + heights
+    return np.stack([
+        np.stack([x, y], axis=-1),
+        np.stack([right, y], axis=-1),
+        np.stack([right, top], axis=-1),
+        np.stack([x, top], axis=-1)
+    ], axis=1)
 
 
-def _get_operation_bottom_y(
-        operation: Operation,
-        num_machines: int,
-        machine_height: int,
-        operation_margin: int) -> int:
-    return _get_machine_bottom_y(operation.machine_index, num_machines, machine_height) + operation_margin
+def _compute_stack_bottoms(group_indices: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Returns the bottoms of the values stacked within the groups (the values must be sorted by the groups)."""
+    if values.size == 0:
+        return values
+    tops = np.cumsum(values)
+    bottoms = tops - values
+    is_group_start = np.r_[True, group_indices[1:] != group_indices[:-1]]
+    group_ids = np.cumsum(is_group_start) - 1
+    return bottoms - bottoms[is_group_start][group_ids]
 
-def _compute_intervals_overlap(
-        left1: float,
-        right1: float,
-        left2: float,
-        right2: float) -> float:
-    return max(0, min(right1, right2) - max(left1, left2))
 
 def draw(
         ins: Instance,
@@ -64,12 +79,31 @@ def draw(
         operation_height: int = 0.8,
         operation_margin: int = 0.1,
         time_units: Optional[str] = None,
-        power_consumption_units: Optional[str] = None):
+        power_consumption_units: Optional[str] = None,
+        max_energy_bars: Optional[int] = None):
+    """Draws the gantt chart of the schedule and the energy consumption in the metering intervals.
+
+    The operations and the consumptions are drawn as collections, so large schedules render fast. If there are more
+    metering intervals than `max_energy_bars`, the energy panel is downsampled: consecutive metering intervals are
+    merged into one bar showing the maximum total consumption among them (not stacked by the operations).
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import PolyCollection
+
+    operations = list(start_times.keys())
+    operation_start_times = np.array([start_times[operation] for operation in operations], dtype=np.float64)
+    processing_times = np.array([operation.processing_time for operation in operations], dtype=np.float64)
+    power_consumptions = np.array([operation.power_consumption for operation in operations], dtype=np.float64)
+    machine_indices = np.array([operation.machine_index for operation in operations], dtype=np.int64)
+    job_indices = np.array([operation.job_index for operation in operations], dtype=np.int64)
+
     job_colors = _generate_colors(len(ins.jobs))    # By job index.
     machine_height = operation_height + operation_margin
-    last_metering_interval_index = int(round(max([start_time + operation.processing_time
-        for operation, start_time in start_times.items()]) / ins.length_metering_interval))
-    horizon = (last_metering_interval_index + 1) * ins.length_metering_interval
+    length_metering_interval = ins.length_metering_interval
+    makespan = (operation_start_times + processing_times).max() if operations else 0
+    last_metering_interval_index = int(round(makespan / length_metering_interval))
+    num_metering_intervals = last_metering_interval_index + 1
+    horizon = num_metering_intervals * length_metering_interval
 
     gantt_ylim = machine_height * ins.num_machines
     gantt_xlim = horizon
@@ -77,8 +111,18 @@ def draw(
     energy_ylim = ins.energy_limit * 1.1
     energy_xlim = gantt_xlim
 
+    # If downsampled, each energy bar (and the boundary lines) covers `group_size` metering intervals.
+    if max_energy_bars is not None and num_metering_intervals > max_energy_bars:
+        group_size = int(np.ceil(num_metering_intervals / max_energy_bars))
+    else:
+        group_size = 1
+    num_groups = int(np.ceil(num_metering_intervals / group_size))
+    group_length = group_size * length_metering_interval
+    group_starts = np.arange(num_groups) * group_length
+
     fig = plt.figure(figsize=(8, 4))
-    fig.canvas.set_window_title(title)
+    if title and fig.canvas.manager is not None:
+        fig.canvas.manager.set_window_title(title)
     gs = matplotlib.gridspec.GridSpec(2, 1, height_ratios=[2, 3])
 
     # Gantt.
@@ -90,45 +134,36 @@ def draw(
     gantt_ax.spines['bottom'].set_visible(True)
     gantt_ax.spines['left'].set_visible(False)
 
-    plt.ylim(0, gantt_ylim)
-    plt.xlim(0, gantt_xlim)
+    gantt_ax.set_ylim(0, gantt_ylim)
+    gantt_ax.set_xlim(0, gantt_xlim)
 
     if time_units is None:
-        plt.xlabel("time")
+        gantt_ax.set_xlabel("time")
     else:
-        plt.xlabel(f"time [{time_units}]")
+        gantt_ax.set_xlabel(f"time [{time_units}]")
     gantt_ax.yaxis.set_visible(False)
 
-    for metering_interval_index in range(1, last_metering_interval_index + 1):
-        x = metering_interval_index * ins.length_metering_interval
-        plt.plot([x, x], [0, gantt_ylim], "b:", linewidth=1)
-
-    for operation, start_time in start_times.items():
-        rect = Rectangle(
-            (start_time, _get_operation_bottom_y(operation, ins.num_machines, machine_height, operation_margin)),
-            operation.processing_time,
-            operation_height,
-            facecolor=job_colors[operation.job_index],
-            edgecolor="black",
-            linewidth=1
-        )
-        gantt_ax.add_patch(rect)
+    gantt_ax.vlines(group_starts[1:], 0, gantt_ylim, colors='b', linestyles=':', linewidth=1)
+
+    operation_bottoms = (ins.num_machines - 1 - machine_indices) * machine_height + operation_margin
+    gantt_ax.add_collection(PolyCollection(
+        _rectangles(operation_start_times, operation_bottoms, processing_times, operation_height),
+        facecolors=job_colors[job_indices],
+        edgecolors='black',
+        linewidths=1))
 
     # Energy consumption.
     energy_ax = fig.add_subplot(gs[1])
 
-    plt.ylim(0, energy_ylim)
-    plt.xlim(0, energy_xlim)
+    energy_ax.set_ylim(0, energy_ylim)
+    energy_ax.set_xlim(0, energy_xlim)
 
-    plt.xlabel("metering intervals")
-    plt.xticks(
-        [(n + 0.5) * ins.length_metering_interval for n in range(int(horizon / ins.length_metering_interval))],
-        np.array(range(int(horizon / ins.length_metering_interval))) + 1)
+    energy_ax.set_xlabel("metering intervals")
 
     if power_consumption_units is None:
-        plt.ylabel(u"energy consumption\nin metering interval")
+        energy_ax.set_ylabel(u"energy consumption\nin metering interval")
     else:
-        plt.ylabel(u"energy consumption\nin metering interval [{units}]".format(units=power_consumption_units))
+        energy_ax.set_ylabel(u"energy consumption\nin metering interval [{units}]".format(units=power_consumption_units))
 
     energy_ax.xaxis.set_ticks_position('none')
     energy_ax.yaxis.set_ticks_position('left')
@@ -138,48 +173,64 @@ def draw(
     energy_ax.spines['bottom'].set_visible(True)
     energy_ax.spines['left'].set_visible(True)
 
-    for metering_interval_index in range(1, last_metering_interval_index + 1):
-        x = metering_interval_index * ins.length_metering_interval
-        plt.plot([x, x], [0, energy_ylim], "b:", linewidth=1)
-
-    ordered_operations = sorted(
-        start_times.keys(),
-        key=lambda operation: (start_times[operation], operation.machine_index))
-    for metering_interval_index in range(last_metering_interval_index + 1):
-        metering_interval_energy_consumption = 0.0
-
-        metering_interval_start = metering_interval_index * ins.length_metering_interval
-        metering_interval_end = (metering_interval_index + 1) * ins.length_metering_interval
-
-        plt.plot(
-            [metering_interval_start, metering_interval_start + ins.length_metering_interval],
-            [ins.energy_limit, ins.energy_limit],
-            "r--", linewidth=2
-        )
-
-        for operation in ordered_operations:
-            overlap = _compute_intervals_overlap(
-                start_times[operation],
-                start_times[operation] + operation.processing_time,
-                metering_interval_start,
-                metering_interval_end
-            )
-
-            if not np.isclose(overlap, 0.0):
-                energy_consumption = overlap * operation.power_consumption
-                stack_width_percent = 0.6
-                stack_width = ins.length_metering_interval * stack_width_percent
-                stack_space = ins.length_metering_interval * ((1.0 - stack_width_percent) / 2.0)
-                rect = Rectangle(
-                    (metering_interval_start + stack_space, metering_interval_energy_consumption),
-                    stack_width,
-                    energy_consumption,
-                    facecolor=job_colors[operation.job_index])
-                metering_interval_energy_consumption += energy_consumption
-                energy_ax.add_patch(rect)
-
-
-    plt.tight_layout()
+    _, operation_indices, metering_interval_indices, energy_consumptions = compute_operation_consumptions(
+        operation_start_times,
+        processing_times,
+        power_consumptions,
+        length_metering_interval,
+        num_metering_intervals)
+
+    stack_width_percent = 0.6
+    energy_ax.vlines(group_starts[1:], 0, energy_ylim, colors='b', linestyles=':', linewidth=1)
+    if group_size > 1:
+        consumptions = np.zeros(num_groups * group_size)
+        consumptions[:num_metering_intervals] = np.bincount(
+            metering_interval_indices, weights=energy_consumptions, minlength=num_metering_intervals)
+        max_consumptions = consumptions.reshape(num_groups, group_size).max(axis=1)
+
+        bar_width = group_length * stack_width_percent
+        bar_space = group_length * ((1.0 - stack_width_percent) / 2.0)
+        energy_ax.add_collection(PolyCollection(
+            _rectangles(group_starts + bar_space, np.zeros(num_groups), bar_width, max_consumptions),
+            facecolors='gray',
+            edgecolors='none'))
+
+        # Only some of the bars are labeled (by the first of their metering intervals).
+        labeled_groups = np.arange(0, num_groups, int(np.ceil(num_groups / 10)))
+        energy_ax.set_xticks(group_starts[labeled_groups] + group_length / 2.0)
+        energy_ax.set_xticklabels(labeled_groups * group_size + 1)
+        energy_ax.hlines(ins.energy_limit, 0, horizon, colors='r', linestyles='--', linewidth=2)
+    else:
+        energy_ax.set_xticks((np.arange(num_metering_intervals) + 0.5) * length_metering_interval)
+        energy_ax.set_xticklabels(np.arange(num_metering_intervals) + 1)
+        energy_ax.hlines(
+            np.full(num_metering_intervals, ins.energy_limit),
+            np.arange(num_metering_intervals) * length_metering_interval,
+            np.arange(1, num_metering_intervals + 1) * length_metering_interval,
+            colors='r', linestyles='--', linewidth=2)
+
+        # In each metering interval, the consumptions are stacked in the order of the start times (and machines).
+        operation_ranks = np.empty(len(operations), dtype=np.int64)
+        operation_ranks[np.lexsort((machine_indices, operation_start_times))] = np.arange(len(operations))
+        order = np.lexsort((operation_ranks[operation_indices], metering_interval_indices))
+        operation_indices = operation_indices[order]
+        metering_interval_indices = metering_interval_indices[order]
+        energy_consumptions = energy_consumptions[order]
+        stack_bottoms = _compute_stack_bottoms(metering_interval_indices, energy_consumptions)
+
+        stack_width = length_metering_interval * stack_width_percent
+        stack_space = length_metering_interval * ((1.0 - stack_width_percent) / 2.0)
+        energy_ax.add_collection(PolyCollection(
+            _rectangles(
+                metering_interval_indices * length_metering_interval + stack_space,
+                stack_bottoms,
+                stack_width,
+                energy_consumptions),
+            facecolors=job_colors[job_indices[operation_indices]],
+            edgecolors='none'))
+
+    fig.tight_layout()
+    return fig
 
 if __name__ == '__main__':
     jobs = [
@@ -223,5 +274,7 @@ if __name__ == '__main__':
         jobs[1].operations[2]: 17,
     }
 
+    import matplotlib.pyplot as plt
+    configure()
     draw(ins, start_times)
     plt.show()